@@ -1,62 +1,339 @@
+import hashlib
+import io
+import json
 import os
+import threading
+import numpy as np
 import pandas as pd
-import requests
-from tempfile import NamedTemporaryFile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-def obtener_dataset(url, dataset_name):
+# Bump when the layout of the cached files changes, so stale caches are ignored.
+CACHE_VERSION = 3
+
+# One record per observation; the cache files are plain .npy arrays of this type.
+RECORD_DTYPE = np.dtype([("Date", "datetime64[D]"), ("Value", "float64")])
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Download URL of a single FRED series in CSV form; `load_datasets` fills in the id.
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
+
+
+def cache_dir():
+    """
+    Returns the directory of the local dataset cache.
+
+    The root is taken from the ACTFTS_CACHE_DIR environment variable, and defaults
+    to ~/.cache/actfts. Files live in a subfolder named after `CACHE_VERSION`.
+
+    Returns
+    -------
+    pathlib.Path
+        The versioned cache directory. It is not created by this function.
+    """
+    root = os.environ.get("ACTFTS_CACHE_DIR") or Path.home() / ".cache" / "actfts"
+    return Path(root) / f"v{CACHE_VERSION}"
+
+
+def parse_fred(content, dataset_name):
+    """
+    Parses a FRED download held in memory, in CSV or Excel form.
+
+    The observation dates are read from the file itself. FRED marks missing
+    observations with ".", which become NaN.
+
+    Parameters
+    ----------
+    content : bytes
+        The body of the downloaded file.
+    dataset_name : str
+        The name of the column to assign to the values.
+
+    Returns
+    -------
+    pd.DataFrame
+        A pandas DataFrame with a "Date" index and a single column named
+        `dataset_name`.
     """
-    Downloads an Excel file from a URL, processes it to extract a dataset, 
-    and returns a DataFrame with a column of values associated with a time series.
+    buffer = io.BytesIO(content)
+    # Excel files start with the OLE2 (.xls) or ZIP (.xlsx) signatures.
+    if content[:4] in (b"\xd0\xcf\x11\xe0", b"PK\x03\x04"):
+        data = pd.read_excel(buffer, skiprows=10, usecols=[0, 1], names=["Date", dataset_name])
+    else:
+        data = pd.read_csv(buffer, usecols=[0, 1], names=["Date", dataset_name], header=0,
+                           na_values=".", engine="c")
+    data["Date"] = pd.to_datetime(data["Date"])
+    data[dataset_name] = data[dataset_name].astype(float)
+    return data.set_index("Date")
+
+
+def _to_quarter_end(data):
+    # FRED dates quarterly observations at the start of the quarter; the package
+    # has always labelled them with the last day of the quarter.
+    data = data.copy()
+    data.index = data.index.to_period("Q").to_timestamp(how="end").normalize()
+    data.index.name = "Date"
+    return data
+
+
+def packaged_dataset(dataset_name):
+    """
+    Loads one of the datasets bundled with the package, without network access.
+
+    Parameters
+    ----------
+    dataset_name : str
+        "DPIEEUU", "GDPEEUU" or "PCECEEUU".
+
+    Returns
+    -------
+    pd.DataFrame
+        A pandas DataFrame with a quarterly "Date" index starting in 1947 and a
+        single column named `dataset_name`.
+    """
+    values = pd.read_csv(DATA_DIR / f"{dataset_name}.csv").iloc[:, 0].to_numpy(dtype=float)
+    index = pd.date_range("1947-01-01", periods=len(values), freq="QE", name="Date")
+    return pd.DataFrame({dataset_name: values}, index=index)
+
+
+def _digest(records):
+    # Ties the metadata file to the data file it was written with.
+    return hashlib.blake2b(np.ascontiguousarray(records).view(np.uint8), digest_size=16).hexdigest()
+
+
+def _read_cache(dataset_name, url):
+    # The cached copy is only used when its metadata was written with this
+    # data file and for this URL; anything else is a miss.
+    folder = cache_dir()
+    data_path = folder / f"{dataset_name}.npy"
+    meta_path = folder / f"{dataset_name}.json"
+    try:
+        records = np.load(data_path, mmap_mode="r")
+        meta = json.loads(meta_path.read_text())
+    except (OSError, EOFError, ValueError):
+        # Missing, unreadable, truncated or foreign files.
+        return None, {}
+    if records.dtype != RECORD_DTYPE:
+        return None, {}
+    if meta.get("url") != url or meta.get("digest") != _digest(records):
+        return None, {}
+    # The unit pandas gives parsed dates, so cached and fresh copies compare equal.
+    index = pd.DatetimeIndex(records["Date"], name="Date").as_unit(pd.to_datetime(["2000"]).unit)
+    data = pd.DataFrame({dataset_name: np.asarray(records["Value"])}, index=index)
+    return data, meta
+
+
+def _write_cache(dataset_name, data, meta):
+    folder = cache_dir()
+    folder.mkdir(parents=True, exist_ok=True)
+    records = np.empty(len(data), dtype=RECORD_DTYPE)
+    records["Date"] = data.index.values.astype("datetime64[D]")
+    records["Value"] = data.iloc[:, 0].to_numpy(dtype=float)
+    meta = dict(meta, digest=_digest(records))
+    # Write to names unique to this process and thread, so concurrent writers
+    # never share a temporary file, and replace the metadata last: a reader
+    # that pairs new data with old metadata sees a digest mismatch.
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    data_path = folder / f"{dataset_name}.npy"
+    meta_path = folder / f"{dataset_name}.json"
+    data_tmp = data_path.with_name(data_path.name + suffix)
+    meta_tmp = meta_path.with_name(meta_path.name + suffix)
+    with open(data_tmp, "wb") as handle:
+        np.save(handle, records)
+    meta_tmp.write_text(json.dumps(meta))
+    os.replace(data_tmp, data_path)
+    os.replace(meta_tmp, meta_path)
+
+
+def load_dataset(url, dataset_name, refresh=False, quarterly=False, session=None, timeout=None):
+    """
+    Loads a dataset from the local cache or the packaged files, and only goes to
+    the network when asked to.
+
+    Without `refresh`, the cached copy of a previous refresh is returned, or the
+    CSV bundled with the package when nothing has been cached, so no network
+    access is needed. With `refresh`, the file is requested again with the ETag
+    and Last-Modified validators of the cached copy; a "304 Not Modified" answer
+    keeps the cached copy, otherwise the new file is parsed in memory and cached
+    as a compact .npy array that is memory-mapped when it is read back. A copy
+    cached from another URL under the same `dataset_name` is ignored.
 
     Parameters
     ----------
     url : str
-        The URL of the Excel file containing the dataset to be processed.
+        The URL of the FRED file (CSV or Excel) containing the dataset.
     dataset_name : str
-        The name of the column to assign to the extracted dataset.
+        The name of the column to assign to the dataset.
+    refresh : bool, optional
+        If True, revalidates the dataset against the server. Default is False.
+    quarterly : bool, optional
+        If True, the downloaded dates are moved to the last day of their quarter,
+        the convention of the packaged datasets. Default is False.
+    session : requests.Session, optional
+        Session used for the refresh, so its connection pool and retry policy are
+        reused. By default a one-off request is made.
+    timeout : float, optional
+        Timeout of the refresh request in seconds. Default is no timeout.
 
     Returns
     -------
     pd.DataFrame
-        A pandas DataFrame with the processed data, where:
-        - The index is a time series with quarterly frequency starting from 1947-01-01.
-        - A column with the name specified in `dataset_name` contains the extracted data.
+        A pandas DataFrame with a "Date" index and a single column named
+        `dataset_name`.
 
     Raises
     ------
     requests.exceptions.HTTPError
-        If an error occurs while downloading the file from the provided URL.
+        If the refresh fails.
     """
-    headers = {
-        'Cache-Control': 'no-cache',
-        'Pragma': 'no-cache'
-    }
+    data, meta = _read_cache(dataset_name, url)
+    if not refresh:
+        return data if data is not None else packaged_dataset(dataset_name)
+
+    import requests
 
-    response = requests.get(url, headers=headers)
+    headers = {}
+    if meta.get("etag"):
+        headers['If-None-Match'] = meta["etag"]
+    if meta.get("last_modified"):
+        headers['If-Modified-Since'] = meta["last_modified"]
+
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and data is not None:
+        return data
     response.raise_for_status()
 
-    with NamedTemporaryFile(delete=False, suffix=".xls") as temp_file:
-        temp_file.write(response.content)
-        temp_file_path = temp_file.name
+    data = parse_fred(response.content, dataset_name)
+    if quarterly:
+        data = _to_quarter_end(data)
+    _write_cache(dataset_name, data, {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    })
+    return data
+
 
-    data = pd.read_excel(temp_file_path, skiprows=10, usecols=[1], names=[dataset_name])
+def fred_session(max_connections=8, retries=3, backoff=0.5):
+    """
+    Creates a requests session with a connection pool and a retry policy for FRED.
 
-    os.remove(temp_file_path)
+    Failed connections and "429 Too Many Requests" or 5xx answers are retried
+    with exponential backoff (`backoff`, 2 * `backoff`, 4 * `backoff`, ... seconds),
+    honouring any Retry-After header sent by the server.
 
-    start_date = pd.to_datetime("1947-01-01")
-    end_date = pd.to_datetime("today")
-    date_range = pd.date_range(start=start_date, end=end_date, freq="QE")[:-1]
+    Parameters
+    ----------
+    max_connections : int, optional
+        Number of connections kept open to each host, by default 8.
+    retries : int, optional
+        Number of retries of a failed request, by default 3.
+    backoff : float, optional
+        Backoff factor in seconds, by default 0.5.
 
-    data["Date"] = date_range
-    data.set_index("Date", inplace=True)
-    
+    Returns
+    -------
+    requests.Session
+        The configured session. It can be shared between threads.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=["GET"], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def load_datasets(series_ids, max_workers=8, retries=3, backoff=0.5, timeout=30,
+                  url_template=FRED_CSV_URL, session=None):
+    """
+    Downloads many FRED series concurrently and aligns them on their dates.
+
+    The series are fetched by a pool of `max_workers` threads that share one
+    pooled session, so connections are reused and at most `max_workers`
+    requests are in flight at once. Every series goes through `load_dataset`:
+    it is revalidated against the copy in the local cache, so series that have
+    not changed since the last call cost a "304 Not Modified" answer and are
+    read back from the cache.
+
+    Parameters
+    ----------
+    series_ids : list of str
+        FRED series ids, e.g. ["DPI", "GDP", "PCEC"]. They also name the columns.
+    max_workers : int, optional
+        Number of concurrent downloads and of pooled connections, by default 8.
+    retries : int, optional
+        Number of retries of a failed download, by default 3.
+    backoff : float, optional
+        Backoff factor of the retries in seconds, by default 0.5.
+    timeout : float, optional
+        Timeout of every request in seconds, by default 30.
+    url_template : str, optional
+        Download URL with a "{series_id}" placeholder, by default `FRED_CSV_URL`.
+        Point it at another server, e.g. a local mirror.
+    session : requests.Session, optional
+        Session to use instead of the one built by `fred_session`.
+
+    Returns
+    -------
+    pd.DataFrame
+        A pandas DataFrame with a "Date" index holding the union of the dates of
+        all the series, and one column per series id, in the order requested.
+        Dates missing from a series are NaN.
+
+    Raises
+    ------
+    requests.exceptions.HTTPError
+        If a series cannot be downloaded after the retries.
+
+    Examples
+    --------
+    >>> df = load_datasets(["DPI", "GDP", "PCEC"])
+    >>> df.dropna().tail()
+    """
+    series_ids = list(dict.fromkeys(series_ids))
+    own_session = session is None
+    if own_session:
+        session = fred_session(max_workers, retries, backoff)
+
+    def fetch(series_id):
+        url = url_template.format(series_id=series_id)
+        return load_dataset(url, series_id, refresh=True, session=session, timeout=timeout)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(fetch, series_ids))
+    finally:
+        if own_session:
+            session.close()
+
+    if not frames:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+    data = pd.concat(frames, axis=1, join="outer").sort_index()
+    data.index.name = "Date"
     return data
 
-def DPIEEUU_dataset():
+
+def DPIEEUU_dataset(refresh=False):
     """
-    Downloads and processes the Disposable Personal Income (DPI) dataset for the United States 
+    Loads the Disposable Personal Income (DPI) dataset for the United States 
     from the Federal Reserve Economic Data (FRED) system. The data is quarterly and starts 
-    from January 1947.
+    from January 1947. The copy bundled with the package, or the one cached by the last
+    refresh, is used unless `refresh` is True.
+
+    Parameters
+    ----------
+    refresh : bool, optional
+        If True, revalidates the dataset against FRED and updates the local cache.
+        Default is False.
 
     Returns
     -------
@@ -68,7 +345,7 @@ def DPIEEUU_dataset():
     Raises
     ------
     requests.exceptions.HTTPError
-        If there is an issue with downloading the dataset from the provided URL.
+        If there is an issue with refreshing the dataset from the provided URL.
 
     Examples
     --------
@@ -83,14 +360,21 @@ def DPIEEUU_dataset():
     1947-12-31  135.234
     1948-03-31  140.123
     """
-    file_url = ("https://fred.stlouisfed.org/graph/fredgraph.xls?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1138&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=DPI&scale=left&cosd=1947-01-01&coed=2024-04-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Quarterly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2024-07-31&revision_date=2024-07-31&nd=1947-01-01")
-    return obtener_dataset(file_url, "DPIEEUU")
+    file_url = ("https://fred.stlouisfed.org/graph/fredgraph.csv?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1138&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=DPI&scale=left&cosd=1947-01-01&coed=2024-04-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Quarterly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2024-07-31&revision_date=2024-07-31&nd=1947-01-01")
+    return load_dataset(file_url, "DPIEEUU", refresh=refresh, quarterly=True)
 
-def GDPEEUU_dataset():
+def GDPEEUU_dataset(refresh=False):
     """
-    Downloads and processes the Gross Domestic Product (GDP) dataset for the United States 
+    Loads the Gross Domestic Product (GDP) dataset for the United States 
     from the Federal Reserve Economic Data (FRED) system. The data is quarterly and starts 
-    from January 1947.
+    from January 1947. The copy bundled with the package, or the one cached by the last
+    refresh, is used unless `refresh` is True.
+
+    Parameters
+    ----------
+    refresh : bool, optional
+        If True, revalidates the dataset against FRED and updates the local cache.
+        Default is False.
 
     Returns
     -------
@@ -102,7 +386,7 @@ def GDPEEUU_dataset():
     Raises
     ------
     requests.exceptions.HTTPError
-        If there is an issue with downloading the dataset from the provided URL.
+        If there is an issue with refreshing the dataset from the provided URL.
 
     Examples
     --------
@@ -117,14 +401,21 @@ def GDPEEUU_dataset():
     1947-12-31  230.234
     1948-03-31  240.123
     """
-    file_url = ("https://fred.stlouisfed.org/graph/fredgraph.xls?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1138&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=GDP&scale=left&cosd=1947-01-01&coed=2024-04-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Quarterly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2024-07-30&revision_date=2024-07-30&nd=1947-01-01")
-    return obtener_dataset(file_url, "GDPEEUU")
+    file_url = ("https://fred.stlouisfed.org/graph/fredgraph.csv?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1138&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=GDP&scale=left&cosd=1947-01-01&coed=2024-04-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Quarterly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2024-07-30&revision_date=2024-07-30&nd=1947-01-01")
+    return load_dataset(file_url, "GDPEEUU", refresh=refresh, quarterly=True)
 
-def PCECEEUU_dataset():
+def PCECEEUU_dataset(refresh=False):
     """
-    Downloads and processes the Personal Consumption Expenditures (PCEC) dataset for the United States 
+    Loads the Personal Consumption Expenditures (PCEC) dataset for the United States 
     from the Federal Reserve Economic Data (FRED) system. The data is quarterly and starts 
-    from January 1947.
+    from January 1947. The copy bundled with the package, or the one cached by the last
+    refresh, is used unless `refresh` is True.
+
+    Parameters
+    ----------
+    refresh : bool, optional
+        If True, revalidates the dataset against FRED and updates the local cache.
+        Default is False.
 
     Returns
     -------
@@ -136,7 +427,7 @@ def PCECEEUU_dataset():
     Raises
     ------
     requests.exceptions.HTTPError
-        If there is an issue with downloading the dataset from the provided URL.
+        If there is an issue with refreshing the dataset from the provided URL.
 
     Examples
     --------
@@ -151,5 +442,5 @@ def PCECEEUU_dataset():
     1947-12-31  330.234
     1948-03-31  340.123
     """
-    file_url = ("https://fred.stlouisfed.org/graph/fredgraph.xls?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1138&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=PCEC&scale=left&cosd=1947-01-01&coed=2024-04-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Quarterly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2024-07-31&revision_date=2024-07-31&nd=1947-01-01")
-    return obtener_dataset(file_url, "PCECEEUU")
\ No newline at end of file
+    file_url = ("https://fred.stlouisfed.org/graph/fredgraph.csv?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1138&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=PCEC&scale=left&cosd=1947-01-01&coed=2024-04-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Quarterly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2024-07-31&revision_date=2024-07-31&nd=1947-01-01")
+    return load_dataset(file_url, "PCECEEUU", refresh=refresh, quarterly=True)
\ No newline at end of file
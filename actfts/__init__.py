@@ -1,4 +1,33 @@
-from actfts.actfts_fun import acfinter
-from actfts.Datasets import DPIEEUU_dataset
-from actfts.Datasets import GDPEEUU_dataset
-from actfts.Datasets import PCECEEUU_dataset
\ No newline at end of file
+import importlib
+
+# The public names are resolved on first access (PEP 562), so `import actfts`
+# does not import numpy, pandas, statsmodels, matplotlib, dash or requests.
+_LAZY_ATTRIBUTES = {
+    'acfinter': 'actfts.actfts_fun',
+    'acfinter_panel': 'actfts.actfts_fun',
+    'rolling_acfinter': 'actfts.rolling',
+    'StreamingACF': 'actfts.streaming',
+    'acfinter_chunked': 'actfts.outofcore',
+    'ResultCache': 'actfts.cache',
+    'explorer_app': 'actfts.explorer',
+    'run_batch': 'actfts.batch',
+    'AnalysisService': 'actfts.service',
+    'DPIEEUU_dataset': 'actfts.Datasets',
+    'GDPEEUU_dataset': 'actfts.Datasets',
+    'PCECEEUU_dataset': 'actfts.Datasets',
+    'load_datasets': 'actfts.Datasets',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'actfts' has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
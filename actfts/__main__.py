@@ -1,4 +1,6 @@
+import argparse
 import logging
+import sys
 
 import pandas as pd
 from actfts.actfts_fun import acfinter
@@ -12,13 +14,57 @@ def main():
     datag = DPIEEUU_dataset()
     x = datag['DPIEEUU']
     logging.info(acfinter(datag = x))
-    logging.info(DPIEEUU_dataset())
+    logging.info(datag)
     logging.info(GDPEEUU_dataset())
     logging.info(PCECEEUU_dataset())
 
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m actfts",
+        description="Run acfinter on every series of CSV or Parquet files and write the "
+                    "tables to a folder of part files. Without arguments, runs a demo "
+                    "on the FRED datasets.")
+    parser.add_argument("inputs", nargs="+",
+                        help="files, directories or glob patterns of .csv/.parquet files; "
+                             "every numeric column is a series")
+    parser.add_argument("-o", "--output", required=True, help="output folder")
+    parser.add_argument("--lag", type=int, default=72, help="maximum lag (default 72)")
+    parser.add_argument("--delta", default="levels", choices=["levels", "diff1", "diff2", "diff3"])
+    parser.add_argument("--ci-method", default="white", choices=["white", "ma"])
+    parser.add_argument("--ci", type=float, default=0.95, help="confidence level (default 0.95)")
+    parser.add_argument("--format", default="parquet", choices=["parquet", "csv"],
+                        help="format of the part files (default parquet)")
+    parser.add_argument("-j", "--jobs", type=int, default=-1,
+                        help="worker processes, -1 for every CPU (default)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip the series already written to the output folder")
+    parser.add_argument("--flush-every", type=int, default=200,
+                        help="series per part file (default 200)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print progress")
+    return parser.parse_args(argv)
+
+
+def batch(argv):
+    from actfts.batch import run_batch
+
+    args = parse_args(argv)
+    try:
+        summary = run_batch(args.inputs, args.output, lag=args.lag, delta=args.delta,
+                            ci_method=args.ci_method, ci=args.ci, fmt=args.format,
+                            n_jobs=args.jobs, resume=args.resume,
+                            flush_every=args.flush_every, progress=not args.quiet)
+    except (FileNotFoundError, FileExistsError, ValueError) as exc:
+        sys.stderr.write(f"error: {exc}\n")
+        return 2
+    return 1 if summary['failed'] else 0
+
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(batch(sys.argv[1:]))
+
     logging.debug('>>> We are starting the execution of the package.')
 
     main()
 
-    logging.debug('>>> We are finishing the execution of the package.')
\ No newline at end of file
+    logging.debug('>>> We are finishing the execution of the package.')
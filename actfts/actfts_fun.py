@@ -1,24 +1,374 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from statsmodels.tsa.stattools import acf, pacf
-from statsmodels.stats.diagnostic import acorr_ljungbox
-from statsmodels.tsa.stattools import adfuller
-from statsmodels.tsa.stattools import kpss
-import statsmodels.api as sm
-import warnings
-from statsmodels.tools.sm_exceptions import InterpolationWarning
-import scipy.stats as stats
 import pandas as pd
-from dash import Dash, dash_table, html, dcc
-import base64
-import io
 import os
 from pathlib import Path
-import shutil
 import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from actfts.autocorr import as_panel, autocovariance, durbin_levinson, q_statistics
+from actfts.confint import confidence_bands
+from actfts.normality import normality_panel, normality_table
+from actfts.stationarity import StationarityEngine, phillips_perron_test, stack_tables
+from actfts.tracing import NULL_TRACER, StageTimer, as_tracer
+
+# matplotlib, statsmodels, scipy and dash are imported inside the functions
+# that use them, so importing actfts and running compute-only analyses does
+# not pay for the plotting and dashboard stacks.
+
+DELTAS = ["levels", "diff1", "diff2", "diff3"]
+
+
+def gen(datag, delta="levels"):
+    """Validate the input series and apply the transformation given by `delta`.
+
+    Parameters
+    ----------
+    datag : np.ndarray or pd.Series
+        The input time series. 2-D arrays are differenced along the first axis,
+        one series per column.
+    delta : str, optional
+        One of "levels" (default), "diff1", "diff2" or "diff3".
+
+    Returns
+    -------
+    np.ndarray or pd.Series
+        The original data for "levels", otherwise the differenced data.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a numeric vector or `delta` is invalid.
+    """
+    if not isinstance(datag, (np.ndarray, pd.Series)):
+        raise ValueError("The input must be a numeric vector or a time series object.")
+
+    if delta not in DELTAS:
+        raise ValueError('The argument "delta" must be one of "levels", "diff1", "diff2", or "diff3".')
+
+    if delta == "levels":
+        return datag
+    elif delta == "diff1":
+        return np.diff(datag, n=1, axis=0)
+    elif delta == "diff2":
+        return np.diff(datag, n=2, axis=0)
+    elif delta == "diff3":
+        return np.diff(datag, n=3, axis=0)
+
+
+def select_delta(datag, alpha=0.05, max_order=3):
+    """Find the smallest differencing order at which the series looks stationary.
+
+    The series is differenced one order at a time from a single in-memory
+    array and only the ADF and KPSS-Level tests are run at each order. The
+    search stops at the first order where the ADF test rejects a unit root
+    and the KPSS test does not reject stationarity, both at level `alpha`.
+    If no order up to `max_order` qualifies, `max_order` is used.
+
+    Parameters
+    ----------
+    datag : np.ndarray or pd.Series
+        One-dimensional time series.
+    alpha : float, optional
+        Significance level of both tests, by default 0.05.
+    max_order : int, optional
+        Highest differencing order tried, by default 3.
+
+    Returns
+    -------
+    tuple
+        The chosen `delta` ("levels", "diff1", "diff2" or "diff3"), the
+        differenced series as a float array, and the `StationarityEngine` of
+        that series, whose fitted regressions the full battery reuses.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a numeric vector, or a differenced series is
+        constant or too short for the tests.
+    """
+    x = np.asarray(gen(datag, "levels"), dtype=float)
+    for order in range(max_order + 1):
+        if order:
+            x = np.diff(x)
+        engine = StationarityEngine(x)
+        if engine.adf()[1] < alpha and engine.kpss('c')[1] > alpha:
+            break
+    return DELTAS[order], x, engine
+
+
+def phillips_perron(ts_data):
+    """Phillips-Perron unit root test with a constant and a Newey-West long-run variance.
+
+    Parameters
+    ----------
+    ts_data : np.ndarray, pd.Series or pd.DataFrame
+        A one-dimensional time series, or a panel with one series per column.
+
+    Returns
+    -------
+    tuple
+        The Z(t) statistic and its MacKinnon p-value, as floats for a single
+        series or as arrays with one value per column for a panel.
+    """
+    # Validación del tipo de entrada
+    if isinstance(ts_data, (pd.Series, pd.DataFrame)):
+        ts_data = ts_data.values  # Convertir pandas a numpy.ndarray
+    elif not isinstance(ts_data, np.ndarray):
+        raise ValueError("El argumento ts_data debe ser un numpy.ndarray, pandas.Series o pandas.DataFrame.")
+
+    if ts_data.ndim not in (1, 2):
+        raise ValueError("El argumento ts_data debe ser una serie o un panel de series.")
+
+    zt, _, p_value = phillips_perron_test(ts_data)
+    return zt, p_value
+
+
+def stationarity_tests(data):
+    """Run the ADF, KPSS (level and trend) and Phillips-Perron tests on a series.
+
+    The four tests share one `StationarityEngine`, so the differences, the
+    lagged design matrix and the regressions are only computed once.
+
+    Parameters
+    ----------
+    data : np.ndarray or pd.Series
+        One-dimensional time series.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns 'Statistic' and 'P_Value', indexed by "ADF", "KPSS-Level",
+        "KPSS-Trend" and "PP".
+    """
+    return StationarityEngine(data).table()
+
+
+def normality_tests(data, boxcox=True):
+    """Run the Shapiro-Wilks and Kolmogorov-Smirnov tests on a series.
+
+    The Kolmogorov-Smirnov test compares the series with the normal
+    distribution of the same mean and standard deviation, so its p-value is
+    reproducible. Above 5000 observations the Shapiro-Wilks test runs on an
+    evenly spaced subsample of 5000 points and the Jarque-Bera and
+    Anderson-Darling tests are added. The Box-Cox lambda is added when every
+    value is strictly positive; see `actfts.normality`.
+
+    Parameters
+    ----------
+    data : np.ndarray or pd.Series
+        One-dimensional time series.
+    boxcox : bool, optional
+        Add the Box-Cox lambda of positive series, by default True.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns 'Statistic' and 'P_Value', indexed by test name.
+    """
+    return normality_table(data, boxcox)
+
+
+def _stationarity_chunk(block):
+    # Worker entry point: runs the battery on every column of a block of series.
+    return np.array([StationarityEngine(block[:, j]).values() for j in range(block.shape[1])])
+
+
+def stationarity_panel(data, names=None, n_jobs=None, executor=None, key_name="Series"):
+    """Run `stationarity_tests` on every column of a panel, optionally in parallel.
+
+    The columns are split into contiguous chunks (about four per worker) so
+    each task carries many series and the inter-process overhead stays low.
+    Results always come back in column order.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Array of shape (n_obs, n_series).
+    names : sequence, optional
+        The name of every column, by default their position.
+    n_jobs : int, optional
+        Number of worker processes. None or 1 (default) runs serially and -1
+        uses every available CPU. With `executor`, the number of workers the
+        columns are split for; pass the size of the executor, otherwise
+        every CPU is assumed.
+    executor : concurrent.futures.Executor, optional
+        An existing executor to submit the chunks to, instead of creating a
+        process pool. It is not shut down afterwards.
+    key_name : str, optional
+        Name of the outer index level, by default "Series".
+
+    Returns
+    -------
+    pd.DataFrame
+        The stationarity tests of every column, indexed by name and test.
+    """
+    nseries = data.shape[1]
+    if names is None:
+        names = range(nseries)
+
+    if executor is None and (n_jobs is None or n_jobs == 1 or nseries < 2):
+        return stack_tables(_stationarity_chunk(data), names, key_name)
+
+    if n_jobs is None or n_jobs == -1:
+        workers = os.cpu_count() or 1
+    else:
+        workers = n_jobs
+    if workers < 1:
+        raise ValueError('The argument "n_jobs" must be a positive integer or -1.')
+
+    nchunks = min(nseries, 4 * workers)
+    bounds = np.linspace(0, nseries, nchunks + 1).astype(int)
+    chunks = [np.ascontiguousarray(data[:, a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    if executor is not None:
+        parts = list(executor.map(_stationarity_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, nchunks)) as pool:
+            parts = list(pool.map(_stationarity_chunk, chunks))
+    return stack_tables(np.concatenate(parts), names, key_name)
+
+
+class AcfinterResult(namedtuple("AcfinterResult", ["results_df", "stationarity_results", "normality_results"])):
+    """Tables of an `acfinter` analysis, with the plots rendered on demand.
+
+    The result unpacks like the tuple `acfinter` has always returned. The
+    confidence bands are kept so the ACF, PACF and Ljung-Box figure can be
+    built later, only when it is asked for.
+
+    Attributes
+    ----------
+    results_df : pd.DataFrame
+        The ACF, PACF, Box-Pierce and Ljung-Box statistics.
+    stationarity_results : pd.DataFrame
+        The stationarity tests.
+    normality_results : pd.DataFrame
+        The normality tests.
+    acf_ci : np.ndarray
+        Upper confidence band of the ACF, one value per lag.
+    pacf_ci : np.ndarray
+        Upper confidence band of the PACF, one value per lag.
+    ci_method : str
+        The method used for the confidence bands, "white" or "ma".
+    delta : str or None
+        The transformation the tables were computed on, which `delta="auto"`
+        chooses.
+    timings : dict or None
+        Wall time in seconds of every stage of the call that produced the
+        result, when it was profiled (see `acfinter`).
+    allocations : dict or None
+        Peak bytes allocated by every stage, when memory was profiled.
+    """
+
+    def __new__(cls, results_df, stationarity_results, normality_results,
+                acf_ci=None, pacf_ci=None, ci_method="white", delta=None):
+        self = super().__new__(cls, results_df, stationarity_results, normality_results)
+        self.acf_ci = acf_ci
+        self.pacf_ci = pacf_ci
+        self.ci_method = ci_method
+        self.delta = delta
+        self.timings = None
+        self.allocations = None
+        return self
+
+    def figure(self):
+        """Build the ACF, PACF and Ljung-Box p-value figure.
+
+        Returns
+        -------
+        matplotlib.figure.Figure
+            A new figure with three stacked axes.
+        """
+        from actfts.plots import acfinter_figure
+
+        return acfinter_figure(self.results_df, self.acf_ci, self.pacf_ci, self.ci_method)
+
+    def show(self):
+        """Build the figure and display it with `plt.show()`."""
+        import matplotlib.pyplot as plt
+
+        self.figure()
+        plt.show()
+
+
+class PanelResult(namedtuple("PanelResult", ["results_df", "stationarity_results", "normality_results"])):
+    """Tables of an `acfinter_panel` analysis.
+
+    The result unpacks like the tuple `acfinter_panel` has always returned,
+    and keeps the number of observations behind the tables, which the
+    confidence bands of the figures need.
+
+    Attributes
+    ----------
+    results_df : pd.DataFrame
+        The ACF, PACF, Box-Pierce and Ljung-Box statistics of every series.
+    stationarity_results : pd.DataFrame
+        The stationarity tests of every series.
+    normality_results : pd.DataFrame
+        The normality tests of every series.
+    nobs : int or None
+        Observations of every series after the `delta` transformation.
+    """
+
+    def __new__(cls, results_df, stationarity_results, normality_results, nobs=None):
+        self = super().__new__(cls, results_df, stationarity_results, normality_results)
+        self.nobs = nobs
+        return self
+
+
+def _acfinter_tables(datag, lag, ci_method, ci, delta, acf_method="auto", tracer=NULL_TRACER,
+                     boxcox=True):
+    # The computations behind `acfinter`, without any display or export.
+    engine = None
+    if delta == "auto":
+        with tracer.span("delta"):
+            delta, data, engine = select_delta(datag)
+    else:
+        with tracer.span("gen"):
+            data = gen(datag, delta)
+    ldata = len(data)
+    
+    if ldata <= lag:
+        lag = ldata - 1
+    
+    # One autocovariance pass feeds the ACF, the PACF and the Q statistics.
+    with tracer.span("acf"):
+        acov = autocovariance(np.asarray(data, dtype=float)[:, None], lag, method=acf_method)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acf_vals = acov / acov[0]
+    with tracer.span("pacf"):
+        pacf_vals = durbin_levinson(acov, ldata)
+    with tracer.span("ljung_box"):
+        qstats = q_statistics(acf_vals, ldata)
+
+    results_df = pd.DataFrame({
+        'Lag': range(1, lag + 1),
+        'ACF': acf_vals[1:, 0],
+        'PACF': pacf_vals[1:, 0],
+        'Box_Pierce': qstats['bp_stat'][:, 0],
+        'Pv_Box': qstats['bp_pvalue'][:, 0],
+        'Ljung_Box': qstats['lb_stat'][:, 0],
+        'Pv_Ljung': qstats['lb_pvalue'][:, 0]
+    }, index=range(1, lag + 1))
+
+    with tracer.span("stationarity"):
+        if engine is not None:
+            stationarity_results = engine.table()
+        else:
+            stationarity_results = stationarity_tests(data)
+
+    with tracer.span("normality"):
+        normality_results = normality_tests(data, boxcox)
+
+    with tracer.span("confidence_bands"):
+        saveci1, saveci2 = confidence_bands(results_df['ACF'].to_numpy(), ldata, ci=ci, ci_method=ci_method)
+
+    return AcfinterResult(results_df, stationarity_results, normality_results,
+                          acf_ci=saveci1, pacf_ci=saveci2, ci_method=ci_method, delta=delta)
+
 
 def acfinter(datag, lag=72, ci_method="white", ci=0.95, interactive=False,
-             delta="levels", download=False):
+             delta="levels", download=False, plot=True, cache=None, acf_method="auto",
+             profile=False, tracer=None, boxcox=True):
     
     """Perform autocorrelation (ACF), partial autocorrelation (PACF), and stationarity analysis.
 
@@ -38,30 +388,65 @@ def acfinter(datag, lag=72, ci_method="white", ci=0.95, interactive=False,
     ci : float, optional
         Confidence level for ACF/PACF confidence intervals, by default 0.95.
     interactive : bool, optional
-        If True, displays interactive plots; if None or False, produces static visualizations. 
+        If True, serves the results in the Dash explorer of `actfts.explorer.explore`
+        until it is stopped; if None or False, produces static visualizations.
         Default is None.
     delta : str, optional
         Transformation applied to the input data. Options are:
         - "levels" (default): no transformation,
         - "diff1": first differences,
         - "diff2": second differences,
-        - "diff3": third differences.
-    download : bool, optional
-        If True, saves the output results as files. Default is False.
+        - "diff3": third differences,
+        - "auto": the smallest order at which the ADF and KPSS tests agree that
+          the series is stationary, found by `select_delta`. Only the
+          stationarity tests run at the orders that are rejected, and the
+          chosen one is stored in the `delta` attribute of the result.
+    download : bool or str, optional
+        If True, saves the tables to "Results.xlsx" in the Downloads folder,
+        numbering the name instead of overwriting an earlier file. A path saves
+        them there instead, as Parquet, Feather, CSV or Excel according to its
+        suffix (see `actfts.export.export_results`). Default is False.
+    plot : bool, optional
+        If False and `interactive` is False, no figure is built at all and the
+        plots can be rendered later from the returned result. Default is True.
+    cache : bool or actfts.cache.ResultCache, optional
+        Memoise the analysis. With True the process-wide `default_cache()` is
+        used; a `ResultCache` can also be given, e.g. one with an on-disk tier.
+        Identical data analysed with the same `lag`, `delta`, `ci` and
+        `ci_method` is then served from the cache. Default is None (no cache).
+    acf_method : str, optional
+        How the autocovariances are computed: "direct" sums the lagged products,
+        "fft" uses a zero-padded real FFT, and "auto" (default) picks the faster
+        one for the length of the series and the number of lags.
+    profile : bool or str, optional
+        If True, the wall time of every stage ("cache", "gen" or "delta",
+        "acf", "pacf", "ljung_box", "stationarity", "normality",
+        "confidence_bands", "plot" and "export") is stored in the `timings` attribute of the result. With
+        "memory" the peak allocations of every stage are also traced into
+        `allocations`, which slows the call down. Default is False.
+    tracer : actfts.tracing.Tracer, callable or OpenTelemetry tracer, optional
+        Receives one span per stage, e.g. `actfts.tracing.LoggingTracer()` or
+        `opentelemetry.trace.get_tracer("actfts")`. A callable is called as
+        `tracer(stage, seconds)`. A tracer also fills `timings`. Default is
+        None, which adds no measurable overhead.
+    boxcox : bool, optional
+        Add the Box-Cox lambda of strictly positive series to the normality
+        tests. The lambdas are cached by the content of the series. Default is
+        True.
 
     Returns
     -------
-    tuple
+    AcfinterResult
+        A tuple that unpacks as before into:
         - results_df (pd.DataFrame): A dataframe containing the ACF, PACF, Box-Pierce, and Ljung-Box statistics.
         - stationarity_results (pd.DataFrame): Results from stationarity tests (ADF, KPSS-Level, KPSS-Trend).
         - normality_results (pd.DataFrame): Results from normality tests (Shapiro-Wilks, Kolmogorov-Smirnov, Box-Cox if applicable).
-    plot
-        - tha ACF, PACF and pv ljung plots.
+        Its `figure()` and `show()` methods render the ACF, PACF and pv ljung plots on demand.
 
     Raises
     ------
     ValueError
-        If the input data is not numeric or if `delta` or `ci_method` is invalid.
+        If the input data is not numeric or if `delta`, `ci_method` or `acf_method` is invalid.
 
     Notes
     -----
@@ -70,334 +455,152 @@ def acfinter(datag, lag=72, ci_method="white", ci=0.95, interactive=False,
       - KPSS for level and trend
       - Phillips-Perron (PP)
     - Normality tests performed include:
-      - Shapiro-Wilks
-      - Kolmogorov-Smirnov
-      - Box-Cox (only for positive data)
+      - Shapiro-Wilks (on an evenly spaced subsample of 5000 points for longer series)
+      - Kolmogorov-Smirnov against the fitted normal distribution
+      - Jarque-Bera and Anderson-Darling (only above 5000 observations)
+      - Box-Cox (only for positive data, unless `boxcox` is False)
     - Confidence intervals for ACF/PACF can be computed using the white noise assumption or 
-      moving average structure (ci_method="ma").
+      moving average structure (ci_method="ma"). They use the exact normal quantile, and with
+      "ma" only the ACF band follows Bartlett's formula; the PACF band stays at z/sqrt(n).
     - Box-Pierce and Ljung-Box statistics are calculated for serial correlation testing.
     """
     
-    def gen(datag, delta="levels"):
-        if not isinstance(datag, (np.ndarray, pd.Series)):
-            raise ValueError("The input must be a numeric vector or a time series object.")
-        
-        if delta not in ["levels", "diff1", "diff2", "diff3"]:
-            raise ValueError('The argument "delta" must be one of "levels", "diff1", "diff2", or "diff3".')
-        
-        if delta == "levels":
-            return datag
-        elif delta == "diff1":
-            return np.diff(datag, n=1)
-        elif delta == "diff2":
-            return np.diff(datag, n=2)
-        elif delta == "diff3":
-            return np.diff(datag, n=3)
-    
-    data = gen(datag, delta)
-    ldata = len(data)
-    
-    if ldata <= lag:
-        lag = ldata - 1
-    
-    acf_vals, acf_confint = acf(data, nlags=lag, alpha=ci)
-    pacf_vals, pacf_confint = pacf(data, nlags=lag, alpha=ci)
+    timer = None
+    if profile or tracer is not None:
+        timer = StageTimer(memory=profile == "memory", parent=as_tracer(tracer))
+    trace = timer or NULL_TRACER
+
+    result = key = None
+    if cache:
+        from actfts.cache import cache_key, default_cache
+
+        with trace.span("cache"):
+            store = default_cache() if cache is True else cache
+            key = cache_key(datag, lag=lag, delta=delta, ci=ci, ci_method=ci_method,
+                            acf_method=acf_method, boxcox=boxcox)
+            if key is not None:
+                result = store.get(key)
+
+    if result is None:
+        result = _acfinter_tables(datag, lag, ci_method, ci, delta, acf_method, trace, boxcox)
+        if key is not None:
+            store.put(key, result)
+
+    if timer is not None:
+        # The dictionaries keep filling during the plot and export stages.
+        result.timings = timer.timings
+        result.allocations = timer.allocations
 
-    Box_Pierce = acorr_ljungbox(data, lags=lag, boxpierce=True)
+    if interactive:
+        from actfts.explorer import explore
 
-    results_df = pd.DataFrame({
-        'Lag': range(1, lag + 1),
-        'ACF': acf_vals[1:],
-        'PACF': pacf_vals[1:],
-        'Box_Pierce': Box_Pierce['bp_stat'],
-        'Pv_Box': Box_Pierce['bp_pvalue'],
-        'Ljung_Box': Box_Pierce['lb_stat'],
-        'Pv_Ljung': Box_Pierce['lb_pvalue']
-    })
-
-    def phillips_perron(ts_data):
-        # Validación del tipo de entrada
-        if isinstance(ts_data, pd.Series):
-            ts_data = ts_data.values  # Convertir pandas.Series a numpy.ndarray
-        elif not isinstance(ts_data, np.ndarray):
-            raise ValueError("El argumento ts_data debe ser un numpy.ndarray o pandas.Series.")
-        
-        if ts_data.ndim != 1:
-            raise ValueError("El argumento ts_data debe ser un array o serie unidimensional.")
-        
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=Warning)
-            
-            # Calcular primera diferencia
-            ts_diff = np.diff(ts_data, n=1)
-            
-            # Matriz de diseño: agregar una constante
-            X = sm.add_constant(ts_data[:-1])  # Usar hasta el penúltimo valor para alinear con ts_diff
-            y = ts_diff
-            
-            # Ajustar modelo de regresión lineal
-            model = sm.OLS(y, X).fit()
-            gamma_hat = model.params[1]
-            std_error = model.bse[1]
-            pp_statistic = gamma_hat / std_error
-            
-            # Aplicar prueba ADF (con regresión constante y tendencia)
-            adf_result = adfuller(ts_data)
-            p_value = adf_result[1]
-            
-            return pp_statistic, p_value
-
-    def stationarity_tests(data):
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=InterpolationWarning)
-            adf = adfuller(data)
-            kpss_level = kpss(data, regression='c')
-            kpss_trend = kpss(data, regression='ct')
-            pp_result = phillips_perron(data)
-        
-        return pd.DataFrame({
-            'Statistic': [adf[0], kpss_level[0], kpss_trend[0], pp_result[0]],
-            'P_Value': [adf[1], kpss_level[1], kpss_trend[1], pp_result[1]]
-        }, index=["ADF", "KPSS-Level", "KPSS-Trend", "PP"])
-
-    stationarity_results = stationarity_tests(data)
-
-    def normality_tests(data):
-        if np.any(data <= 0):
-            shapiro_result = stats.shapiro(data)
-            ks_result = stats.ks_2samp(data, np.random.normal(np.mean(data), np.std(data), size=len(data)))
-            return pd.DataFrame({
-                'Statistic': [shapiro_result.statistic, ks_result.statistic],
-                'P_Value': [shapiro_result.pvalue, ks_result.pvalue]
-            }, index=["Shapiro Wilks", "Kolmogorov Smirnov"])
+        with trace.span("plot"):
+            explore(result)
+    elif plot:
+        with trace.span("plot"):
+            result.show()
 
+    if download:
+        from actfts.export import available_path, export_results
+
+        if download is not True:
+            filename = Path(download)
+        elif 'google.colab' in sys.modules:
+            filename = Path("/content/Results.xlsx")
         else:
-            shapiro_result = stats.shapiro(data)
-            ks_result = stats.ks_2samp(data, np.random.normal(np.mean(data), np.std(data), size=len(data)))
-            _, bc_lamda = stats.boxcox(data)
-            return pd.DataFrame({
-                'Statistic': [shapiro_result.statistic, ks_result.statistic, bc_lamda],
-                'P_Value': [shapiro_result.pvalue, ks_result.pvalue, np.nan]
-            }, index=["Shapiro Wilks", "Kolmogorov Smirnov", "Box Cox"])
-
-    normality_results = normality_tests(data)
-
-    def get_clim1(x, ci=0.95, ci_type="white"):
-        if ci_type not in ["white", "ma"]:
-            raise ValueError('`ci_type` must be "white" or "ma"')
-        
-        clim0 = np.quantile(np.random.normal(size=100000), (1 + ci) / 2) / np.sqrt(ldata)
-        
-        if ci_type == "ma":
-            clim = clim0 * np.sqrt(np.cumsum(np.concatenate(([1], 2 * results_df['ACF']**2))))
-            return clim[:-1]
-        else:
-            lineci1 = np.full(len(results_df['ACF']), clim0)
-            return lineci1
-
-    def get_clim2(x, ci=0.95, ci_type="white"):
-        if ci_type not in ["white", "ma"]:
-            raise ValueError('`ci_type` must be "white" or "ma"')
-        
-        clim0 = np.quantile(np.random.normal(size=100000), (1 + ci) / 2) / np.sqrt(ldata)
-        
-        if ci_type == "ma":
-            clim = clim0 * np.sqrt(np.cumsum(np.concatenate(([1], 2 * results_df['PACF']**2))))
-            return clim[:-1]
-        else:
-            lineci2 = np.full(len(results_df['PACF']), clim0)
-            return lineci2
-
-    saveci1 = get_clim1(results_df['ACF'], ci=ci, ci_type=ci_method)
-    saveci2 = get_clim2(results_df['PACF'], ci=ci, ci_type=ci_method)
-
-    def fig_to_base64(fig):
-        img_buf = io.BytesIO()
-        fig.savefig(img_buf, format='png')
-        img_buf.seek(0)
-        return base64.b64encode(img_buf.read()).decode('utf-8')
-
-    def generate_graphs():
-        # Crear los gráficos
-        fig, ax = plt.subplots(3, 1, figsize=(10, 12))
-
-        ax[0].stem(range(len(acf_vals[1:])), acf_vals[1:], label='ACF', basefmt=" ")
-        ax[0].set_title("Autocorrelation Function (ACF)")
-        ax[0].set_xlabel('Lags')
-        ax[0].set_ylabel('ACF')
-        ax[0].grid(True, linestyle='dotted')
-        if ci_method == "ma":
-            ax[0].plot(range(len(saveci1)), saveci1, color='blue', linestyle='--', label='Upper CI')
-            ax[0].plot(range(len(saveci1)), -saveci1, color='blue', linestyle='--', label='Lower CI')
-        else:
-            ax[0].axhline(y=saveci1[0], color='blue', linestyle='--', label='Upper CI')
-            ax[0].axhline(y=-saveci1[0], color='blue', linestyle='--', label='Lower CI')
-
-        ax[1].stem(range(len(pacf_vals[1:])), pacf_vals[1:], label='PACF', basefmt=" ")
-        ax[1].set_title("Partial Autocorrelation Function (PACF)")
-        ax[1].set_xlabel('Lags')
-        ax[1].set_ylabel('PACF')
-        ax[1].grid(True, linestyle='dotted')
-        if ci_method == "ma":
-            ax[1].plot(range(len(saveci2)), saveci2, color='blue', linestyle='--', label='Upper CI')
-            ax[1].plot(range(len(saveci2)), -saveci2, color='blue', linestyle='--', label='Lower CI')
-        else:
-            ax[1].axhline(y=saveci2[0], color='blue', linestyle='--', label='Upper CI')
-            ax[1].axhline(y=-saveci2[0], color='blue', linestyle='--', label='Lower CI')
-
-        ax[2].plot(Box_Pierce['lb_pvalue'], label='Ljung-Box Statistic', color='red', linestyle='None', marker='o', markersize=5)
-        ax[2].set_title("Ljung-Box Test (Pv)")
-        ax[2].set_xlabel('Lags')
-        ax[2].set_ylabel('Ljung-Box Stat')
-        ax[2].grid(True, linestyle='dotted')
-        ax[2].set_ylim(-0.02, 0.2)
-        ax[2].axhline(y=0.05, color='blue', linestyle='--', label='0.05 Threshold')
-
-        fig.subplots_adjust(hspace=0.52)
-
-        # Convertir la figura a base64
-        img_base64 = fig_to_base64(fig)
-        return img_base64
-
-    def show_dynamic_table():
-        # Procesar los DataFrames en un formato unificado para ACF/PACF
-        acf_pacf_results = results_df.copy()
-        
-        # Para Stationarity
-        stationarity_results_mod = stationarity_results.reset_index().rename(columns={ 'index': 'Test', 'Statistic': 'Statistic', 'P_Value': 'P_Value' })
-
-        # Para Normality
-        normality_results_mod = normality_results.reset_index().rename(columns={ 'index': 'Test', 'Statistic': 'Statistic', 'P_Value': 'P_Value' })
-
-        # Crear la aplicación Dash
-        app = Dash(__name__)
-        
-        # Configurar la estructura básica del layout
-        layout = html.Div([
-
-            # Título
-            html.H1("Interactive Results from Acfinter() Function", style={'text-align': 'center'}),
-
-            # Tabs para las tablas
-            dcc.Tabs([
-                dcc.Tab(label='ACF/PACF', children=[
-                    dash_table.DataTable(
-                        id='acf-pacf-table',
-                        columns=[{'name': col, 'id': col} for col in acf_pacf_results.columns],
-                        data=acf_pacf_results.to_dict('records'),
-                        page_size=10,
-                        style_table={'height': '500px', 'overflowY': 'auto'},
-                        style_cell={'textAlign': 'left', 'padding': '10px'},
-                        style_header={'backgroundColor': 'lightgrey', 'fontWeight': 'bold'},
-                        filter_action="native",
-                        sort_action="native"
-                    )
-                ]),
-
-                dcc.Tab(label='Stationarity', children=[
-                    dash_table.DataTable(
-                        id='stationarity-table',
-                        columns=[{'name': col, 'id': col} for col in stationarity_results_mod.columns],
-                        data=stationarity_results_mod.to_dict('records'),
-                        page_size=10,
-                        style_table={'height': '250px', 'overflowY': 'auto'},
-                        style_cell={'textAlign': 'left', 'padding': '10px'},
-                        style_header={'backgroundColor': 'lightgrey', 'fontWeight': 'bold'},
-                        filter_action="native",
-                        sort_action="native"
-                    )
-                ]),
-
-                dcc.Tab(label='Normality', children=[
-                    dash_table.DataTable(
-                        id='normality-table',
-                        columns=[{'name': col, 'id': col} for col in normality_results_mod.columns],
-                        data=normality_results_mod.to_dict('records'),
-                        page_size=10,
-                        style_table={'height': '250px', 'overflowY': 'auto'},
-                        style_cell={'textAlign': 'left', 'padding': '10px'},
-                        style_header={'backgroundColor': 'lightgrey', 'fontWeight': 'bold'},
-                        filter_action="native",
-                        sort_action="native"
-                    )
-                ]),
-
-                dcc.Tab(label='Plots', children=[
-                    html.Div([
-                        html.H3('ACF/PACF and PV Ljung', style={'textAlign': 'center'}),  # Centrar el título
-                        html.Div([
-                            html.Img(src=f"data:image/png;base64,{generate_graphs()}", style={'display': 'block', 'margin': '0 auto'})
-                        ], style={'textAlign': 'center'})  # Centrar la imagen
-                    ])
-                ])
-            ])
-        ])
-        
-        app.layout = layout  # Asignar layout una sola vez
-
-        # Ejecutar la aplicación Dash
-        app.run_server(debug=True, use_reloader=False)
-
-    # Condición para ejecutar la tabla interactiva
-    if interactive:
-        show_dynamic_table()
-    else:
-        fig, ax = plt.subplots(3, 1, figsize=(10, 12))
-
-        ax[0].stem(range(len(acf_vals[1:])), acf_vals[1:], label='ACF', basefmt=" ")
-        ax[0].set_title("Autocorrelation Function (ACF)")
-        ax[0].set_xlabel('Lags')
-        ax[0].set_ylabel('ACF')
-        ax[0].grid(True, linestyle='dotted')
-        if ci_method == "ma":
-            ax[0].plot(range(len(saveci1)), saveci1, color='blue', linestyle='--', label='Upper CI')
-            ax[0].plot(range(len(saveci1)), -saveci1, color='blue', linestyle='--', label='Lower CI')
-        else:
-            ax[0].axhline(y=saveci1[0], color='blue', linestyle='--', label='Upper CI')
-            ax[0].axhline(y=-saveci1[0], color='blue', linestyle='--', label='Lower CI')
-
-        ax[1].stem(range(len(pacf_vals[1:])), pacf_vals[1:], label='PACF', basefmt=" ")
-        ax[1].set_title("Partial Autocorrelation Function (PACF)")
-        ax[1].set_xlabel('Lags')
-        ax[1].set_ylabel('PACF')
-        ax[1].grid(True, linestyle='dotted')
-        if ci_method == "ma":
-            ax[1].plot(range(len(saveci2)), saveci2, color='blue', linestyle='--', label='Upper CI')
-            ax[1].plot(range(len(saveci2)), -saveci2, color='blue', linestyle='--', label='Lower CI')
-        else:
-            ax[1].axhline(y=saveci2[0], color='blue', linestyle='--', label='Upper CI')
-            ax[1].axhline(y=-saveci2[0], color='blue', linestyle='--', label='Lower CI')
-
-        ax[2].plot(Box_Pierce['lb_pvalue'], label='Ljung-Box Statistic', color='red', linestyle='None', marker='o', markersize=5)
-        ax[2].set_title("Ljung-Box Test (Pv)")
-        ax[2].set_xlabel('Lags')
-        ax[2].set_ylabel('Ljung-Box Stat')
-        ax[2].grid(True, linestyle='dotted')
-        ax[2].set_ylim(-0.02, 0.2)
-        ax[2].axhline(y=0.05, color='blue', linestyle='--', label='0.05 Threshold')
-
-        fig.subplots_adjust(hspace=0.52)
-        plt.show()
+            filename = available_path(Path.home() / "Downloads" / "Results.xlsx")
+        with trace.span("export"):
+            filename = export_results(result, filename)
 
-    if download:
         if 'google.colab' in sys.modules:
             from google.colab import files
-            filename = "/content/Results.xlsx"
-            with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-                results_df.to_excel(writer, sheet_name="ACF_PACF", index=False)
-                stationarity_results.to_excel(writer, sheet_name="Stationarity", index=True)
-                normality_results.to_excel(writer, sheet_name="Normality", index=True)
-
-            files.download(filename)
-        
-        else:
-            downloads_folder = str(Path.home() / "Downloads")
-            filename = os.path.join(downloads_folder, "Results.xlsx")
-            with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-                results_df.to_excel(writer, sheet_name="ACF_PACF", index=False)
-                stationarity_results.to_excel(writer, sheet_name="Stationarity", index=True)
-                normality_results.to_excel(writer, sheet_name="Normality", index=True)
 
+            files.download(str(filename))
+        else:
             print(f"Archivo guardado en: {filename}")
 
-    return results_df, stationarity_results, normality_results
\ No newline at end of file
+    return result
+
+
+def acfinter_panel(datag, lag=72, delta="levels", n_jobs=None, executor=None, acf_method="auto",
+                   boxcox=True):
+    """Perform the `acfinter` analysis on a whole panel of time series at once.
+
+    The ACF, PACF, Box-Pierce and Ljung-Box statistics are computed for every
+    series in a single batch of array operations, so wide panels are analysed
+    much faster than calling `acfinter` once per column. No plots are produced.
+
+    Parameters
+    ----------
+    datag : array-like
+        A pandas DataFrame or a 2-D numpy array with one series per column. A
+        single vector or pandas Series is treated as a panel with one column.
+        All series must have the same length and no missing values.
+    lag : int, optional
+        Maximum number of lags to calculate ACF and PACF, by default 72.
+    delta : str, optional
+        Transformation applied to every series, one of "levels" (default),
+        "diff1", "diff2" or "diff3".
+    n_jobs : int, optional
+        Number of worker processes for the stationarity tests, which are the
+        slowest part of the analysis. None or 1 (default) runs serially and -1
+        uses every available CPU. With `executor`, pass its size.
+    executor : concurrent.futures.Executor, optional
+        An existing executor for the stationarity tests, used instead of
+        creating a process pool; see `stationarity_panel`.
+    acf_method : str, optional
+        "auto" (default), "direct" or "fft"; see `acfinter`.
+    boxcox : bool, optional
+        Add the Box-Cox lambda of strictly positive series to the normality
+        tests, by default True.
+
+    Returns
+    -------
+    PanelResult
+        - results_df (pd.DataFrame): The ACF, PACF, Box-Pierce and Ljung-Box
+          statistics of every series, indexed by series name.
+        - stationarity_results (pd.DataFrame): The stationarity tests of every
+          series, indexed by series name and test.
+        - normality_results (pd.DataFrame): The normality tests of every series,
+          indexed by series name and test.
+        The number of observations behind the tables is kept as `nobs`.
+
+    Raises
+    ------
+    ValueError
+        If the input is not numeric, contains missing values or `delta` is invalid.
+
+    Examples
+    --------
+    >>> panel = pd.concat([DPIEEUU_dataset(), GDPEEUU_dataset()], axis=1)
+    >>> results_df, stationarity_results, normality_results = acfinter_panel(panel, lag=12)
+    >>> results_df.loc["GDPEEUU"]
+    """
+    values, names = as_panel(datag)
+    data = gen(values, delta)
+    ldata = data.shape[0]
+
+    if ldata <= lag:
+        lag = ldata - 1
+
+    acov = autocovariance(data, lag, method=acf_method)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        acf_vals = acov / acov[0]
+    pacf_vals = durbin_levinson(acov, ldata)
+    qstats = q_statistics(acf_vals, ldata)
+
+    lags = np.arange(1, lag + 1)
+    results_df = pd.DataFrame({
+        'Lag': np.tile(lags, len(names)),
+        'ACF': acf_vals[1:].ravel(order='F'),
+        'PACF': pacf_vals[1:].ravel(order='F'),
+        'Box_Pierce': qstats['bp_stat'].ravel(order='F'),
+        'Pv_Box': qstats['bp_pvalue'].ravel(order='F'),
+        'Ljung_Box': qstats['lb_stat'].ravel(order='F'),
+        'Pv_Ljung': qstats['lb_pvalue'].ravel(order='F')
+    }, index=pd.Index(names, name="Series").repeat(lag))
+
+    stationarity_results = stationarity_panel(data, names, n_jobs=n_jobs, executor=executor)
+    normality_results = normality_panel(data, names, boxcox=boxcox)
+
+    return PanelResult(results_df, stationarity_results, normality_results, nobs=ldata)
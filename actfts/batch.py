@@ -0,0 +1,329 @@
+import glob
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Suffixes of the input files, and of the part files of the output.
+INPUT_SUFFIXES = ('.csv', '.parquet')
+OUTPUT_FORMATS = ('parquet', 'csv')
+
+
+def _columns_of(path):
+    # Names of the numeric columns of a file, read from its header only. The
+    # other columns (dates, labels) are not series.
+    if path.suffix.lower() == '.parquet':
+        import pyarrow.parquet as pq
+        import pyarrow.types as pat
+
+        schema = pq.read_schema(path)
+        return [field.name for field in schema
+                if (pat.is_integer(field.type) or pat.is_floating(field.type))
+                and not field.name.startswith('__index_level_')]
+    sample = pd.read_csv(path, nrows=100, na_values=".")
+    return [name for name in sample.columns if pd.api.types.is_numeric_dtype(sample[name])]
+
+
+def discover(inputs):
+    """Find the series in files, directories and glob patterns.
+
+    Every numeric column of a CSV or Parquet file is a series; other columns,
+    such as dates, are ignored. When a single file is given its columns keep
+    their names, which suits one wide table. With several files a one-column
+    file is named after its stem and the columns of wider files are named
+    "stem/column".
+
+    Parameters
+    ----------
+    inputs : sequence of str
+        Paths to .csv or .parquet files, directories (searched for such files,
+        not recursively) or glob patterns.
+
+    Returns
+    -------
+    list of tuple
+        One (path, columns, names) tuple per file, in sorted path order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If nothing matches.
+    """
+    paths = []
+    for item in inputs:
+        item = os.path.expanduser(item)
+        if os.path.isdir(item):
+            paths.extend(p for p in sorted(Path(item).iterdir())
+                         if p.suffix.lower() in INPUT_SUFFIXES)
+        elif os.path.exists(item):
+            paths.append(Path(item))
+        else:
+            paths.extend(Path(p) for p in sorted(glob.glob(item))
+                         if Path(p).suffix.lower() in INPUT_SUFFIXES)
+    paths = sorted(dict.fromkeys(paths))
+    if not paths:
+        raise FileNotFoundError(f"No CSV or Parquet files match {list(inputs)}.")
+
+    files = []
+    for path in paths:
+        columns = _columns_of(path)
+        if len(paths) == 1:
+            names = [str(c) for c in columns]
+        elif len(columns) == 1:
+            names = [path.stem]
+        else:
+            names = [f"{path.stem}/{c}" for c in columns]
+        files.append((path, columns, names))
+    return files
+
+
+def _read_columns(path, columns):
+    if path.suffix.lower() == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, na_values=".")
+
+
+def _trimmed(column):
+    # The values of a column without its leading and trailing missing values.
+    # A gap inside the series would shift the lags, so it is an error.
+    values = column.to_numpy(dtype=float)
+    present = np.flatnonzero(~np.isnan(values))
+    if present.size == 0:
+        raise ValueError("The series has no values.")
+    values = values[present[0]:present[-1] + 1]
+    if present.size < values.shape[0]:
+        raise ValueError(f"The series has {values.shape[0] - present.size} missing values "
+                         "between its first and last observations.")
+    return values
+
+
+def _analyse(path, columns, names, options):
+    # Worker entry point: analyse some columns of one file. Failures are
+    # returned with the series name instead of stopping the batch.
+    from actfts.actfts_fun import acfinter
+    from actfts.export import results_frame
+
+    frames, failures = [], []
+    try:
+        data = _read_columns(path, columns)
+    except Exception as exc:
+        return frames, [(name, f"{type(exc).__name__}: {exc}") for name in names]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for column, name in zip(columns, names):
+            try:
+                result = acfinter(_trimmed(data[column]), plot=False, **options)
+            except Exception as exc:
+                failures.append((name, f"{type(exc).__name__}: {exc}"))
+            else:
+                frames.append(results_frame({name: result}))
+    return frames, failures
+
+
+def completed_series(output):
+    """Names of the series already written to a batch output folder.
+
+    Parameters
+    ----------
+    output : str or pathlib.Path
+        The output folder of `run_batch`.
+
+    Returns
+    -------
+    set of str
+    """
+    done = set()
+    for part in sorted(Path(output).glob("part-*")):
+        if part.suffix == '.parquet':
+            done.update(pd.read_parquet(part, columns=['Series'])['Series'])
+        elif part.suffix == '.csv':
+            done.update(pd.read_csv(part, usecols=['Series'], dtype=str)['Series'])
+    return done
+
+
+class _PartWriter:
+    # Buffers finished series and writes them as numbered part files. Each part
+    # is written to a temporary name and renamed, so an interrupted run never
+    # leaves a truncated part behind and resuming only has to list the parts.
+
+    def __init__(self, output, fmt, flush_every, flush_seconds):
+        self.output = Path(output)
+        self.fmt = fmt
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.frames = []
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        numbers = [int(p.stem.split('-')[1]) for p in self.output.glob("part-*.*")
+                   if p.stem.split('-')[1].isdigit()]
+        self.number = max(numbers, default=-1) + 1
+
+    def add(self, frames):
+        self.frames.extend(frames)
+        self.pending += len(frames)
+        if (self.pending >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.frames:
+            return
+        frame = pd.concat(self.frames, ignore_index=True)
+        path = self.output / f"part-{self.number:05d}.{self.fmt}"
+        tmp = path.with_name(f".{path.name}.tmp")
+        if self.fmt == 'parquet':
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        self.number += 1
+        self.frames, self.pending = [], 0
+
+
+def _progress(stream, done, total, failed, started, final=False):
+    elapsed = time.monotonic() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else float('nan')
+    line = (f"[{done:>{len(str(total))}}/{total}] {100.0 * done / max(total, 1):5.1f}%  "
+            f"{rate:8.1f} series/s  elapsed {elapsed:7.1f}s  eta {eta:7.1f}s  failed {failed}")
+    if stream.isatty() and not final:
+        stream.write("\r" + line)
+    else:
+        stream.write(("\r" if stream.isatty() else "") + line + "\n")
+    stream.flush()
+
+
+def run_batch(inputs, output, lag=72, delta="levels", ci_method="white", ci=0.95,
+              fmt="parquet", n_jobs=None, resume=False, flush_every=200, flush_seconds=10.0,
+              progress=True):
+    """Analyse every series found in files, directories or glob patterns.
+
+    The series are analysed with `acfinter` by a pool of worker processes and
+    their tables are written, as the series finish, to numbered part files in
+    the `output` folder, in the long layout of `actfts.export.results_frame`.
+    The folder reads back as one table with `pd.read_parquet(output)`. With
+    `resume`, the series already present in the parts are skipped, so an
+    interrupted batch can be restarted with the same command.
+
+    Missing values at the start and end of a column are dropped. A series
+    with gaps between its first and last observations, non-numeric values or
+    an unreadable file is reported as failed and the batch goes on.
+
+    Parameters
+    ----------
+    inputs : sequence of str
+        Files, directories and glob patterns; see `discover`.
+    output : str or pathlib.Path
+        Output folder, created if needed.
+    lag, delta, ci_method, ci
+        Passed to `acfinter`.
+    fmt : str, optional
+        Format of the part files, "parquet" (default, needs pyarrow) or "csv".
+    n_jobs : int, optional
+        Number of worker processes. None or -1 (default) uses every available
+        CPU and 1 runs in this process.
+    resume : bool, optional
+        Skip the series already written to `output`. Without it, existing part
+        files make the call fail rather than mixing two runs. Default is False.
+    flush_every : int, optional
+        Write a part file after this many finished series, by default 200.
+    flush_seconds : float, optional
+        Also write a part file when this many seconds have passed since the
+        last one, by default 10.
+    progress : bool, optional
+        Print progress and throughput to stderr. Default is True.
+
+    Returns
+    -------
+    dict
+        'total', 'skipped', 'done' and 'failed' series counts, 'seconds', and
+        'failures', a list of (series, error message) pairs.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no input files match.
+    FileExistsError
+        If `output` already holds results and `resume` is False.
+    ValueError
+        If `fmt` or `n_jobs` is invalid.
+
+    Examples
+    --------
+    >>> run_batch(["data/*.csv"], "results", lag=24, delta="diff1")
+    >>> results = pd.read_parquet("results")
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError('The output format must be "parquet" or "csv".')
+    workers = (os.cpu_count() or 1) if n_jobs in (None, -1) else n_jobs
+    if workers < 1:
+        raise ValueError('The argument "n_jobs" must be a positive integer or -1.')
+
+    output = Path(output).expanduser()
+    output.mkdir(parents=True, exist_ok=True)
+    done_before = completed_series(output)
+    if done_before and not resume:
+        raise FileExistsError(f"{output} already holds results; resume the batch or choose another folder.")
+
+    # Tasks of a few series each, about four per worker per file, so a wide
+    # table is split across the pool without reading it once per column.
+    tasks, total, skipped = [], 0, 0
+    for path, columns, names in discover(inputs):
+        todo = [(c, n) for c, n in zip(columns, names) if n not in done_before]
+        total += len(columns)
+        skipped += len(columns) - len(todo)
+        nchunks = min(len(todo), 4 * workers)
+        for chunk in np.array_split(np.arange(len(todo)), nchunks) if nchunks else []:
+            tasks.append((path, [todo[i][0] for i in chunk], [todo[i][1] for i in chunk]))
+
+    options = dict(lag=lag, delta=delta, ci_method=ci_method, ci=ci)
+    writer = _PartWriter(output, fmt, flush_every, flush_seconds)
+    failures, done = [], 0
+    remaining = total - skipped
+    started = time.monotonic()
+    stream = sys.stderr
+
+    last_report, reported = started, 0
+
+    def collect(frames, failed):
+        nonlocal done, last_report, reported
+        writer.add(frames)
+        failures.extend(failed)
+        done += len(frames) + len(failed)
+        # At most one progress line per second.
+        if progress and time.monotonic() - last_report >= 1.0:
+            last_report, reported = time.monotonic(), done
+            _progress(stream, done, remaining, len(failures), started)
+
+    if progress and skipped:
+        stream.write(f"Skipping {skipped} series already in {output}\n")
+    try:
+        if workers == 1:
+            for task in tasks:
+                collect(*_analyse(*task, options))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, max(len(tasks), 1))) as pool:
+                running = {pool.submit(_analyse, *task, options) for task in tasks}
+                while running:
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(*future.result())
+    finally:
+        writer.flush()
+
+    seconds = time.monotonic() - started
+    if progress:
+        if reported != done or stream.isatty():
+            _progress(stream, done, remaining, len(failures), started, final=True)
+        for name, message in failures[:10]:
+            stream.write(f"  failed {name}: {message}\n")
+        if len(failures) > 10:
+            stream.write(f"  ... and {len(failures) - 10} more\n")
+    return {'total': total, 'skipped': skipped, 'done': done - len(failures),
+            'failed': len(failures), 'seconds': seconds, 'failures': failures}
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def cache_key(datag, **params):
+    """Content hash of a series and the parameters of an analysis.
+
+    The raw buffer of the values is hashed with BLAKE2b together with its dtype,
+    its shape and the sorted parameters, so equal data analysed with equal
+    parameters always map to the same key. The index of a pandas Series does
+    not take part, since it does not change the results.
+
+    Parameters
+    ----------
+    datag : np.ndarray or pd.Series
+        The input series.
+    **params
+        The parameters of the analysis, e.g. lag, delta, ci and ci_method.
+
+    Returns
+    -------
+    str or None
+        A hexadecimal digest, or None when the values have no numeric buffer to
+        hash (object arrays), in which case the analysis should not be cached.
+    """
+    values = datag.to_numpy() if isinstance(datag, pd.Series) else np.asarray(datag)
+    if values.dtype.hasobject:
+        return None
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{values.dtype.str}|{values.shape}|{sorted(params.items())!r}".encode())
+    digest.update(memoryview(values).cast("B"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier memoisation store for analysis results.
+
+    Results are kept pickled, so every hit returns an independent copy that the
+    caller may modify freely, and the size of an entry is the exact length of
+    its payload. The memory tier is an LRU bounded by `max_bytes`; the least
+    recently used entries are evicted first. With a `directory`, every result is
+    also written there and survives the process, and memory misses fall back to
+    it. Only point `directory` at a folder you trust, since its files are
+    unpickled.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory budget of the in-memory tier, by default 256 MiB.
+    directory : str or pathlib.Path, optional
+        Folder of the on-disk tier. By default nothing is written to disk.
+
+    Examples
+    --------
+    >>> store = ResultCache(max_bytes=64 * 2**20, directory="~/.cache/actfts/results")
+    >>> acfinter(datag, lag=24, plot=False, cache=store)
+    >>> store.stats()
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = int(max_bytes)
+        self.directory = Path(directory).expanduser() if directory is not None else None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    def _remember(self, key, payload):
+        # Caller holds the lock.
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[key] = payload
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= len(old)
+            self.evictions += 1
+
+    def get(self, key):
+        """Look a result up, in memory first and then on disk.
+
+        Parameters
+        ----------
+        key : str
+            A key from `cache_key`.
+
+        Returns
+        -------
+        object or None
+            A fresh copy of the stored result, or None on a miss.
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(payload)
+
+        payload = None
+        if self.directory is not None:
+            try:
+                payload = self._path(key).read_bytes()
+            except OSError:
+                payload = None
+
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, payload)
+        return pickle.loads(payload)
+
+    def put(self, key, result):
+        """Store a result under `key`.
+
+        Parameters
+        ----------
+        key : str
+            A key from `cache_key`.
+        result : object
+            Any picklable result.
+        """
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, payload)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            # Unique temporary name, then an atomic rename, so concurrent
+            # writers and readers never see a partial file.
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+
+    def clear(self, disk=False):
+        """Empty the memory tier, and the disk tier too if `disk` is True."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk and self.directory is not None and self.directory.exists():
+            for path in self.directory.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+    def stats(self):
+        """Counters for monitoring the cache.
+
+        Returns
+        -------
+        dict
+            'hits' (memory), 'disk_hits', 'misses', 'hit_rate' (both tiers over
+            all lookups), 'evictions', 'entries' and 'bytes' of the memory tier,
+            'max_bytes' and, with a disk tier, 'disk_entries' and 'disk_bytes'.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+        if self.directory is not None:
+            files = list(self.directory.glob("*.pkl")) if self.directory.exists() else []
+            stats['disk_entries'] = len(files)
+            stats['disk_bytes'] = sum(path.stat().st_size for path in files)
+        return stats
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The process-wide cache used by `acfinter(..., cache=True)`.
+
+    It is created on first use, memory only, with the default budget.
+
+    Returns
+    -------
+    ResultCache
+        The shared cache.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
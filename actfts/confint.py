@@ -0,0 +1,73 @@
+from functools import lru_cache
+from statistics import NormalDist
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def normal_quantile(ci):
+    """Two-sided critical value of the standard normal for confidence level `ci`."""
+    return NormalDist().inv_cdf((1 + ci) / 2)
+
+
+@lru_cache(maxsize=256)
+def white_band(nobs, lag, ci):
+    """Flat band z / sqrt(n) for `lag` lags, cached by (nobs, lag, ci).
+
+    Returns
+    -------
+    np.ndarray
+        A read-only array of length `lag`.
+    """
+    band = np.full(lag, normal_quantile(ci) / np.sqrt(nobs))
+    band.setflags(write=False)
+    return band
+
+
+def confidence_bands(acf_vals, nobs, ci=0.95, ci_method="white"):
+    """Upper confidence bands of the ACF and the PACF.
+
+    With `ci_method="white"` both bands are z / sqrt(n). With "ma" the ACF band
+    follows Bartlett's formula for a moving average whose order grows with the
+    lag, z / sqrt(n) * sqrt(1 + 2 * sum of the squared lower-order
+    autocorrelations). The PACF band is always z / sqrt(n), its large-sample
+    standard error under the null.
+
+    Parameters
+    ----------
+    acf_vals : np.ndarray
+        Autocorrelations for lags 1 to `lag`, either a vector or an array of
+        shape (lag, n_series) for a panel of series with the same length.
+    nobs : int
+        Number of observations behind the autocorrelations.
+    ci : float, optional
+        Confidence level, by default 0.95.
+    ci_method : str, optional
+        "white" (default) or "ma".
+
+    Returns
+    -------
+    tuple
+        The ACF band, shaped like `acf_vals` for "ma" and a vector otherwise,
+        and the PACF band as a vector of length `lag`.
+
+    Raises
+    ------
+    ValueError
+        If `ci_method` is not "white" or "ma".
+    """
+    if ci_method not in ["white", "ma"]:
+        raise ValueError('`ci_method` must be "white" or "ma"')
+
+    acf_vals = np.asarray(acf_vals, dtype=float)
+    lag = acf_vals.shape[0]
+    pacf_band = white_band(nobs, lag, ci)
+
+    if ci_method == "white":
+        return pacf_band, pacf_band
+
+    # Bartlett: the band at lag k uses the autocorrelations of lags 1 to k - 1.
+    sq = 2 * acf_vals[:-1] ** 2
+    cum = np.concatenate([np.zeros_like(acf_vals[:1]), np.cumsum(sq, axis=0)])
+    acf_band = normal_quantile(ci) / np.sqrt(nobs) * np.sqrt(1 + cum)
+    return acf_band, pacf_band
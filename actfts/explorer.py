@@ -0,0 +1,421 @@
+import operator
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from actfts.confint import confidence_bands
+from actfts.export import stack_results
+
+# Operators of the filter syntax of Dash DataTables, longest spelling first.
+_FILTER_OPERATORS = [
+    ('ge', ['ge ', '>=']),
+    ('le', ['le ', '<=']),
+    ('lt', ['lt ', '<']),
+    ('gt', ['gt ', '>']),
+    ('ne', ['ne ', '!=']),
+    ('eq', ['eq ', '=']),
+    ('contains', ['contains ']),
+    ('datestartswith', ['datestartswith ']),
+]
+
+# Most options the series picker sends to the browser for one search.
+MAX_OPTIONS = 50
+
+_STYLE_CELL = {'textAlign': 'left', 'padding': '10px'}
+_STYLE_HEADER = {'backgroundColor': 'lightgrey', 'fontWeight': 'bold'}
+
+
+def _split_filter_part(part):
+    for name, spellings in _FILTER_OPERATORS:
+        for spelling in spellings:
+            if spelling in part:
+                column, value = part.split(spelling, 1)
+                column = column[column.find('{') + 1:column.rfind('}')]
+                value = value.strip()
+                if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"`":
+                    value = value[1:-1].replace('\\' + value[0], value[0])
+                else:
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        pass
+                return column, name, value
+    return None, None, None
+
+
+def filter_frame(frame, filter_query):
+    """Apply the `filter_query` of a Dash DataTable to a DataFrame.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The table to filter.
+    filter_query : str
+        Expressions such as "{ACF} > 0.2 && {Series} contains 'GDP'". Parts
+        naming unknown columns or comparing incompatible types are ignored.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that satisfy every part.
+    """
+    if not filter_query:
+        return frame
+    mask = np.ones(len(frame), dtype=bool)
+    for part in filter_query.split(' && '):
+        column, name, value = _split_filter_part(part)
+        if column not in frame.columns:
+            continue
+        values = frame[column]
+        try:
+            if name == 'contains':
+                part_mask = values.astype(str).str.contains(str(value), case=False, regex=False)
+            elif name == 'datestartswith':
+                part_mask = values.astype(str).str.startswith(str(value))
+            else:
+                part_mask = getattr(operator, name)(values, value)
+        except TypeError:
+            continue
+        mask &= np.asarray(part_mask, dtype=bool)
+    return frame[mask]
+
+
+def page_of(frame, page_current=0, page_size=20, sort_by=None, filter_query=""):
+    """Filter, sort and cut one page of a table, as the server side of a DataTable.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The full table.
+    page_current : int, optional
+        Zero-based page number, by default 0.
+    page_size : int, optional
+        Rows per page, by default 20.
+    sort_by : list of dict, optional
+        The `sort_by` property of the DataTable, items with 'column_id' and
+        'direction'.
+    filter_query : str, optional
+        The `filter_query` property of the DataTable.
+
+    Returns
+    -------
+    tuple
+        The records of the page and the number of pages.
+    """
+    frame = filter_frame(frame, filter_query)
+    sort_by = [item for item in sort_by or [] if item['column_id'] in frame.columns]
+    if sort_by:
+        frame = frame.sort_values([item['column_id'] for item in sort_by],
+                                  ascending=[item['direction'] == 'asc' for item in sort_by],
+                                  kind='stable')
+    page_count = max(1, -(-len(frame) // page_size))
+    page_current = min(page_current or 0, page_count - 1)
+    start = page_current * page_size
+    return frame.iloc[start:start + page_size].to_dict('records'), page_count
+
+
+def _groups(table):
+    # Position range of every series in a table stacked by series, so the rows
+    # of one series are a slice instead of a scan of the whole table.
+    names = table.index.get_level_values("Series").to_numpy()
+    if len(names) == 0:
+        return {}
+    cuts = np.flatnonzero(names[1:] != names[:-1]) + 1
+    starts = np.concatenate([[0], cuts])
+    ends = np.concatenate([cuts, [len(names)]])
+    return {names[a]: (a, b) for a, b in zip(starts, ends)}
+
+
+class PanelExplorer:
+    """Server-side data of the Dash explorer of a panel of analysed series.
+
+    The tables of every series are stacked once, with an index of the rows of
+    each series, so serving the page of one series costs a slice of its rows.
+    Figures are rendered when they are first requested and kept in an LRU cache.
+
+    Parameters
+    ----------
+    results : AcfinterResult, tuple or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs.
+    nobs : int, optional
+        Observations behind each series, for the confidence bands of the
+        figures of results that do not carry bands. By default the `nobs` of
+        an `acfinter_panel` result.
+    ci : float, optional
+        Confidence level of those bands, by default 0.95.
+    ci_method : str, optional
+        Method of those bands, "white" (default) or "ma".
+    plot_cache_size : int, optional
+        Number of rendered figures kept in memory, by default 64.
+
+    Raises
+    ------
+    ValueError
+        If some series have no bands and `nobs` is neither given nor carried
+        by `results`.
+    """
+
+    def __init__(self, results, nobs=None, ci=0.95, ci_method="white", plot_cache_size=64):
+        if isinstance(results, Mapping):
+            self.bands = {str(name): (result.acf_ci, result.pacf_ci, result.ci_method)
+                          for name, result in results.items() if hasattr(result, 'acf_ci')}
+        elif hasattr(results, 'acf_ci'):
+            self.bands = {"series": (results.acf_ci, results.pacf_ci, results.ci_method)}
+        else:
+            self.bands = {}
+        if nobs is None:
+            nobs = getattr(results, 'nobs', None)
+        self.nobs, self.ci, self.ci_method = nobs, ci, ci_method
+
+        tables = []
+        for table in stack_results(results):
+            names = table.index.get_level_values("Series").astype(str)
+            if isinstance(table.index, pd.MultiIndex):
+                table = table.set_axis(table.index.set_levels(
+                    table.index.levels[0].astype(str), level="Series"))
+            else:
+                table = table.set_axis(pd.Index(names, name="Series"))
+            tables.append(table)
+        self.results_df, self.stationarity_results, self.normality_results = tables
+        self.groups = [_groups(table) for table in tables]
+        self.names = list(self.groups[0])
+        if self.nobs is None and any(name not in self.bands for name in self.names):
+            raise ValueError('The argument "nobs" is needed for the confidence bands of '
+                             'results that do not carry them.')
+
+        self._lock = threading.Lock()
+        self.figure = lru_cache(maxsize=plot_cache_size)(self._figure)
+        self.summary = self._summary()
+
+    def _summary(self):
+        # One row per series: the first ACF and the p-values at a glance.
+        results = self.results_df
+        first = np.array([a for a, _ in self.groups[0].values()], dtype=int)
+        last = np.array([b - 1 for _, b in self.groups[0].values()], dtype=int)
+        summary = pd.DataFrame({
+            'Series': self.names,
+            'Lags': last - first + 1,
+            'ACF_1': results['ACF'].to_numpy()[first],
+            'Pv_Ljung_Max_Lag': results['Pv_Ljung'].to_numpy()[last],
+        })
+        pvalues = self.stationarity_results['P_Value'].unstack("Test")
+        pvalues.columns = [f"Pv_{test}" for test in pvalues.columns]
+        summary = summary.join(pvalues, on='Series')
+        normality = self.normality_results['P_Value'].unstack()
+        if "Shapiro Wilks" in normality.columns:
+            summary = summary.join(normality["Shapiro Wilks"].rename("Pv_Shapiro"), on='Series')
+        summary['id'] = summary['Series']
+        return summary
+
+    def table(self, which, name):
+        """Rows of one series from one of the three tables.
+
+        Parameters
+        ----------
+        which : int
+            0 for ACF/PACF, 1 for stationarity, 2 for normality.
+        name : str
+            The series.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows, with the index turned into columns.
+        """
+        table = [self.results_df, self.stationarity_results, self.normality_results][which]
+        start, end = self.groups[which].get(name, (0, 0))
+        rows = table.iloc[start:end]
+        if which == 0:
+            return rows.reset_index(drop=True)
+        return rows.droplevel("Series").rename_axis("Test").reset_index()
+
+    def search(self, text="", limit=MAX_OPTIONS):
+        """Series whose name contains `text`, case-insensitively, at most `limit`."""
+        text = (text or "").lower()
+        matches = []
+        for name in self.names:
+            if text in name.lower():
+                matches.append(name)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def _bands(self, name, rows):
+        if name in self.bands:
+            return self.bands[name]
+        acf_ci, pacf_ci = confidence_bands(rows['ACF'].to_numpy(), self.nobs, ci=self.ci,
+                                           ci_method=self.ci_method)
+        return acf_ci, pacf_ci, self.ci_method
+
+    def _figure(self, name):
+        from actfts.plots import acfinter_figure, fig_to_base64
+
+        rows = self.table(0, name)
+        if rows.empty:
+            return None
+        acf_ci, pacf_ci, ci_method = self._bands(name, rows)
+        # pyplot keeps global state, so figures are drawn one at a time.
+        with self._lock:
+            return fig_to_base64(acfinter_figure(rows, acf_ci, pacf_ci, ci_method))
+
+
+def _data_table(table_id, columns, page_size, **kwargs):
+    from dash import dash_table
+
+    return dash_table.DataTable(
+        id=table_id,
+        columns=[{'name': col, 'id': col} for col in columns],
+        page_current=0,
+        page_size=page_size,
+        page_action='custom',
+        filter_action='custom',
+        filter_query='',
+        sort_action='custom',
+        sort_mode='multi',
+        sort_by=[],
+        style_cell=_STYLE_CELL,
+        style_header=_STYLE_HEADER,
+        **kwargs
+    )
+
+
+def explorer_app(results, nobs=None, ci=0.95, ci_method="white", page_size=20, plot_cache_size=64):
+    """Build a Dash app to browse the analyses of a whole panel of series.
+
+    A searchable picker selects the series, and a summary tab lists all of
+    them. Every table is paged, filtered and sorted by callbacks on the server,
+    so the browser only ever receives the page on screen, and the figure of a
+    series is rendered when its tab is opened and then cached. The app stays
+    responsive with tens of thousands of series and hundreds of lags.
+
+    Parameters
+    ----------
+    results : AcfinterResult, tuple or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs.
+    nobs : int, optional
+        See `PanelExplorer`.
+    ci : float, optional
+        See `PanelExplorer`.
+    ci_method : str, optional
+        See `PanelExplorer`.
+    page_size : int, optional
+        Rows per page of every table, by default 20.
+    plot_cache_size : int, optional
+        Number of rendered figures kept in memory, by default 64.
+
+    Returns
+    -------
+    dash.Dash
+        The app, ready to be served with `app.run()`. The data behind it is
+        available as `app.explorer`.
+
+    Examples
+    --------
+    >>> app = explorer_app(acfinter_panel(panel, lag=24))
+    >>> app.run(port=8050)
+    """
+    from dash import Dash, Input, Output, State, dcc, html
+
+    explorer = PanelExplorer(results, nobs=nobs, ci=ci, ci_method=ci_method,
+                             plot_cache_size=plot_cache_size)
+    first = explorer.names[0] if explorer.names else None
+
+    app = Dash(__name__)
+    app.explorer = explorer
+    summary_columns = [col for col in explorer.summary.columns if col != 'id']
+
+    app.layout = html.Div([
+        html.H1("Interactive Results from Acfinter() Function", style={'text-align': 'center'}),
+        dcc.Dropdown(id='series-picker', value=first, clearable=False,
+                     options=[{'label': first, 'value': first}] if first else [],
+                     placeholder="Search a series"),
+        dcc.Tabs(id='tabs', value='acf-pacf', children=[
+            dcc.Tab(label='Series', value='series', children=[
+                _data_table('summary-table', summary_columns, page_size)]),
+            dcc.Tab(label='ACF/PACF', value='acf-pacf', children=[
+                _data_table('acf-pacf-table', ['Lag', 'ACF', 'PACF', 'Box_Pierce', 'Pv_Box',
+                                               'Ljung_Box', 'Pv_Ljung'], page_size)]),
+            dcc.Tab(label='Stationarity', value='stationarity', children=[
+                _data_table('stationarity-table', ['Test', 'Statistic', 'P_Value'], page_size)]),
+            dcc.Tab(label='Normality', value='normality', children=[
+                _data_table('normality-table', ['Test', 'Statistic', 'P_Value'], page_size)]),
+            dcc.Tab(label='Plots', value='plots', children=[
+                html.H3('ACF/PACF and PV Ljung', style={'textAlign': 'center'}),
+                dcc.Loading(html.Img(id='plot', style={'display': 'block', 'margin': '0 auto'})),
+            ]),
+        ]),
+    ])
+
+    @app.callback(Output('series-picker', 'options'),
+                  Input('series-picker', 'search_value'),
+                  State('series-picker', 'value'))
+    def search_series(search_value, value):
+        names = explorer.search(search_value)
+        if value is not None and value not in names:
+            names = [value] + names
+        return [{'label': name, 'value': name} for name in names]
+
+    @app.callback(Output('summary-table', 'data'),
+                  Output('summary-table', 'page_count'),
+                  Input('summary-table', 'page_current'),
+                  Input('summary-table', 'page_size'),
+                  Input('summary-table', 'sort_by'),
+                  Input('summary-table', 'filter_query'))
+    def summary_page(page_current, size, sort_by, filter_query):
+        return page_of(explorer.summary, page_current, size, sort_by, filter_query)
+
+    @app.callback(Output('series-picker', 'value'),
+                  Input('summary-table', 'active_cell'),
+                  prevent_initial_call=True)
+    def pick_from_summary(active_cell):
+        return active_cell['row_id']
+
+    for which, table_id in enumerate(['acf-pacf-table', 'stationarity-table', 'normality-table']):
+        def series_page(name, page_current, size, sort_by, filter_query, which=which):
+            return page_of(explorer.table(which, name), page_current, size, sort_by, filter_query)
+
+        app.callback(Output(table_id, 'data'),
+                     Output(table_id, 'page_count'),
+                     Input('series-picker', 'value'),
+                     Input(table_id, 'page_current'),
+                     Input(table_id, 'page_size'),
+                     Input(table_id, 'sort_by'),
+                     Input(table_id, 'filter_query'))(series_page)
+
+    @app.callback(Output('plot', 'src'),
+                  Input('series-picker', 'value'),
+                  Input('tabs', 'value'))
+    def plot(name, tab):
+        from dash import no_update
+
+        if tab != 'plots' or name is None:
+            return no_update
+        encoded = explorer.figure(name)
+        return f"data:image/png;base64,{encoded}" if encoded else None
+
+    return app
+
+
+def explore(results, host="127.0.0.1", port=8050, debug=False, **kwargs):
+    """Serve the explorer of `explorer_app` and block until it is stopped.
+
+    Parameters
+    ----------
+    results : AcfinterResult, tuple or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs.
+    host : str, optional
+        Interface to listen on, by default "127.0.0.1".
+    port : int, optional
+        Port to listen on, by default 8050.
+    debug : bool, optional
+        Run the Dash development server in debug mode. Default is False.
+    **kwargs
+        Passed to `explorer_app`.
+    """
+    app = explorer_app(results, **kwargs)
+    app.run(host=host, port=port, debug=debug, use_reloader=False)
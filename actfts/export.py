@@ -0,0 +1,241 @@
+import atexit
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.csv': 'csv',
+    '.xlsx': 'xlsx',
+}
+
+# Names of the three tables, as used for the "Table" column and the Excel sheets.
+TABLES = ["ACF_PACF", "Stationarity", "Normality"]
+
+_writer = None
+
+
+def _background():
+    # One writer thread for the process: files are written in submission order
+    # while the caller keeps computing.
+    global _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="actfts-export")
+        atexit.register(_writer.shutdown, wait=True)
+    return _writer
+
+
+def _tables_of(result, name):
+    # The three tables of one result with a leading "Series" level. Panel
+    # results from `acfinter_panel` are already stacked by series.
+    results_df, stationarity_results, normality_results = result
+    if isinstance(stationarity_results.index, pd.MultiIndex):
+        results_df = results_df.rename_axis("Series")
+        stationarity_results = stationarity_results.rename_axis(["Series", "Test"])
+        normality_results = normality_results.rename_axis(["Series", "Test"])
+    else:
+        results_df = results_df.set_axis(pd.Index([name] * len(results_df), name="Series"))
+        stationarity_results = pd.concat({name: stationarity_results}, names=["Series", "Test"])
+        normality_results = pd.concat({name: normality_results}, names=["Series", "Test"])
+    return results_df, stationarity_results, normality_results
+
+
+def stack_results(results):
+    """Stack the tables of one or many analyses, keyed by series.
+
+    Parameters
+    ----------
+    results : AcfinterResult, tuple or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs.
+
+    Returns
+    -------
+    tuple
+        The ACF/PACF, stationarity and normality tables of every series, each
+        with a "Series" index level.
+    """
+    if isinstance(results, Mapping):
+        parts = [_tables_of(result, name) for name, result in results.items()]
+    else:
+        parts = [_tables_of(results, "series")]
+    return tuple(pd.concat([part[i] for part in parts]) for i in range(3))
+
+
+def results_frame(results):
+    """All the tables of one or many analyses as a single long table.
+
+    The rows of the ACF/PACF, stationarity and normality tables are stacked,
+    told apart by the "Table" column, so a whole batch fits in one columnar
+    file. Columns that do not apply to a row are missing.
+
+    Parameters
+    ----------
+    results : AcfinterResult, tuple or mapping
+        See `stack_results`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns 'Table', 'Series', 'Lag', 'ACF', 'PACF', 'Box_Pierce',
+        'Pv_Box', 'Ljung_Box', 'Pv_Ljung', 'Test', 'Statistic' and 'P_Value'.
+    """
+    tables = [table.reset_index().assign(Table=label)
+              for table, label in zip(stack_results(results), TABLES)]
+    frame = pd.concat(tables, ignore_index=True)
+    frame['Series'] = frame['Series'].astype(str)
+    frame['Lag'] = frame['Lag'].astype("Int64")
+    columns = ['Table', 'Series', 'Lag', 'ACF', 'PACF', 'Box_Pierce', 'Pv_Box',
+               'Ljung_Box', 'Pv_Ljung', 'Test', 'Statistic', 'P_Value']
+    return frame[columns]
+
+
+def available_path(path):
+    """Return `path`, or the first free "name (1).ext", "name (2).ext", ... next to it.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The preferred file name.
+
+    Returns
+    -------
+    pathlib.Path
+        A path that does not exist yet.
+    """
+    path = Path(path)
+    candidate, number = path, 1
+    while candidate.exists():
+        candidate = path.with_name(f"{path.stem} ({number}){path.suffix}")
+        number += 1
+    return candidate
+
+
+def _write_xlsx(tables, path, single):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        results_df, stationarity_results, normality_results = tables
+        if single:
+            # The layout `acfinter` has always written for one series.
+            results_df.to_excel(writer, sheet_name="ACF_PACF", index=False)
+            stationarity_results.droplevel("Series").to_excel(writer, sheet_name="Stationarity", index=True)
+            normality_results.droplevel("Series").to_excel(writer, sheet_name="Normality", index=True)
+        else:
+            results_df.to_excel(writer, sheet_name="ACF_PACF", index=True)
+            stationarity_results.to_excel(writer, sheet_name="Stationarity", index=True)
+            normality_results.to_excel(writer, sheet_name="Normality", index=True)
+    return path
+
+
+def _write_frame(frame, path, fmt):
+    if fmt == 'parquet':
+        frame.to_parquet(path, index=False)
+    elif fmt == 'feather':
+        frame.to_feather(path)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+
+def export_results(results, path, fmt=None, background=False):
+    """Write the results of one or many analyses to a single file.
+
+    Parquet, Feather and CSV files hold the long table of `results_frame`, one
+    row per lag or test of every series. Excel workbooks keep the three sheets
+    "ACF_PACF", "Stationarity" and "Normality". Parquet and Feather need the
+    optional pyarrow package.
+
+    Parameters
+    ----------
+    results : AcfinterResult, tuple or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs.
+    path : str or pathlib.Path
+        Destination file. Missing parent folders are created.
+    fmt : str, optional
+        "parquet", "feather", "csv" or "xlsx". By default it is taken from the
+        suffix of `path`.
+    background : bool, optional
+        If True, the file is written by a background thread and a
+        `concurrent.futures.Future` resolving to the path is returned at once.
+        The tables are assembled before returning, so the results can be
+        modified afterwards. Default is False.
+
+    Returns
+    -------
+    pathlib.Path or concurrent.futures.Future
+        The written path, or a future of it when `background` is True.
+
+    Raises
+    ------
+    ValueError
+        If the format is not supported.
+
+    Examples
+    --------
+    >>> results = {name: acfinter(panel[name], lag=12, plot=False) for name in panel}
+    >>> export_results(results, "results.parquet")
+    """
+    path = Path(path).expanduser()
+    fmt = fmt or FORMATS.get(path.suffix.lower())
+    if fmt not in FORMATS.values():
+        raise ValueError('The export format must be one of "parquet", "feather", "csv" or "xlsx".')
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == 'xlsx':
+        single = not isinstance(results, Mapping) and not isinstance(results[1].index, pd.MultiIndex)
+        task, args = _write_xlsx, (stack_results(results), path, single)
+    else:
+        task, args = _write_frame, (results_frame(results), path, fmt)
+
+    if background:
+        return _background().submit(task, *args)
+    return task(*args)
+
+
+def export_figures(results, directory, fmt="png", dpi=150, n_jobs=None, nobs=None, ci=0.95,
+                   ci_method="white"):
+    """Save the ACF, PACF and Ljung-Box figure of every analysis.
+
+    The figures are drawn by `actfts.plots.render_figures`, which reuses one
+    figure template per worker.
+
+    Parameters
+    ----------
+    results : AcfinterResult, PanelResult or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs.
+    directory : str or pathlib.Path
+        Destination folder, created if needed. The files are named after the
+        series ("series" for a single result); see
+        `actfts.plots.figure_file_name`.
+    fmt : str, optional
+        "png" (default), "tiff" or "pdf".
+    dpi : int, optional
+        Resolution of the files, by default 150.
+    n_jobs : int, optional
+        Number of worker processes. None or 1 (default) renders in this
+        process and -1 uses every available CPU.
+    nobs, ci, ci_method : optional
+        Observations, confidence level and method of the bands of a panel;
+        see `render_figures`.
+
+    Returns
+    -------
+    list of pathlib.Path
+        The written files, in the order of `results`.
+
+    Raises
+    ------
+    TypeError
+        If `results` is none of the accepted inputs.
+    ValueError
+        If the format is not supported, a panel has no `nobs` or two series
+        get the same file name.
+    """
+    from actfts.plots import render_figures
+
+    return render_figures(results, directory, fmt=fmt, dpi=dpi, n_jobs=n_jobs, nobs=nobs, ci=ci,
+                          ci_method=ci_method)
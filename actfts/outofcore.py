@@ -0,0 +1,388 @@
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from actfts.actfts_fun import AcfinterResult
+from actfts.confint import confidence_bands
+from actfts.stationarity import (KPSS_CRITICAL, TESTS, _kpss_covlags, _kpss_lags,
+                                 _kpss_statistic, _pp_from_autocovariance, _pp_lags)
+from actfts.streaming import StreamingACF
+
+DIFF_ORDERS = {"levels": 0, "diff1": 1, "diff2": 2, "diff3": 3}
+
+# Largest design block of the ADF regression built at once, in elements.
+BLOCK_ELEMENTS = 2**21
+
+# Most points of the evenly spaced subsample used by the Shapiro-Wilk test.
+SAMPLE_SIZE = 5000
+
+
+class ChunkSource:
+    """A long series read in chunks, as many times as needed.
+
+    Parameters
+    ----------
+    source : str, pathlib.Path, np.ndarray, callable or iterable
+        A path to a one-dimensional .npy file, which is memory-mapped; a
+        one-dimensional array or `np.memmap`; a callable returning a new
+        iterable of chunks on every call; or any iterable of chunks. A plain
+        iterable can only be read once, so its chunks are spooled to a
+        temporary file during the first pass and read back from it afterwards.
+    chunk_size : int, optional
+        Number of observations per chunk for files and arrays, by default 2**20.
+    spool_dir : str, optional
+        Folder of the temporary spool file, by default the system temp folder.
+    """
+
+    def __init__(self, source, chunk_size=2**20, spool_dir=None):
+        if isinstance(source, (str, Path)):
+            source = np.load(source, mmap_mode="r")
+        if isinstance(source, np.ndarray) and source.ndim != 1:
+            raise ValueError("The series must be one-dimensional.")
+        self.source = source
+        self.chunk_size = int(chunk_size)
+        self.spool_dir = spool_dir
+        self._spool = None
+
+    def chunks(self):
+        """Iterate over the chunks of the series, as float64 arrays."""
+        source = self.source
+        if isinstance(source, np.ndarray):
+            for start in range(0, source.shape[0], self.chunk_size):
+                yield np.asarray(source[start:start + self.chunk_size], dtype=float)
+        elif self._spool is not None:
+            values = np.memmap(self._spool, dtype=np.float64, mode="r")
+            for start in range(0, values.shape[0], self.chunk_size):
+                yield np.array(values[start:start + self.chunk_size])
+        elif callable(source):
+            for chunk in source():
+                yield np.asarray(chunk, dtype=float).ravel()
+        else:
+            handle, path = tempfile.mkstemp(suffix=".f8", dir=self.spool_dir)
+            self._spool = path
+            with os.fdopen(handle, "wb") as spool:
+                for chunk in source:
+                    chunk = np.asarray(chunk, dtype=float).ravel()
+                    chunk.tofile(spool)
+                    yield chunk
+
+    def close(self):
+        """Delete the spool file, if any."""
+        if self._spool is not None:
+            Path(self._spool).unlink(missing_ok=True)
+            self._spool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _differenced(chunks, order):
+    # Differences of the requested order across chunk boundaries.
+    carry = np.empty(0)
+    for chunk in chunks:
+        if chunk.shape[0] == 0:
+            continue
+        if np.isnan(chunk).any():
+            raise ValueError("The series must not contain missing values.")
+        if order == 0:
+            yield chunk
+            continue
+        buf = np.concatenate([carry, chunk])
+        if buf.shape[0] > order:
+            yield np.diff(buf, n=order)
+        carry = buf[-order:]
+
+
+def _normality(moments, nobs, sample):
+    # Jarque-Bera from the exact moments, Shapiro-Wilk on the subsample.
+    import pandas as pd
+    import scipy.stats as stats
+
+    mu = moments[0] / nobs
+    s2, s3, s4 = moments[1:] / nobs
+    m2 = s2 - mu ** 2
+    m3 = s3 - 3 * mu * s2 + 2 * mu ** 3
+    m4 = s4 - 4 * mu * s3 + 6 * mu ** 2 * s2 - 3 * mu ** 4
+    skew = m3 / m2 ** 1.5
+    kurt = m4 / m2 ** 2
+    jb = nobs / 6.0 * (skew ** 2 + (kurt - 3) ** 2 / 4.0)
+    shapiro_result = stats.shapiro(sample)
+    return pd.DataFrame({
+        'Statistic': [shapiro_result.statistic, jb],
+        'P_Value': [shapiro_result.pvalue, stats.chi2.sf(jb, 2)]
+    }, index=["Shapiro Wilks", "Jarque Bera"])
+
+
+def _adf_qr(series, nobs, shift, maxlag):
+    # R factor of the ADF design [constant, lagged level, lagged differences
+    # 1..maxlag] augmented with the first differences, over the rows that have
+    # every lag, updated block by block (TSQR). Also returns the first `maxlag`
+    # rows kept whole and the trend cross-product used by the KPSS trend test.
+    ncols = maxlag + 2
+    r = np.zeros((0, ncols + 1))
+    prefix = []
+    trend_xt = 0.0
+    tbar = (nobs + 1) / 2.0
+
+    carry = np.empty(0)
+    offset = 0
+    rows = max(1, BLOCK_ELEMENTS // (ncols + 1))
+    for chunk in series:
+        xs = chunk - shift
+        t = np.arange(offset + 1, offset + 1 + xs.shape[0])
+        trend_xt += (t - tbar) @ xs
+
+        if len(prefix) < maxlag + 1:
+            prefix.extend(xs[:maxlag + 1 - len(prefix)])
+
+        buf = np.concatenate([carry, xs])
+        offset += xs.shape[0]
+        carry = buf[-(maxlag + 1):]
+        if buf.shape[0] < maxlag + 2:
+            continue
+
+        diffs = sliding_window_view(np.diff(buf), maxlag + 1)
+        for start in range(0, diffs.shape[0], rows):
+            window = diffs[start:start + rows]
+            block = np.empty((r.shape[0] + window.shape[0], ncols + 1))
+            block[:r.shape[0]] = r
+            X = block[r.shape[0]:]
+            X[:, 0] = 1.0
+            X[:, 1] = buf[maxlag + start:maxlag + start + window.shape[0]]
+            X[:, 2:-1] = window[:, -2::-1]
+            X[:, -1] = window[:, -1]
+            r = np.linalg.qr(block, mode='r')
+
+    # Rows t = 1..maxlag only have the lags that follow the start of the series.
+    head = []
+    prefix = np.asarray(prefix)
+    for t in range(1, maxlag + 1):
+        d = np.diff(prefix[:t + 1])
+        head.append(np.concatenate([[1.0, prefix[t - 1]], d[-2::-1], [d[-1]]]))
+    return r, head, trend_xt
+
+
+def _residual_ss(r):
+    # Residual sum of squares of the models with the first k columns, for
+    # every k, from the last column of the augmented R factor.
+    return np.cumsum((r[:, -1] ** 2)[::-1])[::-1]
+
+
+def _with_head(r, head, lags):
+    # R factor of the model with the first `lags + 2` columns, fitted on all
+    # its observations: the rows t = lags+1..maxlag are added to it.
+    ncols = lags + 2
+    top = np.zeros((ncols + 1, ncols + 1))
+    top[:ncols, :ncols] = r[:ncols, :ncols]
+    top[:ncols, -1] = r[:ncols, -1]
+    top[-1, -1] = np.sqrt(_residual_ss(r)[ncols]) if ncols < r.shape[0] else 0.0
+    rows = [np.concatenate([row[:ncols], row[-1:]]) for t, row in enumerate(head, start=1)
+            if t > lags]
+    if rows:
+        top = np.linalg.qr(np.vstack([top, rows]), mode='r')
+    return top
+
+
+def _fit(r, nobs):
+    # OLS from the augmented R factor: coefficients, residual sum of squares
+    # and the standard error of the lagged level.
+    from scipy.linalg import solve_triangular
+
+    ncols = r.shape[1] - 1
+    coef = solve_triangular(r[:ncols, :ncols], r[:ncols, -1])
+    ssr = r[-1, -1] ** 2
+    scale2 = ssr / (nobs - ncols)
+    rinv = solve_triangular(r[:ncols, :ncols], np.eye(ncols))
+    se = np.sqrt(scale2 * (rinv[1] @ rinv[1]))
+    return coef, ssr, se
+
+
+def _stationarity(source, order, nobs, shift, total):
+    from statsmodels.tsa.adfvalues import mackinnonp
+
+    maxlag = min(nobs // 2 - 2, int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0))))
+    if maxlag < 0:
+        raise ValueError("sample size is too short to use selected regression component")
+
+    # Pass 2: QR of the ADF design and the KPSS trend.
+    r, head, trend_xt = _adf_qr(_differenced(source.chunks(), order), nobs, shift, maxlag)
+
+    # AIC lag search, every model on the sample of the largest one.
+    wide_nobs = nobs - 1 - maxlag
+    ncols = np.arange(2, maxlag + 3)
+    ssr = _residual_ss(r)[ncols]
+    llf = -wide_nobs / 2.0 * (np.log(2 * np.pi) + np.log(ssr / wide_nobs) + 1)
+    bestlag = int(np.argmin(-2.0 * llf + 2.0 * ncols))
+    coef, _, se = _fit(_with_head(r, head, bestlag), nobs - 1 - bestlag)
+    adfstat = coef[1] / se
+
+    pp_coef, _, pp_se = _fit(_with_head(r, head, 0), nobs - 1)
+    mean = total / nobs
+    tbar = (nobs + 1) / 2.0
+    slope = trend_xt / (nobs * (nobs ** 2 - 1) / 12.0)
+    intercept = mean - slope * tbar
+
+    def residuals():
+        # KPSS level, KPSS trend and PP residuals, chunk by chunk.
+        offset, previous = 0, None
+        for chunk in _differenced(source.chunks(), order):
+            xs = chunk - shift
+            t = np.arange(offset + 1, offset + 1 + xs.shape[0])
+            lagged = np.concatenate([[previous], xs[:-1]]) if previous is not None else xs[:-1]
+            current = xs if previous is not None else xs[1:]
+            pp = (current - lagged) - pp_coef[0] - pp_coef[1] * lagged
+            offset += xs.shape[0]
+            previous = xs[-1]
+            yield xs - mean, xs - intercept - slope * t, pp
+
+    # Pass 3: cross-products and partial sums of the residuals.
+    covlags = _kpss_covlags(nobs)
+    pplags = _pp_lags(nobs)
+    streams = [StreamingACF(max(covlags, 1)), StreamingACF(max(covlags, 1)),
+               StreamingACF(pplags)]
+    partial, partial_ss = np.zeros(2), np.zeros(2)
+    for parts in residuals():
+        for stream, values in zip(streams, parts):
+            stream.update(values)
+        for k in range(2):
+            sums = np.cumsum(parts[k]) + partial[k]
+            partial_ss[k] += sums @ sums
+            partial[k] = sums[-1]
+
+    gammas = [stream.acovf() * nobs for stream in streams[:2]]
+    nlags = [_kpss_lags(gamma, nobs) for gamma in gammas]
+    if max(nlags) > covlags:
+        # Pass 4, only when the selected lags exceed the pilot ones.
+        extra = [StreamingACF(max(n, 1)) for n in nlags]
+        for parts in residuals():
+            for stream, values in zip(extra, parts):
+                stream.update(values)
+        gammas = [stream.acovf() * nobs if n > covlags else gamma
+                  for stream, n, gamma in zip(extra, nlags, gammas)]
+
+    values = [(adfstat, mackinnonp(adfstat, regression='c', N=1))]
+    for gamma, n, partial_sum, regression in zip(gammas, nlags, partial_ss, ['c', 'ct']):
+        kpss_stat = _kpss_statistic(gamma, n, partial_sum, nobs)
+        values.append((kpss_stat, np.interp(kpss_stat, KPSS_CRITICAL[regression],
+                                            [0.10, 0.05, 0.025, 0.01])))
+
+    if nobs - 1 <= pplags:
+        raise ValueError(f"The number of observations ({nobs - 1}) must be larger than the "
+                         f"number of lags of the long-run variance ({pplags}).")
+    zt, _ = _pp_from_autocovariance(pp_coef[1], pp_se, streams[2].acovf()[:, None], nobs - 1)
+    zt = zt[0]
+    values.append((zt, mackinnonp(zt, regression='c', N=1)))
+    return np.array(values, dtype=float)
+
+
+def acfinter_chunked(source, lag=72, ci_method="white", ci=0.95, delta="levels",
+                     chunk_size=2**20, dtype=np.float64, stationarity=True, spool_dir=None):
+    """The `acfinter` tables of a series too large for memory, in chunked passes.
+
+    Memory use depends on `chunk_size` and the number of lags, not on the
+    length of the series: a few chunk-sized temporaries are alive at any time
+    (about 100 MB with the default chunks, a few MB with 2**16). The passes are:
+
+    1. The first pass accumulates the autocovariances (see `StreamingACF`),
+       the moments and an evenly spaced subsample of the series.
+    2. The second updates the QR decomposition of the ADF design block by
+       block and accumulates the trend of the KPSS test.
+    3. The third accumulates the residuals of the KPSS and Phillips-Perron
+       regressions, and a fourth pass runs only when the KPSS test selects more
+       lags than its pilot estimate.
+
+    The ACF, PACF, Q statistics and stationarity tests agree with `acfinter`
+    up to rounding. The normality table holds the
+    Jarque-Bera test, from the exact moments, and the Shapiro-Wilk test on an
+    evenly spaced subsample of at most 5000 points.
+
+    Parameters
+    ----------
+    source : str, pathlib.Path, np.ndarray, callable or iterable
+        The series; see `ChunkSource`. A path to a .npy file is memory-mapped.
+    lag : int, optional
+        Maximum number of lags, by default 72.
+    ci_method : str, optional
+        "white" (default) or "ma", as in `acfinter`.
+    ci : float, optional
+        Confidence level of the bands, by default 0.95.
+    delta : str, optional
+        One of "levels" (default), "diff1", "diff2" or "diff3".
+    chunk_size : int, optional
+        Observations per chunk for files and arrays, by default 2**20.
+    dtype : numpy dtype, optional
+        Working precision of the lagged products of the ACF pass, float64
+        (default) or float32. Running sums and the stationarity passes are
+        always float64, because the ADF design is too ill-conditioned for
+        single precision.
+    stationarity : bool, optional
+        If False, the stationarity passes are skipped and
+        `stationarity_results` is None. Default is True.
+    spool_dir : str, optional
+        Folder for the spool file of one-shot iterables.
+
+    Returns
+    -------
+    AcfinterResult
+        The same tables as `acfinter`.
+
+    Raises
+    ------
+    ValueError
+        If `delta` is invalid, the series contains missing values or is too
+        short.
+
+    Examples
+    --------
+    >>> np.save("ticks.npy", prices)
+    >>> results_df, stationarity_results, normality_results = acfinter_chunked("ticks.npy", lag=500)
+    """
+    import pandas as pd
+
+    if delta not in DIFF_ORDERS:
+        raise ValueError('The argument "delta" must be one of "levels", "diff1", "diff2", or "diff3".')
+    order = DIFF_ORDERS[delta]
+
+    with ChunkSource(source, chunk_size, spool_dir) as chunks:
+        # Pass 1: autocovariances, moments and the subsample.
+        stream = StreamingACF(lag, dtype)
+        moments = np.zeros(4)
+        sample, positions, stride = [], [], 1
+        for chunk in _differenced(chunks.chunks(), order):
+            offset = stream.nobs
+            stream.update(chunk)
+            centred = chunk - stream.shift
+            power = centred.copy()
+            for k in range(4):
+                moments[k] += power.sum()
+                power *= centred
+            index = np.arange(offset, offset + chunk.shape[0])
+            keep = index % stride == 0
+            sample.append(chunk[keep])
+            positions.append(index[keep])
+            while sum(part.shape[0] for part in sample) > SAMPLE_SIZE:
+                stride *= 2
+                keep = [pos % stride == 0 for pos in positions]
+                sample = [part[k] for part, k in zip(sample, keep)]
+                positions = [pos[k] for pos, k in zip(positions, keep)]
+
+        nobs = stream.nobs
+        if nobs < 3:
+            raise ValueError("At least three observations are needed.")
+        results_df = stream.results()
+        normality_results = _normality(moments, nobs, np.concatenate(sample))
+
+        stationarity_results = None
+        if stationarity:
+            # The float64 sum of the shifted values, whatever the working dtype.
+            values = _stationarity(chunks, order, nobs, stream.shift, moments[0])
+            stationarity_results = pd.DataFrame(values, columns=['Statistic', 'P_Value'], index=TESTS)
+
+    acf_ci, pacf_ci = confidence_bands(results_df['ACF'].to_numpy(), nobs, ci=ci, ci_method=ci_method)
+    return AcfinterResult(results_df, stationarity_results, normality_results,
+                          acf_ci=acf_ci, pacf_ci=pacf_ci, ci_method=ci_method, delta=delta)
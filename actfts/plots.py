@@ -0,0 +1,345 @@
+import base64
+import io
+import os
+import re
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+BATCH_FORMATS = ['png', 'tiff', 'pdf']
+
+# Characters that are not allowed in file names on Windows, POSIX or both.
+_UNSAFE_CHARACTERS = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+
+
+def acfinter_figure(results_df, acf_ci, pacf_ci, ci_method="white"):
+    """Build the ACF, PACF and Ljung-Box p-value figure of an `acfinter` analysis.
+
+    Parameters
+    ----------
+    results_df : pd.DataFrame
+        The ACF/PACF table returned by `acfinter`.
+    acf_ci : np.ndarray
+        Upper confidence band of the ACF, one value per lag.
+    pacf_ci : np.ndarray
+        Upper confidence band of the PACF, one value per lag.
+    ci_method : str, optional
+        "white" (default) draws flat bands, "ma" draws the band of every lag.
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        A figure with three stacked axes.
+    """
+    acf_vals = results_df['ACF'].to_numpy()
+    pacf_vals = results_df['PACF'].to_numpy()
+    lb_pvalue = results_df['Pv_Ljung'].to_numpy()
+
+    fig, ax = plt.subplots(3, 1, figsize=(10, 12))
+
+    panels = [
+        (ax[0], acf_vals, acf_ci, 'ACF', "Autocorrelation Function (ACF)"),
+        (ax[1], pacf_vals, pacf_ci, 'PACF', "Partial Autocorrelation Function (PACF)"),
+    ]
+    for axis, values, band, label, title in panels:
+        axis.stem(range(len(values)), values, label=label, basefmt=" ")
+        axis.set_title(title)
+        axis.set_xlabel('Lags')
+        axis.set_ylabel(label)
+        axis.grid(True, linestyle='dotted')
+        if ci_method == "ma":
+            axis.plot(range(len(band)), band, color='blue', linestyle='--', label='Upper CI')
+            axis.plot(range(len(band)), -band, color='blue', linestyle='--', label='Lower CI')
+        else:
+            axis.axhline(y=band[0], color='blue', linestyle='--', label='Upper CI')
+            axis.axhline(y=-band[0], color='blue', linestyle='--', label='Lower CI')
+
+    ax[2].plot(np.arange(1, len(lb_pvalue) + 1), lb_pvalue, label='Ljung-Box Statistic', color='red',
+               linestyle='None', marker='o', markersize=5)
+    ax[2].set_title("Ljung-Box Test (Pv)")
+    ax[2].set_xlabel('Lags')
+    ax[2].set_ylabel('Ljung-Box Stat')
+    ax[2].grid(True, linestyle='dotted')
+    ax[2].set_ylim(-0.02, 0.2)
+    ax[2].axhline(y=0.05, color='blue', linestyle='--', label='0.05 Threshold')
+
+    fig.subplots_adjust(hspace=0.52)
+    return fig
+
+
+def fig_to_base64(fig):
+    """Encode a figure as a base64 PNG string and close it."""
+    img_buf = io.BytesIO()
+    fig.savefig(img_buf, format='png')
+    plt.close(fig)
+    img_buf.seek(0)
+    return base64.b64encode(img_buf.read()).decode('utf-8')
+
+
+class FigureTemplate:
+    """Reusable ACF, PACF and Ljung-Box figure for rendering many series.
+
+    The figure, its axes, titles, grids and artists are created once, on an
+    Agg canvas that does not go through pyplot. Rendering a series only
+    replaces the data of the stems, bands and markers and rescales the axes,
+    which avoids almost all of the matplotlib setup cost of `acfinter_figure`
+    while drawing the same picture.
+
+    Parameters
+    ----------
+    dpi : int, optional
+        Resolution of the saved files, by default 100.
+    """
+
+    def __init__(self, dpi=100):
+        self.dpi = dpi
+        self.fig = Figure(figsize=(10, 12))
+        FigureCanvasAgg(self.fig)
+        ax = self.fig.subplots(3, 1)
+        self.axes = ax
+
+        self.panels = []
+        for axis, label, title in [(ax[0], 'ACF', "Autocorrelation Function (ACF)"),
+                                   (ax[1], 'PACF', "Partial Autocorrelation Function (PACF)")]:
+            stems = axis.stem([0.0], [0.0], label=label, basefmt=" ")
+            axis.set_title(title)
+            axis.set_xlabel('Lags')
+            axis.set_ylabel(label)
+            axis.grid(True, linestyle='dotted')
+            # Flat bands for "white", one value per lag for "ma"; only one pair is visible.
+            flat = (axis.axhline(y=0, color='blue', linestyle='--', label='Upper CI'),
+                    axis.axhline(y=0, color='blue', linestyle='--', label='Lower CI'))
+            curve = (axis.plot([0], [0], color='blue', linestyle='--', label='Upper CI')[0],
+                     axis.plot([0], [0], color='blue', linestyle='--', label='Lower CI')[0])
+            self.panels.append((axis, stems, flat, curve))
+
+        self.ljung, = ax[2].plot([1], [0], label='Ljung-Box Statistic', color='red',
+                                 linestyle='None', marker='o', markersize=5)
+        ax[2].set_title("Ljung-Box Test (Pv)")
+        ax[2].set_xlabel('Lags')
+        ax[2].set_ylabel('Ljung-Box Stat')
+        ax[2].grid(True, linestyle='dotted')
+        ax[2].set_ylim(-0.02, 0.2)
+        ax[2].axhline(y=0.05, color='blue', linestyle='--', label='0.05 Threshold')
+
+        self.fig.subplots_adjust(hspace=0.52)
+
+    def update(self, acf_vals, pacf_vals, lb_pvalue, acf_ci, pacf_ci, ci_method="white"):
+        """Replace the data of the figure with that of one series.
+
+        Parameters
+        ----------
+        acf_vals, pacf_vals, lb_pvalue : np.ndarray
+            The 'ACF', 'PACF' and 'Pv_Ljung' columns of `results_df`.
+        acf_ci, pacf_ci : np.ndarray
+            Upper confidence bands of the ACF and the PACF.
+        ci_method : str, optional
+            "white" (default) draws flat bands, "ma" draws the band of every lag.
+
+        Returns
+        -------
+        matplotlib.figure.Figure
+            The updated figure.
+        """
+        for (axis, stems, flat, curve), values, band in zip(
+                self.panels, [acf_vals, pacf_vals], [acf_ci, pacf_ci]):
+            values = np.asarray(values, dtype=float)
+            x = np.arange(len(values), dtype=float)
+            stems.markerline.set_data(x, values)
+            segments = np.zeros((len(values), 2, 2))
+            segments[:, :, 0] = x[:, None]
+            segments[:, 1, 1] = values
+            stems.stemlines.set_segments(segments)
+
+            band = np.asarray(band, dtype=float)
+            moving = ci_method == "ma"
+            for line, sign in zip(flat, [1, -1]):
+                line.set_ydata([sign * band[0]] * 2)
+                line.set_visible(False)
+            for line, sign in zip(curve, [1, -1]):
+                line.set_data(np.arange(len(band)), sign * band)
+                line.set_visible(moving)
+
+            axis.relim(visible_only=True)
+            axis.autoscale_view()
+            if not moving:
+                # Like `axhline` in `acfinter_figure`, a flat band only rescales
+                # the axis when it falls outside the current limits.
+                for line in flat:
+                    line.set_visible(True)
+                    ymin, ymax = axis.get_ybound()
+                    if not ymin <= line.get_ydata()[0] <= ymax:
+                        axis.relim(visible_only=True)
+                        axis.autoscale_view()
+
+        lb_pvalue = np.asarray(lb_pvalue, dtype=float)
+        self.ljung.set_data(np.arange(1, len(lb_pvalue) + 1), lb_pvalue)
+        self.axes[2].relim()
+        self.axes[2].autoscale_view(scaley=False)
+        return self.fig
+
+    def save(self, path, fmt=None):
+        """Write the current figure to `path` as PNG, TIFF or PDF.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Destination file.
+        fmt : str, optional
+            "png", "tiff" or "pdf". By default it is taken from the suffix of `path`.
+        """
+        fmt = fmt or Path(path).suffix.lstrip('.').lower()
+        # TIFF is lossless-compressed; uncompressed it is about 10 MB per figure.
+        extra = {"pil_kwargs": {"compression": "tiff_lzw"}} if fmt == "tiff" else {}
+        self.fig.savefig(path, format=fmt, dpi=self.dpi, **extra)
+
+
+def _render_chunk(jobs, fmt, dpi):
+    # Worker entry point: one template renders every job of the chunk.
+    template = FigureTemplate(dpi=dpi)
+    for path, acf_vals, pacf_vals, lb_pvalue, acf_ci, pacf_ci, ci_method in jobs:
+        template.update(acf_vals, pacf_vals, lb_pvalue, acf_ci, pacf_ci, ci_method)
+        template.save(path, fmt)
+    return len(jobs)
+
+
+def figure_file_name(name):
+    """File name, without suffix, of the figure of the series `name`.
+
+    Path separators and the other characters that are invalid in file names
+    are replaced with "_", so "stem/column" from a batch becomes
+    "stem_column". Trailing dots and spaces are dropped.
+
+    Parameters
+    ----------
+    name : object
+        The series name.
+
+    Returns
+    -------
+    str
+    """
+    # Windows also drops trailing dots and spaces, which would leave "." or "..".
+    return _UNSAFE_CHARACTERS.sub("_", str(name)).rstrip(" .") or "_"
+
+
+def _figure_jobs(results, directory, fmt, nobs, ci, ci_method):
+    # The path, plotted columns and bands of every series of `results`.
+    from actfts.confint import confidence_bands
+
+    def columns(results_df):
+        return (results_df['ACF'].to_numpy(), results_df['PACF'].to_numpy(),
+                results_df['Pv_Ljung'].to_numpy())
+
+    if hasattr(results, 'acf_ci'):
+        results = {"series": results}
+    if isinstance(results, Mapping):
+        jobs = []
+        for name, result in results.items():
+            if not hasattr(result, 'acf_ci'):
+                raise TypeError("The values of the mapping must be `acfinter` results.")
+            jobs.append((directory / f"{figure_file_name(name)}.{fmt}", *columns(result.results_df),
+                         result.acf_ci, result.pacf_ci, result.ci_method))
+        return jobs
+
+    if not (isinstance(results, tuple) and len(results) == 3
+            and getattr(results[0], 'index', None) is not None
+            and results[0].index.name == "Series"):
+        raise TypeError("The results must be the output of `acfinter` or `acfinter_panel`, "
+                        "or a mapping from series name to `acfinter` outputs.")
+    nobs = nobs if nobs is not None else getattr(results, 'nobs', None)
+    if nobs is None:
+        raise ValueError('The argument "nobs" is needed for the confidence bands of '
+                         'panel results that do not carry it.')
+
+    # The rows of every series of a panel are contiguous.
+    results_df = results[0]
+    names = results_df.index.to_numpy()
+    if len(names) == 0:
+        return []
+    cuts = np.flatnonzero(names[1:] != names[:-1]) + 1
+    starts = np.concatenate([[0], cuts])
+    ends = np.concatenate([cuts, [len(names)]])
+    acf_vals, pacf_vals, lb_pvalue = columns(results_df)
+    jobs = []
+    for start, end in zip(starts, ends):
+        acf_ci, pacf_ci = confidence_bands(acf_vals[start:end], nobs, ci=ci, ci_method=ci_method)
+        jobs.append((directory / f"{figure_file_name(names[start])}.{fmt}", acf_vals[start:end],
+                     pacf_vals[start:end], lb_pvalue[start:end], acf_ci, pacf_ci, ci_method))
+    return jobs
+
+
+def render_figures(results, directory, fmt="png", dpi=100, n_jobs=None, nobs=None, ci=0.95,
+                   ci_method="white"):
+    """Render the ACF, PACF and Ljung-Box figure of many analyses to files.
+
+    Every worker builds one `FigureTemplate` and reuses it for a contiguous
+    chunk of series (about four chunks per worker), so the matplotlib setup is
+    paid once per chunk instead of once per figure. Only the columns needed
+    for the plots are sent to the workers.
+
+    Parameters
+    ----------
+    results : AcfinterResult, PanelResult or mapping
+        The output of `acfinter` or `acfinter_panel`, or a mapping from series
+        name to `acfinter` outputs. The bands of a panel are computed with
+        `confidence_bands`.
+    directory : str or pathlib.Path
+        Destination folder, created if needed. The files are named after the
+        series ("series" for a single result), made safe by
+        `figure_file_name`.
+    fmt : str, optional
+        "png" (default), "tiff" or "pdf".
+    dpi : int, optional
+        Resolution of the files, by default 100.
+    n_jobs : int, optional
+        Number of worker processes. None or 1 (default) renders in this
+        process and -1 uses every available CPU.
+    nobs : int, optional
+        Observations behind each series of a panel, by default the `nobs` of
+        the `acfinter_panel` result.
+    ci : float, optional
+        Confidence level of the bands of a panel, by default 0.95.
+    ci_method : str, optional
+        Method of the bands of a panel, "white" (default) or "ma".
+
+    Returns
+    -------
+    list of pathlib.Path
+        The written files, in the order of `results`.
+
+    Raises
+    ------
+    TypeError
+        If `results` is none of the accepted inputs.
+    ValueError
+        If the format is not supported, a panel has no `nobs` or two series
+        get the same file name.
+    """
+    if fmt not in BATCH_FORMATS:
+        raise ValueError('The figure format must be "png", "tiff" or "pdf".')
+    directory = Path(directory).expanduser()
+
+    jobs = _figure_jobs(results, directory, fmt, nobs, ci, ci_method)
+    paths = [job[0] for job in jobs]
+    if len(set(paths)) < len(paths):
+        raise ValueError("Some series names map to the same file name; see `figure_file_name`.")
+    directory.mkdir(parents=True, exist_ok=True)
+
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else (n_jobs or 1)
+    if workers < 1:
+        raise ValueError('The argument "n_jobs" must be a positive integer or -1.')
+    if workers == 1 or len(jobs) < 2:
+        _render_chunk(jobs, fmt, dpi)
+    else:
+        nchunks = min(len(jobs), 4 * workers)
+        bounds = np.linspace(0, len(jobs), nchunks + 1).astype(int)
+        chunks = [jobs[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=min(workers, nchunks)) as pool:
+            list(pool.map(_render_chunk, chunks, [fmt] * nchunks, [dpi] * nchunks))
+    return paths
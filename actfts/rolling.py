@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from actfts.actfts_fun import gen, stationarity_panel
+from actfts.autocorr import durbin_levinson, q_statistics
+from actfts.stationarity import StationarityEngine, stack_tables
+
+
+def rolling_autocovariance(x, starts, ends, lag):
+    """Mean-corrected autocovariances of many windows of one series.
+
+    The lagged cross-products are accumulated once into prefix sums, so the
+    sums of any window are the difference of two prefix values and every
+    window costs O(lag) regardless of its length.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        One-dimensional series.
+    starts, ends : np.ndarray
+        First and one-past-last position of every window.
+    lag : int
+        Maximum lag, smaller than the shortest window.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (lag + 1, n_windows), normalised by each window length.
+    """
+    # Centring on the global mean keeps the prefix sums well conditioned.
+    y = x - x.mean()
+    n = y.shape[0]
+    h = np.arange(lag + 1)[:, None]
+    width = (ends - starts).astype(float)
+
+    csum = np.concatenate([[0.0], np.cumsum(y)])
+    cross = np.zeros((lag + 1, n + 1))
+    for k in range(lag + 1):
+        cross[k, k + 1:] = np.cumsum(y[k:] * y[:n - k])
+
+    total = csum[ends] - csum[starts]
+    mean = total / width
+    sums = cross[h, ends] - cross[h, starts + h]
+    upper = csum[ends] - csum[starts + h]
+    lower = csum[ends - h] - csum[starts]
+    return (sums - mean * (upper + lower) + (width - h) * mean ** 2) / width
+
+
+def rolling_acfinter(datag, window, lag=12, step=1, expanding=False, delta="levels",
+                     stationarity=True, n_jobs=None):
+    """ACF, PACF, Ljung-Box and stationarity diagnostics over rolling or expanding windows.
+
+    Parameters
+    ----------
+    datag : array-like
+        The input time series, a numeric vector or a pandas Series. The index of
+        a Series labels the windows.
+    window : int
+        Number of observations of each rolling window, or of the first
+        expanding window.
+    lag : int, optional
+        Maximum number of lags, by default 12. It is capped at `window - 1`.
+    step : int, optional
+        Distance between the ends of consecutive windows, by default 1.
+    expanding : bool, optional
+        If True, every window starts at the first observation. Default is False.
+    delta : str, optional
+        Transformation applied before windowing, one of "levels" (default),
+        "diff1", "diff2" or "diff3".
+    stationarity : bool, optional
+        If True (default), the ADF, KPSS and PP tests are run on every window.
+    n_jobs : int, optional
+        Number of worker processes for the stationarity tests of rolling
+        windows. None or 1 (default) runs serially and -1 uses every CPU.
+
+    Returns
+    -------
+    tuple
+        - results_df (pd.DataFrame): The ACF, PACF, Box-Pierce and Ljung-Box
+          statistics, indexed by the label of the last observation of each
+          window and by lag.
+        - stationarity_results (pd.DataFrame): The stationarity tests, indexed
+          by window end and test, or None if `stationarity` is False.
+
+    Raises
+    ------
+    ValueError
+        If the window is longer than the series, or `delta` is invalid.
+
+    Examples
+    --------
+    >>> datag = DPIEEUU_dataset()['DPIEEUU']
+    >>> results_df, stationarity_results = rolling_acfinter(datag, window=80, lag=8, delta="diff1")
+    >>> results_df.xs(1, level="Lag")['ACF'].plot()
+    """
+    labels = datag.index if isinstance(datag, pd.Series) else None
+    data = np.asarray(gen(datag, delta), dtype=float)
+    if labels is not None:
+        labels = labels[len(labels) - len(data):]
+    else:
+        labels = pd.RangeIndex(len(data))
+
+    n = data.shape[0]
+    if window > n or window < 2:
+        raise ValueError('The argument "window" must be between 2 and the length of the series.')
+    lag = min(lag, window - 1)
+
+    ends = np.arange(window, n + 1, step)
+    starts = np.zeros_like(ends) if expanding else ends - window
+    width = ends - starts
+
+    acov = rolling_autocovariance(data, starts, ends, lag)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        acf_vals = acov / acov[0]
+    pacf_vals = durbin_levinson(acov, width)
+    qstats = q_statistics(acf_vals, width)
+
+    window_end = labels[ends - 1]
+    key_name = labels.name or "Window_End"
+    index = pd.MultiIndex.from_arrays(
+        [window_end.repeat(lag), np.tile(np.arange(1, lag + 1), len(ends))],
+        names=[key_name, "Lag"])
+    results_df = pd.DataFrame({
+        'ACF': acf_vals[1:].ravel(order='F'),
+        'PACF': pacf_vals[1:].ravel(order='F'),
+        'Box_Pierce': qstats['bp_stat'].ravel(order='F'),
+        'Pv_Box': qstats['bp_pvalue'].ravel(order='F'),
+        'Ljung_Box': qstats['lb_stat'].ravel(order='F'),
+        'Pv_Ljung': qstats['lb_pvalue'].ravel(order='F')
+    }, index=index)
+
+    if not stationarity:
+        return results_df, None
+
+    if expanding:
+        values = [StationarityEngine(data[:end]).values() for end in ends]
+        stationarity_results = stack_tables(values, window_end, key_name)
+    else:
+        windows = sliding_window_view(data, window)[ends - window].T
+        stationarity_results = stationarity_panel(windows, window_end, n_jobs=n_jobs,
+                                                  key_name=key_name)
+
+    return results_df, stationarity_results
@@ -0,0 +1,500 @@
+import concurrent.futures
+import json
+import math
+import queue
+import threading
+import time
+import warnings
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Largest request body accepted, in bytes.
+MAX_BODY_BYTES = 64 * 2**20
+
+# Number of recent requests behind the latency percentiles.
+LATENCY_WINDOW = 10000
+
+# Seconds behind the throughput figure of the metrics.
+THROUGHPUT_WINDOW = 10.0
+
+_DEFAULTS = {'lag': 72, 'delta': "levels", 'ci': 0.95, 'ci_method': "white", 'boxcox': True}
+
+
+def _is_number(value, integer=False):
+    # JSON numbers only: booleans are ints in Python but not numbers here.
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (not integer and isinstance(value, float))
+
+
+def _warm_up():
+    # Worker initializer: pay the numpy, scipy and statsmodels imports and the
+    # first-call costs once, before the first request arrives.
+    warnings.simplefilter("ignore")
+    from actfts.actfts_fun import _acfinter_tables, acfinter_panel
+
+    x = np.cumsum(np.random.default_rng(0).normal(size=(200, 2)), axis=0) + 100.0
+    acfinter_panel(x, lag=12)
+    _acfinter_tables(x[:, 0], 12, "white", 0.95, "auto")
+
+
+def _clean(values):
+    # JSON has no NaN or infinity.
+    return [float(v) if math.isfinite(v) else None for v in np.asarray(values, dtype=float)]
+
+
+def _tests(names, values):
+    return {name: dict(zip(['Statistic', 'P_Value'], _clean(row))) for name, row in zip(names, values)}
+
+
+def _payload(results, stationarity, normality, acf_ci, pacf_ci, delta):
+    # `results` maps the ACF/PACF columns to arrays, the test arguments are
+    # (names, values) pairs with values of shape (n_tests, 2).
+    return {
+        'delta': delta,
+        'results': {column: [int(v) for v in values] if column == 'Lag' else _clean(values)
+                    for column, values in results.items()},
+        'stationarity': _tests(*stationarity),
+        'normality': _tests(*normality),
+        'acf_ci': _clean(acf_ci),
+        'pacf_ci': _clean(pacf_ci),
+    }
+
+
+def _table_args(table):
+    return list(table.index), table[['Statistic', 'P_Value']].to_numpy()
+
+
+def _analyse_batch(data, options):
+    # Worker entry point: analyse the columns of `data`, which share a length
+    # and the analysis options, through the vectorised panel path. A batch
+    # that fails as a whole is redone series by series, so one bad series
+    # only fails its own request.
+    from actfts.actfts_fun import _acfinter_tables, acfinter_panel
+    from actfts.confint import confidence_bands
+
+    lag, delta, ci, ci_method, boxcox = (options[k] for k in ('lag', 'delta', 'ci', 'ci_method', 'boxcox'))
+    nseries = data.shape[1]
+    if nseries > 1 and delta != "auto":
+        try:
+            panel = acfinter_panel(data, lag=lag, delta=delta, boxcox=boxcox)
+            results_df, stationarity_results, normality_results = panel
+            nobs = panel.nobs
+            # Slice the stacked tables as arrays rather than with .loc per series.
+            columns = {column: results_df[column].to_numpy().reshape(nseries, -1)
+                       for column in results_df.columns}
+            acf_ci, pacf_ci = confidence_bands(columns['ACF'].T, nobs, ci=ci, ci_method=ci_method)
+            acf_ci = np.broadcast_to(acf_ci.T if acf_ci.ndim == 2 else acf_ci, columns['ACF'].shape)
+            tests = stationarity_results.index.get_level_values("Test")[:len(stationarity_results) // nseries]
+            stationarity = stationarity_results.to_numpy().reshape(nseries, len(tests), 2)
+            normality = normality_results.to_numpy()
+            series = normality_results.index.get_level_values("Series").to_numpy()
+            names = normality_results.index.get_level_values("Test")
+            bounds = np.searchsorted(series, np.arange(nseries + 1))
+            return [_payload({column: values[j] for column, values in columns.items()},
+                             (tests, stationarity[j]),
+                             (names[bounds[j]:bounds[j + 1]], normality[bounds[j]:bounds[j + 1]]),
+                             acf_ci[j], pacf_ci, delta)
+                    for j in range(nseries)]
+        except ValueError:
+            pass
+
+    payloads = []
+    for j in range(nseries):
+        try:
+            result = _acfinter_tables(data[:, j], lag, ci_method, ci, delta, boxcox=boxcox)
+            results = {column: result.results_df[column].to_numpy() for column in result.results_df.columns}
+            payloads.append(_payload(results, _table_args(result.stationarity_results),
+                                     _table_args(result.normality_results),
+                                     result.acf_ci, result.pacf_ci, result.delta))
+        except Exception as exc:
+            payloads.append({'error': f"{type(exc).__name__}: {exc}"})
+    return payloads
+
+
+class _Job:
+    __slots__ = ('data', 'options', 'key', 'future', 'received')
+
+    def __init__(self, data, options):
+        self.data = data
+        self.options = options
+        self.key = (data.shape[0],) + tuple(options[k] for k in sorted(options))
+        self.future = Future()
+        self.received = time.monotonic()
+
+
+class _Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.counts = defaultdict(int)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.finished = deque()
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counts[name] += value
+
+    def done(self, latency, failed):
+        now = time.monotonic()
+        with self.lock:
+            self.counts['failed_total' if failed else 'completed_total'] += 1
+            self.latencies.append(latency)
+            self.finished.append(now)
+            while self.finished and self.finished[0] < now - THROUGHPUT_WINDOW:
+                self.finished.popleft()
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self.lock:
+            counts = dict(self.counts)
+            latencies = np.array(self.latencies)
+            while self.finished and self.finished[0] < now - THROUGHPUT_WINDOW:
+                self.finished.popleft()
+            recent = len(self.finished)
+        uptime = now - self.started
+        batches = counts.get('batches_total', 0)
+        snapshot = {name: counts.get(name, 0) for name in
+                    ['requests_total', 'completed_total', 'failed_total', 'rejected_total',
+                     'timeouts_total', 'batches_total']}
+        snapshot.update({
+            'uptime_seconds': uptime,
+            'mean_batch_size': counts.get('batched_requests', 0) / batches if batches else None,
+            'throughput_per_second': recent / min(THROUGHPUT_WINDOW, max(uptime, 1e-9)),
+            'latency_ms': None,
+        })
+        if latencies.size:
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3
+            snapshot['latency_ms'] = {'p50': p50, 'p90': p90, 'p99': p99,
+                                      'max': latencies.max() * 1e3}
+        return snapshot
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 makes bursts of concurrent clients wait
+    # for TCP retransmissions, seconds at a time.
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        content = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; there is nobody left to answer.
+            self.close_connection = True
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/metrics":
+            self._send(200, service.metrics())
+        elif self.path == "/health":
+            self._send(200, {'status': "ok"})
+        else:
+            self._send(404, {'error': "Not found."})
+
+    def do_POST(self):
+        service = self.server.service
+        if self.path != "/analyze":
+            self._send(404, {'error': "Not found."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(400, {'error': "Invalid Content-Length."})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(413, {'error': "The request body is too large."})
+            return
+        try:
+            data, options = service.parse(self.rfile.read(length))
+        except (ValueError, TypeError, OverflowError, RecursionError) as exc:
+            self._send(400, {'error': str(exc) or type(exc).__name__})
+            return
+
+        try:
+            job = service.submit(data, options)
+        except queue.Full:
+            service._metrics.count('rejected_total')
+            self._send(503, {'error': "The service is busy, retry later."}, [("Retry-After", "1")])
+            return
+        try:
+            payload = job.future.result(timeout=service.timeout)
+        except concurrent.futures.TimeoutError:
+            service._metrics.count('timeouts_total')
+            self._send(504, {'error': "The analysis timed out."})
+            return
+        except Exception as exc:
+            payload = {'error': f"{type(exc).__name__}: {exc}"}
+        failed = 'error' in payload
+        service._metrics.done(time.monotonic() - job.received, failed)
+        self._send(422 if failed else 200, payload)
+
+
+class AnalysisService:
+    """A local HTTP/JSON service running `acfinter` in warm worker processes.
+
+    Requests are queued and a dispatcher thread groups those that arrive
+    within `batch_wait` seconds of each other and share the series length and
+    the analysis options, so each group is analysed by one vectorised
+    `acfinter_panel` call in a worker. The workers import the scientific
+    stack and run a first analysis when the service starts, so no request
+    pays for it.
+
+    At most two batches per worker are in flight. Beyond that, requests wait
+    in a queue of `max_queue` entries, and once it is full new requests are
+    refused with HTTP 503 and a "Retry-After" header instead of piling up.
+
+    Endpoints:
+
+    - ``POST /analyze`` with a JSON object holding "data", a list of numbers,
+      and optionally "lag", "delta", "ci", "ci_method" and "boxcox" as in
+      `acfinter`. The response holds "delta", "results" (the ACF/PACF table
+      by column), "stationarity", "normality", "acf_ci" and "pacf_ci";
+      missing values are null. Series the analysis rejects get HTTP 422.
+    - ``GET /metrics``: request, failure, rejection and timeout counts,
+      batches and their mean size, latency percentiles over the last 10000
+      requests and the throughput of the last 10 seconds.
+    - ``GET /health``.
+
+    Parameters
+    ----------
+    host : str, optional
+        Interface to listen on, by default "127.0.0.1".
+    port : int, optional
+        Port to listen on, by default 8000; 0 picks a free port.
+    workers : int, optional
+        Number of worker processes, by default every available CPU.
+    max_batch : int, optional
+        Most series analysed in one batch, by default 64.
+    batch_wait : float, optional
+        Seconds the dispatcher waits for more requests to join a batch, by
+        default 0.005.
+    max_queue : int, optional
+        Capacity of the request queue, by default 1024.
+    timeout : float, optional
+        Seconds a request may wait for its result before HTTP 504, by
+        default 60.
+
+    Examples
+    --------
+    >>> with AnalysisService(port=8000) as service:
+    ...     service.serve_forever()
+
+    and from a client:
+
+    >>> requests.post("http://127.0.0.1:8000/analyze", json={"data": list(x), "lag": 24}).json()
+    """
+
+    def __init__(self, host="127.0.0.1", port=8000, workers=None, max_batch=64,
+                 batch_wait=0.005, max_queue=1024, timeout=60.0):
+        import os
+
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1 or max_batch < 1 or max_queue < 1:
+            raise ValueError("The workers, max_batch and max_queue must be positive.")
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._slots = threading.BoundedSemaphore(2 * self.workers)
+        self._metrics = _Metrics()
+        self._stopping = threading.Event()
+
+        # The workers start, and warm up, before any thread of the service.
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        for future in [self._pool.submit(time.sleep, 0.05) for _ in range(self.workers)]:
+            future.result()
+
+        self._server = _Server((host, port), _Handler)
+        self._server.service = self
+        self._dispatcher = threading.Thread(target=self._dispatch, name="actfts-dispatcher",
+                                            daemon=True)
+        self._dispatcher.start()
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the service."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def parse(self, body):
+        """Validate a request body and return the series and the options.
+
+        Raises `ValueError` for anything but a JSON object with a "data" list
+        of finite numbers and well-typed options.
+        """
+        request = json.loads(body)
+        if not isinstance(request, dict) or not isinstance(request.get('data'), list):
+            raise ValueError('The request must be a JSON object with a "data" list.')
+        unknown = set(request) - set(_DEFAULTS) - {'data'}
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}.")
+        if not all(_is_number(value) for value in request['data']):
+            raise ValueError('"data" must be a list of numbers.')
+        try:
+            data = np.array(request['data'], dtype=float)
+        except OverflowError:
+            data = np.array([np.inf])
+        if data.size < 3 or not np.isfinite(data).all():
+            raise ValueError('"data" must be a list of at least three finite numbers.')
+
+        options = {key: request.get(key, default) for key, default in _DEFAULTS.items()}
+        if not _is_number(options['lag'], integer=True) or options['lag'] < 1:
+            raise ValueError('"lag" must be a positive integer.')
+        if not _is_number(options['ci']) or not 0 < options['ci'] < 1:
+            raise ValueError('"ci" must be a number between 0 and 1.')
+        options['ci'] = float(options['ci'])
+        if not isinstance(options['boxcox'], bool):
+            raise ValueError('"boxcox" must be true or false.')
+        if options['delta'] not in ("levels", "diff1", "diff2", "diff3", "auto"):
+            raise ValueError('"delta" must be "levels", "diff1", "diff2", "diff3" or "auto".')
+        if options['ci_method'] not in ("white", "ma"):
+            raise ValueError('"ci_method" must be "white" or "ma".')
+        return data, options
+
+    def submit(self, data, options):
+        """Queue one analysis; raises `queue.Full` when the queue is full."""
+        job = _Job(data, options)
+        self._queue.put_nowait(job)
+        self._metrics.count('requests_total')
+        return job
+
+    def _dispatch(self):
+        while not self._stopping.is_set():
+            try:
+                jobs = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.batch_wait
+            while len(jobs) < self.max_batch * self.workers:
+                remaining = deadline - time.monotonic()
+                try:
+                    jobs.append(self._queue.get(timeout=remaining) if remaining > 0
+                                else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            groups = defaultdict(list)
+            for job in jobs:
+                groups[job.key].append(job)
+            for group in groups.values():
+                # Spread a large group over every worker rather than filling
+                # a few batches of `max_batch`.
+                size = min(self.max_batch, -(-len(group) // self.workers))
+                for start in range(0, len(group), size):
+                    batch = group[start:start + size]
+                    # Wait for a free slot: while every worker is busy the
+                    # queue fills up and new requests are refused.
+                    self._slots.acquire()
+                    try:
+                        future = self._pool.submit(_analyse_batch,
+                                                   np.column_stack([job.data for job in batch]),
+                                                   batch[0].options)
+                    except RuntimeError as exc:
+                        self._slots.release()
+                        for job in batch:
+                            job.future.set_exception(exc)
+                        continue
+                    self._metrics.count('batches_total')
+                    self._metrics.count('batched_requests', len(batch))
+                    future.add_done_callback(partial(self._finish, batch))
+
+    def _finish(self, batch, future):
+        self._slots.release()
+        try:
+            payloads = future.result()
+        except Exception as exc:
+            for job in batch:
+                job.future.set_exception(exc)
+            return
+        for job, payload in zip(batch, payloads):
+            job.future.set_result(payload)
+
+    def metrics(self):
+        """The counters served at /metrics, as a dict."""
+        snapshot = self._metrics.snapshot()
+        snapshot.update({'workers': self.workers, 'queue_depth': self._queue.qsize(),
+                         'queue_capacity': self._queue.maxsize})
+        return snapshot
+
+    def start(self):
+        """Serve from a background thread and return the service."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="actfts-http",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in this thread until `shutdown` is called or the process is interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    def shutdown(self):
+        """Stop the HTTP server, the dispatcher and the workers."""
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+        self._stopping.set()
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    import argparse
+    import signal
+
+    parser = argparse.ArgumentParser(prog="python -m actfts.service",
+                                     description="Serve acfinter over HTTP/JSON on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--batch-wait", type=float, default=0.005)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    args = parser.parse_args(argv)
+    with AnalysisService(args.host, args.port, args.workers, args.max_batch,
+                         args.batch_wait, args.max_queue) as service:
+        # Stop as cleanly on SIGTERM as on Ctrl-C. The handler is installed
+        # after the workers are forked, so they keep the default one.
+        signal.signal(signal.SIGTERM, _interrupt)
+        print(f"Serving on {service.url}", flush=True)
+        service.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+import numpy as np
+import pandas as pd
+from actfts.autocorr import autocovariance
+
+TESTS = ["ADF", "KPSS-Level", "KPSS-Trend", "PP"]
+
+# KPSS critical values at the 10%, 5%, 2.5% and 1% levels (Kwiatkowski et al., 1992).
+KPSS_CRITICAL = {
+    'c': [0.347, 0.463, 0.574, 0.739],
+    'ct': [0.119, 0.146, 0.176, 0.216],
+}
+
+
+class StationarityEngine:
+    """Shared computations behind the ADF, KPSS and Phillips-Perron tests of a series.
+
+    The first differences, the lagged-difference design matrix and the
+    regressions fitted on it are built once and reused by every test. The
+    autolag search of the ADF test fits all its candidate models from a single
+    QR decomposition of the widest design, because the residual sum of squares
+    of every nested model can be read from the same factorisation.
+
+    The results reproduce `statsmodels.tsa.stattools.adfuller` (constant,
+    AIC autolag) and `statsmodels.tsa.stattools.kpss` (automatic lags). The
+    Phillips-Perron test reuses the lag-0 regression of the ADF design.
+
+    Parameters
+    ----------
+    data : array-like
+        One-dimensional time series.
+
+    Raises
+    ------
+    ValueError
+        If the series is not one-dimensional, is constant or is too short for
+        the ADF regression.
+    """
+
+    def __init__(self, data):
+        x = np.asarray(data, dtype=float)
+        if x.ndim != 1:
+            raise ValueError("The stationarity tests need a one-dimensional series.")
+        if x.max() == x.min():
+            raise ValueError("Invalid input, x is constant")
+
+        self.x = x
+        self.nobs = x.shape[0]
+        self.xdiff = np.diff(x)
+
+        # Schwert (1989) rule used by adfuller, with one deterministic term.
+        maxlag = int(np.ceil(12.0 * np.power(self.nobs / 100.0, 1 / 4.0)))
+        self.maxlag = min(self.nobs // 2 - 2, maxlag)
+        if self.maxlag < 0:
+            raise ValueError("sample size is too short to use selected regression component")
+
+        self._fits = {}
+        self._adf = None
+        self._kpss = {}
+
+    def _design(self, lags, start):
+        # Columns: constant, lagged differences 1..lags, lagged level (last).
+        n = self.nobs
+        columns = [np.ones(n - 1 - start)]
+        columns += [self.xdiff[start - j:n - 1 - j] for j in range(1, lags + 1)]
+        columns.append(self.x[start:n - 1])
+        return np.column_stack(columns), self.xdiff[start:]
+
+    def level_fit(self, lags):
+        """Regression of the first differences on a constant, `lags` lagged
+        differences and the lagged level, on all the available observations.
+
+        Parameters
+        ----------
+        lags : int
+            Number of lagged differences.
+
+        Returns
+        -------
+        dict
+            'coef', 'se' and 'tvalue' of the lagged level, the residuals
+            'resid' and the number of observations 'nobs'.
+        """
+        if lags not in self._fits:
+            X, y = self._design(lags, lags)
+            q, r = np.linalg.qr(X)
+            z = q.T @ y
+            resid = y - q @ z
+            nobs, ncols = X.shape
+            scale = np.sqrt(resid @ resid / (nobs - ncols))
+            self._fits[lags] = {
+                'coef': z[-1] / r[-1, -1],
+                'se': scale / abs(r[-1, -1]),
+                'tvalue': np.sign(r[-1, -1]) * z[-1] / scale,
+                'resid': resid,
+                'nobs': nobs,
+            }
+        return self._fits[lags]
+
+    def adf(self):
+        """Augmented Dickey-Fuller test with a constant and AIC lag selection.
+
+        Returns
+        -------
+        tuple
+            The ADF statistic, its MacKinnon p-value and the number of lags used.
+        """
+        if self._adf is None:
+            from statsmodels.tsa.adfvalues import mackinnonp
+
+            # Every candidate model is fitted on the sample of the largest one.
+            X, y = self._design(self.maxlag, self.maxlag)
+            X = np.column_stack([X[:, :1], X[:, -1:], X[:, 1:-1]])
+            q, _ = np.linalg.qr(X)
+            z = q.T @ y
+            nobs = y.shape[0]
+            ncols = np.arange(2, X.shape[1] + 1)
+            ssr = y @ y - np.cumsum(z ** 2)[1:]
+            llf = -nobs / 2.0 * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1)
+            aic = -2.0 * llf + 2.0 * ncols
+            bestlag = int(np.argmin(aic))
+
+            adfstat = float(self.level_fit(bestlag)['tvalue'])
+            pvalue = mackinnonp(adfstat, regression='c', N=1)
+            self._adf = (adfstat, pvalue, bestlag)
+        return self._adf
+
+    def _autocov(self, resid, lags):
+        # Uncentred cross-products of the residuals, as used by the Bartlett kernel.
+        n = resid.shape[0]
+        return np.array([resid[i:] @ resid[:n - i] for i in range(lags + 1)])
+
+    def kpss(self, regression='c'):
+        """KPSS test around a level ('c') or a trend ('ct') with the lags of
+        Hobijn et al. (1998).
+
+        Parameters
+        ----------
+        regression : str, optional
+            "c" (default) for level stationarity, "ct" for trend stationarity.
+
+        Returns
+        -------
+        tuple
+            The KPSS statistic, its interpolated p-value and the number of lags used.
+        """
+        if regression not in self._kpss:
+            nobs = self.nobs
+            crit = KPSS_CRITICAL[regression]
+            if regression == 'ct':
+                trend = np.column_stack([np.ones(nobs), np.arange(1, nobs + 1)])
+                q, _ = np.linalg.qr(trend)
+                resids = self.x - q @ (q.T @ self.x)
+            else:
+                resids = self.x - self.x.mean()
+
+            covlags = _kpss_covlags(nobs)
+            gamma = self._autocov(resids, covlags)
+            nlags = _kpss_lags(gamma, nobs)
+            if nlags > covlags:
+                gamma = self._autocov(resids, nlags)
+
+            kpss_stat = _kpss_statistic(gamma, nlags, np.sum(resids.cumsum() ** 2), nobs)
+            p_value = np.interp(kpss_stat, crit, [0.10, 0.05, 0.025, 0.01])
+            self._kpss[regression] = (kpss_stat, p_value, nlags)
+        return self._kpss[regression]
+
+    def pp(self):
+        """Phillips-Perron test with a constant.
+
+        Reuses the lag-0 regression of the engine, so no extra fit is needed.
+
+        Returns
+        -------
+        tuple
+            The Z(t) statistic and its MacKinnon p-value.
+        """
+        from statsmodels.tsa.adfvalues import mackinnonp
+
+        fit = self.level_fit(0)
+        zt, _ = _pp_statistics(fit['coef'], fit['se'], fit['resid'][:, None],
+                               _pp_lags(self.nobs))
+        zt = float(zt[0])
+        return zt, mackinnonp(zt, regression='c', N=1)
+
+    def values(self):
+        """Run the four tests and return the bare numbers.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (4, 2) with the statistic and p-value of the ADF,
+            KPSS-Level, KPSS-Trend and PP tests, in that order.
+        """
+        return np.array([self.adf()[:2], self.kpss('c')[:2], self.kpss('ct')[:2], self.pp()])
+
+    def table(self):
+        """Run the four tests.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns 'Statistic' and 'P_Value', indexed by "ADF", "KPSS-Level",
+            "KPSS-Trend" and "PP".
+        """
+        return pd.DataFrame(self.values(), columns=['Statistic', 'P_Value'], index=TESTS)
+
+
+def _kpss_covlags(nobs):
+    # Lags of the pilot autocovariances of the Hobijn et al. (1998) selection.
+    return int(np.power(nobs, 2.0 / 9.0))
+
+
+def _kpss_lags(gamma, nobs):
+    # Hobijn et al. (1998) lag selection from the pilot cross-products `gamma`.
+    covlags = _kpss_covlags(nobs)
+    prods = gamma[1:covlags + 1] / (nobs / 2.0)
+    s0 = gamma[0] / nobs + prods.sum()
+    s1 = (np.arange(1, covlags + 1) * prods).sum()
+    gamma_hat = 1.1447 * np.power((s1 / s0) ** 2, 1.0 / 3.0)
+    return min(int(gamma_hat * np.power(nobs, 1.0 / 3.0)), nobs - 1)
+
+
+def _kpss_statistic(gamma, nlags, partial_ss, nobs):
+    # KPSS statistic from the residual cross-products and the sum of squared
+    # partial sums of the residuals, with a Bartlett long-run variance.
+    weights = 1.0 - np.arange(1, nlags + 1) / (nlags + 1.0)
+    s_hat = (gamma[0] + 2 * (gamma[1:nlags + 1] * weights).sum()) / nobs
+    return partial_ss / (nobs ** 2) / s_hat
+
+
+def _pp_lags(nobs):
+    # Schwert (1989) truncation lag for the Newey-West long-run variance.
+    return int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+
+
+def _pp_statistics(coef, se, resid, lags):
+    # Z(t) and Z(alpha) of every column from the lag-0 regression of the first
+    # differences on a constant and the lagged level.
+    nobs = resid.shape[0]
+    if nobs <= lags:
+        raise ValueError(f"The number of observations ({nobs}) must be larger than the "
+                         f"number of lags of the long-run variance ({lags}).")
+    return _pp_from_autocovariance(coef, se, autocovariance(resid, lags), nobs)
+
+
+def _pp_from_autocovariance(coef, se, acov, nobs):
+    # The same statistics from the autocovariances of the residuals.
+    lags = acov.shape[0] - 1
+    gamma0 = acov[0]
+    weights = 1.0 - np.arange(1, lags + 1) / (lags + 1.0)
+    lam2 = gamma0 + 2.0 * (weights[:, None] * acov[1:]).sum(axis=0)
+    s = np.sqrt(gamma0 * nobs / (nobs - 2))
+    zt = np.sqrt(gamma0 / lam2) * (coef / se) - 0.5 * (lam2 - gamma0) / np.sqrt(lam2) * (nobs * se / s)
+    zalpha = nobs * coef - 0.5 * (nobs ** 2 * se ** 2 / s ** 2) * (lam2 - gamma0)
+    return zt, zalpha
+
+
+def phillips_perron_test(data, lags=None):
+    """Phillips-Perron unit root test with a constant, for one series or a panel.
+
+    The first differences are regressed on a constant and the lagged level, and
+    the t and normalised-bias statistics are corrected with a Newey-West
+    (Bartlett kernel) long-run variance of the residuals. Every step is
+    vectorised over the columns, so a whole panel is tested in one call.
+
+    Parameters
+    ----------
+    data : array-like
+        A one-dimensional series, or an array of shape (n_obs, n_series).
+    lags : int, optional
+        Truncation lag of the long-run variance. Defaults to
+        ceil(12 * (n_obs / 100) ** (1 / 4)).
+
+    Returns
+    -------
+    tuple
+        - zt: The Z(t) statistic.
+        - zalpha: The Z(alpha) statistic.
+        - pvalue: The MacKinnon p-value of Z(t).
+        Each is a float for a single series, otherwise an array with one value
+        per column.
+
+    Raises
+    ------
+    ValueError
+        If the series are shorter than the truncation lag.
+    """
+    from statsmodels.tsa.adfvalues import mackinnonp
+
+    x = np.asarray(data, dtype=float)
+    single = x.ndim == 1
+    if single:
+        x = x[:, None]
+    if lags is None:
+        lags = _pp_lags(x.shape[0])
+
+    y = np.diff(x, axis=0)
+    z = x[:-1]
+    nobs = y.shape[0]
+    zc = z - z.mean(axis=0)
+    yc = y - y.mean(axis=0)
+    szz = np.einsum('ij,ij->j', zc, zc)
+    coef = np.einsum('ij,ij->j', zc, yc) / szz
+    resid = yc - coef * zc
+    se = np.sqrt(np.einsum('ij,ij->j', resid, resid) / (nobs - 2) / szz)
+
+    zt, zalpha = _pp_statistics(coef, se, resid, lags)
+    pvalue = np.array([mackinnonp(stat, regression='c', N=1) for stat in zt])
+    if single:
+        return float(zt[0]), float(zalpha[0]), float(pvalue[0])
+    return zt, zalpha, pvalue
+
+
+def stack_tables(values, keys, key_name="Series"):
+    """Stack the output of many `StationarityEngine.values` calls into one table.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array of shape (n_series, 4, 2).
+    keys : sequence
+        The label of every series.
+    key_name : str, optional
+        Name of the outer index level, by default "Series".
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns 'Statistic' and 'P_Value', indexed by series and test.
+    """
+    values = np.asarray(values).reshape(-1, 2)
+    index = pd.MultiIndex.from_product([pd.Index(keys), TESTS], names=[key_name, "Test"])
+    return pd.DataFrame(values, columns=['Statistic', 'P_Value'], index=index)
@@ -0,0 +1,166 @@
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+# Stages of `acfinter`, in the order they run.
+STAGES = ["cache", "gen", "delta", "acf", "pacf", "ljung_box", "stationarity", "normality",
+          "confidence_bands", "plot", "export"]
+
+
+class Tracer:
+    """Receives one span per stage of an analysis. The base class does nothing.
+
+    Subclasses override `span`, which must return a context manager that is
+    entered when the stage starts and exited when it ends.
+    """
+
+    _null_span = nullcontext()
+
+    def span(self, name):
+        """Context manager around the stage `name`; see `STAGES`."""
+        return self._null_span
+
+
+NULL_TRACER = Tracer()
+
+
+class CallbackTracer(Tracer):
+    """Call `callback(stage, seconds)` at the end of every stage.
+
+    Parameters
+    ----------
+    callback : callable
+        Called with the stage name and its wall time in seconds, also when the
+        stage raises.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.callback(name, time.perf_counter() - start)
+
+
+class LoggingTracer(CallbackTracer):
+    """Log the wall time of every stage.
+
+    Parameters
+    ----------
+    logger : logging.Logger, optional
+        By default the "actfts" logger.
+    level : int, optional
+        Logging level of the records, by default `logging.DEBUG`.
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("actfts")
+        self.level = level
+        super().__init__(self._log)
+
+    def _log(self, name, seconds):
+        self.logger.log(self.level, "actfts stage %s took %.6f s", name, seconds)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Emit every stage as an OpenTelemetry span.
+
+    Parameters
+    ----------
+    tracer : opentelemetry.trace.Tracer
+        For example `opentelemetry.trace.get_tracer("actfts")`. Any object
+        with a `start_as_current_span(name)` method works.
+    prefix : str, optional
+        Prepended to the stage names, by default "actfts.".
+    """
+
+    def __init__(self, tracer, prefix="actfts."):
+        self.tracer = tracer
+        self.prefix = prefix
+
+    def span(self, name):
+        return self.tracer.start_as_current_span(self.prefix + name)
+
+
+class StageTimer(Tracer):
+    """Record the wall time, and optionally the allocations, of every stage.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Also record the peak of the memory allocated during each stage, with
+        `tracemalloc`. Tracing allocations slows the analysis down noticeably,
+        so it is off by default.
+    parent : Tracer, optional
+        Another tracer that receives the same spans.
+
+    Attributes
+    ----------
+    timings : dict
+        Wall time in seconds by stage name, in the order the stages ran.
+    allocations : dict or None
+        Peak bytes allocated by stage, above what was allocated when the stage
+        started; None unless `memory` is True.
+    """
+
+    def __init__(self, memory=False, parent=None):
+        self.memory = memory
+        self.parent = parent or NULL_TRACER
+        self.timings = {}
+        self.allocations = {} if memory else None
+
+    @contextmanager
+    def span(self, name):
+        if self.memory:
+            import tracemalloc
+
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            with self.parent.span(name):
+                yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                self.allocations[name] = max(self.allocations.get(name, 0), peak)
+                if started:
+                    tracemalloc.stop()
+
+
+def as_tracer(tracer):
+    """Turn the `tracer` argument of `acfinter` into a `Tracer`.
+
+    Parameters
+    ----------
+    tracer : None, Tracer, callable or OpenTelemetry tracer
+        None gives the no-op tracer, a callable is wrapped in a
+        `CallbackTracer` and an object with `start_as_current_span` in an
+        `OpenTelemetryTracer`.
+
+    Returns
+    -------
+    Tracer
+
+    Raises
+    ------
+    TypeError
+        If `tracer` is none of the above.
+    """
+    if tracer is None:
+        return NULL_TRACER
+    if isinstance(tracer, Tracer):
+        return tracer
+    if hasattr(tracer, "start_as_current_span"):
+        return OpenTelemetryTracer(tracer)
+    if callable(tracer):
+        return CallbackTracer(tracer)
+    raise TypeError("The tracer must be a Tracer, a callable or an OpenTelemetry tracer.")
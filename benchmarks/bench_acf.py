@@ -0,0 +1,53 @@
+"""ACF engine benchmarks.
+
+Compares the direct and FFT autocovariances of `actfts.autocorr`, and the
+automatic choice between them, with `statsmodels.tsa.stattools.acf` on long
+series and large lag counts.
+"""
+import numpy as np
+
+from actfts.autocorr import autocovariance, durbin_levinson, q_statistics
+
+
+class ACFEngine:
+    params = ([10**4, 10**6, 10**7], [72, 5000])
+    param_names = ['nobs', 'lag']
+    timeout = 600
+
+    def setup(self, nobs, lag):
+        self.x = np.cumsum(np.random.default_rng(0).normal(size=nobs))[:, None]
+        # Warm up the lazy scipy and statsmodels imports outside the timings.
+        from statsmodels.tsa.stattools import acf
+
+        self.acf = acf
+        autocovariance(self.x[:100], 5, method="fft")
+        q_statistics(np.ones((2, 1)), 100)
+
+    def time_autocovariance_auto(self, nobs, lag):
+        autocovariance(self.x, lag)
+
+    def time_autocovariance_fft(self, nobs, lag):
+        autocovariance(self.x, lag, method="fft")
+
+    def time_statsmodels_acf(self, nobs, lag):
+        self.acf(self.x[:, 0], nlags=lag, fft=True)
+
+    def time_core_statistics(self, nobs, lag):
+        # What acfinter computes before the stationarity and normality tests.
+        acov = autocovariance(self.x, lag)
+        durbin_levinson(acov, nobs)
+        q_statistics(acov / acov[0], nobs)
+
+
+class ACFDirect:
+    params = ([10**4, 10**6, 10**7], [72, 5000])
+    param_names = ['nobs', 'lag']
+    timeout = 600
+
+    def setup(self, nobs, lag):
+        if nobs * lag > 10**9:
+            raise NotImplementedError("The direct sums are too slow for this size.")
+        self.x = np.cumsum(np.random.default_rng(0).normal(size=nobs))[:, None]
+
+    def time_autocovariance_direct(self, nobs, lag):
+        autocovariance(self.x, lag, method="direct")
@@ -0,0 +1,96 @@
+"""Dataset loading benchmarks.
+
+`load_dataset` refreshes from a FRED-style server started on localhost, so
+the numbers cover the HTTP round trip, the in-memory parsing and the cache
+write without depending on the network. The files are built from the bundled datasets and
+from a long synthetic daily series.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+FILES = ['DPIEEUU', 'GDPEEUU', 'PCECEEUU', 'daily']
+
+
+def _fred_csv(name):
+    # The layout of fredgraph.csv: a date column and one value column.
+    import pandas as pd
+    from actfts.Datasets import packaged_dataset
+
+    if name == 'daily':
+        index = pd.date_range("1900-01-01", periods=10**5, freq="D", name="observation_date")
+        values = 100.0 + np.cumsum(np.random.default_rng(0).normal(size=index.shape[0]))
+        data = pd.DataFrame({"VALUE": values}, index=index)
+    else:
+        data = packaged_dataset(name).rename_axis("observation_date")
+    return data.to_csv().encode()
+
+
+class _Server(ThreadingHTTPServer):
+    def __init__(self, files):
+        self.files = files
+        super().__init__(("127.0.0.1", 0), _Handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = self.server.files[self.path.lstrip("/")]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LoadDataset:
+    params = FILES
+    param_names = ['file']
+    timeout = 300
+
+    def setup(self, name):
+        import os
+        import tempfile
+
+        from actfts.Datasets import load_dataset, parse_fred
+
+        self.load_dataset = load_dataset
+        self.parse_fred = parse_fred
+        self.content = _fred_csv(name)
+        self.cache = tempfile.TemporaryDirectory()
+        os.environ["ACTFTS_CACHE_DIR"] = self.cache.name
+        self.server = _Server({name: self.content})
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/{name}"
+        load_dataset(self.url, name, refresh=True)
+
+    def teardown(self, name):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache.cleanup()
+
+    def time_load_dataset(self, name):
+        # The server sends no validators, so every refresh downloads the file.
+        self.load_dataset(self.url, name, refresh=True)
+
+    def time_parse_fred(self, name):
+        self.parse_fred(self.content, name)
+
+    def peakmem_parse_fred(self, name):
+        self.parse_fred(self.content, name)
+
+
+class PackagedDataset:
+    params = FILES[:3]
+    param_names = ['dataset']
+
+    def setup(self, name):
+        from actfts.Datasets import packaged_dataset
+
+        self.packaged_dataset = packaged_dataset
+
+    def time_packaged_dataset(self, name):
+        self.packaged_dataset(name)
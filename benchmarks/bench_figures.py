@@ -0,0 +1,70 @@
+"""Figure rendering throughput.
+
+The track benchmarks report figures per second for a batch of series, drawn
+once per figure with pyplot as `acfinter` does, and with the reusable template
+of `actfts.plots.render_figures`, serially and over a process pool.
+"""
+import shutil
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+NSERIES = 24
+
+
+def _results():
+    from actfts import acfinter
+
+    rng = np.random.default_rng(0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        base = [acfinter(np.cumsum(rng.normal(size=500)), lag=lag, ci_method=method, plot=False)
+                for lag, method in [(24, "white"), (48, "ma"), (72, "white")]]
+    return {f"s{i}": base[i % len(base)] for i in range(NSERIES)}
+
+
+class FigureRendering:
+    params = ['png', 'tiff', 'pdf']
+    param_names = ['fmt']
+    timeout = 600
+
+    def setup(self, fmt):
+        import matplotlib
+
+        matplotlib.use("Agg")
+        self.results = _results()
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self, fmt):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _rate(self, render):
+        start = time.perf_counter()
+        render()
+        return NSERIES / (time.perf_counter() - start)
+
+    def track_figures_per_second_pyplot(self, fmt):
+        import matplotlib.pyplot as plt
+        from actfts.plots import acfinter_figure
+
+        def render():
+            for name, result in self.results.items():
+                fig = acfinter_figure(result.results_df, result.acf_ci, result.pacf_ci, result.ci_method)
+                fig.savefig(f"{self.directory}/{name}.{fmt}", format=fmt, dpi=100)
+                plt.close(fig)
+        return self._rate(render)
+    track_figures_per_second_pyplot.unit = "figures/s"
+
+    def track_figures_per_second_template(self, fmt):
+        from actfts.plots import render_figures
+
+        return self._rate(lambda: render_figures(self.results, self.directory, fmt=fmt))
+    track_figures_per_second_template.unit = "figures/s"
+
+    def track_figures_per_second_pool(self, fmt):
+        from actfts.plots import render_figures
+
+        return self._rate(lambda: render_figures(self.results, self.directory, fmt=fmt, n_jobs=-1))
+    track_figures_per_second_pool.unit = "figures/s"
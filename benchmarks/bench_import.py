@@ -0,0 +1,48 @@
+"""Import-time benchmarks.
+
+Every benchmark runs in a fresh interpreter, so the numbers include the cost
+of the imports a short-lived batch job pays. Run them with `asv run` or, to
+compare against the main branch, `asv continuous main HEAD`.
+"""
+import subprocess
+import sys
+
+# Packages that must not be imported by `import actfts` or by a compute-only
+# call; they belong to the plotting, dashboard and download features.
+HEAVY_MODULES = ('dash', 'flask', 'plotly', 'matplotlib', 'requests', 'openpyxl')
+
+COMPUTE_ONLY = """
+import numpy as np
+import actfts
+x = np.cumsum(np.random.default_rng(0).normal(size=500))
+actfts.acfinter(x, lag=24, plot=False)
+"""
+
+
+def _loaded_heavy_modules(code):
+    probe = code + (
+        "\nimport sys\n"
+        f"print(sum(1 for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r}))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', probe], check=True,
+                            capture_output=True, text=True).stdout
+    return int(output.split()[-1])
+
+
+class ImportTime:
+    def timeraw_import_actfts(self):
+        return "import actfts"
+
+    def timeraw_import_acfinter(self):
+        return "from actfts import acfinter"
+
+    def timeraw_import_and_compute(self):
+        return COMPUTE_ONLY
+
+    def track_heavy_modules_after_import(self):
+        return _loaded_heavy_modules("import actfts")
+    track_heavy_modules_after_import.unit = "modules"
+
+    def track_heavy_modules_after_compute(self):
+        return _loaded_heavy_modules(COMPUTE_ONLY)
+    track_heavy_modules_after_compute.unit = "modules"
@@ -0,0 +1,177 @@
+"""Stage benchmarks of the acfinter pipeline.
+
+Each stage of `acfinter` is timed on its own, together with its peak memory,
+over a grid of series lengths, lag counts, `delta` options and panel widths.
+The series are synthetic AR(1) and random-walk paths or the datasets bundled
+in `actfts/data`, so the suite runs offline. Grid points that would take
+minutes or several GB are skipped (asv reports them as "n/a").
+
+Compare two commits with
+
+    asv continuous main HEAD -b bench_pipeline
+
+or record runs with `asv run` and print the differences with `asv compare`.
+Add `--quick` for a single sample per benchmark while iterating.
+"""
+import warnings
+
+import numpy as np
+
+NOBS = [10**2, 10**3, 10**4, 10**5, 10**6, 10**7]
+KINDS = ['ar', 'rw']
+DELTAS = ['levels', 'diff1', 'diff2']
+BUNDLED = ['DPIEEUU', 'GDPEEUU', 'PCECEEUU']
+
+# Longest series each stage is run on.
+MAX_NOBS_STATIONARITY = 10**6
+MAX_NOBS_NORMALITY = 10**7
+
+
+def synthetic(kind, nobs, seed=0):
+    """A reproducible AR(1) path with coefficient 0.5, or a random walk."""
+    from scipy.signal import lfilter
+
+    shocks = np.random.default_rng(seed).normal(size=nobs)
+    if kind == 'ar':
+        return lfilter([1.0], [1.0, -0.5], shocks)
+    return 100.0 + np.cumsum(shocks)
+
+
+def _skip_above(nobs, limit):
+    if nobs > limit:
+        raise NotImplementedError(f"Skipped: more than {limit} observations.")
+
+
+class _Stage:
+    # Large grid points run once per sample and the peakmem benchmarks run in
+    # a fresh process, so the numbers are not blurred by earlier allocations.
+    number = 1
+    repeat = (1, 5, 60.0)
+    warmup_time = 0
+    timeout = 1200
+
+    def setup(self, *params):
+        warnings.simplefilter("ignore")
+
+
+class Gen(_Stage):
+    params = (NOBS, DELTAS)
+    param_names = ['nobs', 'delta']
+
+    def setup(self, nobs, delta):
+        super().setup()
+        from actfts.actfts_fun import gen
+
+        self.gen = gen
+        self.x = synthetic('rw', nobs)
+
+    def time_gen(self, nobs, delta):
+        self.gen(self.x, delta)
+
+    def peakmem_gen(self, nobs, delta):
+        self.gen(self.x, delta)
+
+
+class StationarityTests(_Stage):
+    params = (NOBS, KINDS)
+    param_names = ['nobs', 'kind']
+
+    def setup(self, nobs, kind):
+        _skip_above(nobs, MAX_NOBS_STATIONARITY)
+        super().setup()
+        from actfts.actfts_fun import stationarity_tests
+
+        self.stationarity_tests = stationarity_tests
+        self.x = synthetic(kind, nobs)
+        stationarity_tests(self.x[:100])
+
+    def time_stationarity_tests(self, nobs, kind):
+        self.stationarity_tests(self.x)
+
+    def peakmem_stationarity_tests(self, nobs, kind):
+        self.stationarity_tests(self.x)
+
+
+class NormalityTests(_Stage):
+    params = (NOBS, KINDS)
+    param_names = ['nobs', 'kind']
+
+    def setup(self, nobs, kind):
+        _skip_above(nobs, MAX_NOBS_NORMALITY)
+        super().setup()
+        from actfts.actfts_fun import normality_tests
+
+        self.normality_tests = normality_tests
+        self.x = synthetic(kind, nobs)
+        normality_tests(self.x[:100])
+
+    def time_normality_tests(self, nobs, kind):
+        self.normality_tests(self.x)
+
+    def peakmem_normality_tests(self, nobs, kind):
+        self.normality_tests(self.x)
+
+
+class Acfinter(_Stage):
+    params = (NOBS, [12, 72, 500], DELTAS)
+    param_names = ['nobs', 'lag', 'delta']
+
+    def setup(self, nobs, lag, delta):
+        _skip_above(nobs, MAX_NOBS_STATIONARITY)
+        if lag >= nobs // 2:
+            raise NotImplementedError("Skipped: the lags are capped at the series length.")
+        super().setup()
+        from actfts import acfinter
+
+        self.acfinter = acfinter
+        self.x = synthetic('rw', nobs)
+        acfinter(self.x[:200], lag=12, plot=False)
+
+    def time_acfinter(self, nobs, lag, delta):
+        self.acfinter(self.x, lag=lag, delta=delta, plot=False)
+
+    def peakmem_acfinter(self, nobs, lag, delta):
+        self.acfinter(self.x, lag=lag, delta=delta, plot=False)
+
+
+class AcfinterPanel(_Stage):
+    params = ([1, 10, 100, 1000], [10**2, 10**3, 10**4], ['levels', 'diff1'])
+    param_names = ['width', 'nobs', 'delta']
+
+    def setup(self, width, nobs, delta):
+        if width * nobs > 10**6:
+            raise NotImplementedError("Skipped: more than 10**6 values in the panel.")
+        super().setup()
+        import pandas as pd
+        from actfts import acfinter_panel
+
+        self.acfinter_panel = acfinter_panel
+        self.panel = pd.DataFrame({f"s{i}": synthetic(KINDS[i % 2], nobs, seed=i)
+                                   for i in range(width)})
+        acfinter_panel(self.panel.iloc[:100, :2], lag=12)
+
+    def time_acfinter_panel(self, width, nobs, delta):
+        self.acfinter_panel(self.panel, lag=24, delta=delta)
+
+    def peakmem_acfinter_panel(self, width, nobs, delta):
+        self.acfinter_panel(self.panel, lag=24, delta=delta)
+
+
+class Bundled(_Stage):
+    params = (BUNDLED, ['levels', 'diff1'])
+    param_names = ['dataset', 'delta']
+
+    def setup(self, dataset, delta):
+        super().setup()
+        from actfts import acfinter
+        from actfts.Datasets import packaged_dataset
+
+        self.acfinter = acfinter
+        self.x = packaged_dataset(dataset).iloc[:, 0]
+        acfinter(self.x.to_numpy(), lag=12, plot=False)
+
+    def time_acfinter(self, dataset, delta):
+        self.acfinter(self.x, lag=24, delta=delta, plot=False)
+
+    def peakmem_acfinter(self, dataset, delta):
+        self.acfinter(self.x, lag=24, delta=delta, plot=False)
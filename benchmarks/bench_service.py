@@ -0,0 +1,59 @@
+"""Analysis service throughput.
+
+A local `AnalysisService` is load-tested by concurrent clients posting series
+of the same length, so the requests are micro-batched into the panel path.
+The track benchmarks report completed requests per second and the mean batch
+size the dispatcher formed.
+"""
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+NREQUESTS = 200
+
+
+def _post(url, body):
+    request = urllib.request.Request(url + "/analyze", data=body,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return response.status
+
+
+class ServiceThroughput:
+    params = ([1, 16, 64], [500, 5000])
+    param_names = ['clients', 'nobs']
+    timeout = 600
+    number = 1
+    repeat = (1, 3, 60.0)
+    warmup_time = 0
+
+    def setup(self, clients, nobs):
+        from actfts.service import AnalysisService
+
+        rng = np.random.default_rng(0)
+        self.bodies = [json.dumps({'data': np.cumsum(rng.normal(size=nobs)).tolist(), 'lag': 24,
+                                   'boxcox': False}).encode()
+                       for _ in range(NREQUESTS)]
+        self.service = AnalysisService(port=0, workers=2).start()
+        _post(self.service.url, self.bodies[0])
+
+    def teardown(self, clients, nobs):
+        self.service.shutdown()
+
+    def _run(self, clients):
+        with ThreadPoolExecutor(clients) as pool:
+            list(pool.map(lambda body: _post(self.service.url, body), self.bodies))
+
+    def track_requests_per_second(self, clients, nobs):
+        start = time.perf_counter()
+        self._run(clients)
+        return NREQUESTS / (time.perf_counter() - start)
+    track_requests_per_second.unit = "requests/s"
+
+    def track_mean_batch_size(self, clients, nobs):
+        self._run(clients)
+        return self.service.metrics()['mean_batch_size']
+    track_mean_batch_size.unit = "requests"
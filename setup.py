@@ -5,7 +5,7 @@ this_directory = Path(__file__).parent
 long_description = (this_directory / "README.md").read_text()
 
 VERSION = '0.1.1'
-DESCRIPTION = 'The Autocorrelation Tools Featured for Time Series actfts package simplifies time series analysis by providing tools for ACF, PACF, and stationarity tests with dynamic, interactive visualizations. It validates and preprocesses data, computes ACF/PACF for multiple lags, and performs tests like Box-Pierce, Ljung-Box, ADF, KPSS, and PP. Results are organized into tables, exportable as TIFF or Excel files, with an interactive mode for on-screen visualization.'
+DESCRIPTION = 'The Autocorrelation Tools Featured for Time Series actfts package simplifies time series analysis by providing tools for ACF, PACF, and stationarity tests with dynamic, interactive visualizations. It validates and preprocesses data, computes ACF/PACF for multiple lags, and performs tests like Box-Pierce, Ljung-Box, ADF, KPSS, and PP. Results are organized into tables, exportable as Parquet, Feather, CSV or Excel files with figures as PNG or TIFF, with an interactive mode for on-screen visualization.'
 PACKAGE_NAME = 'actfts'
 AUTHOR = ['Sergio Andrés Sierra Luján', 'David Esteban Rodríguez Guevara']
 EMAIL = ['sergiochess95@gmail.com', 'davestss@hotmail.com']
@@ -17,6 +17,7 @@ MAINTAINERS = [
 setup(
     name = 'actfts',
     packages = ['actfts'],
+    package_data = {'actfts': ['data/*.csv']},
     version = VERSION,
     license='MIT',
     description = DESCRIPTION,
@@ -39,6 +40,9 @@ setup(
         'openpyxl',
         'dash'
     ],
+    extras_require={
+        'parquet': ['pyarrow']
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Education',
@@ -0,0 +1,4 @@
+import os
+
+# No test may open a window.
+os.environ.setdefault("MPLBACKEND", "Agg")
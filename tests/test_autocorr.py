@@ -0,0 +1,71 @@
+import warnings
+
+import numpy as np
+import pytest
+import scipy.fft
+from actfts import acfinter
+from actfts.autocorr import _fft_cost, autocovariance
+
+
+@pytest.fixture(scope="module")
+def ar1():
+    rng = np.random.default_rng(4)
+    x = np.zeros(300)
+    for t in range(1, 300):
+        x[t] = 0.6 * x[t - 1] + rng.normal()
+    return np.cumsum(x) + 20.0
+
+
+@pytest.mark.parametrize("delta", ["levels", "diff1", "diff2", "diff3"])
+@pytest.mark.parametrize("lag", [1, 12, 40])
+def test_matches_statsmodels(ar1, delta, lag):
+    from statsmodels.stats.diagnostic import acorr_ljungbox
+    from statsmodels.tsa.stattools import acf, pacf
+
+    data = np.diff(ar1, n=int(delta[-1])) if delta != "levels" else ar1
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        table = acfinter(ar1, lag=lag, delta=delta, plot=False, boxcox=False).results_df
+        q = acorr_ljungbox(data, lags=lag, boxpierce=True)
+
+    np.testing.assert_allclose(table['ACF'], acf(data, nlags=lag)[1:], rtol=1e-10, atol=1e-13)
+    np.testing.assert_allclose(table['PACF'], pacf(data, nlags=lag)[1:], rtol=1e-10, atol=1e-13)
+    for ours, theirs in [('Box_Pierce', 'bp_stat'), ('Pv_Box', 'bp_pvalue'),
+                         ('Ljung_Box', 'lb_stat'), ('Pv_Ljung', 'lb_pvalue')]:
+        np.testing.assert_allclose(table[ours], q[theirs], rtol=1e-10, atol=1e-300)
+
+
+@pytest.mark.parametrize("nobs, nseries, lag", [(10, 1, 9), (200, 3, 24), (5000, 2, 300)])
+def test_fft_matches_direct(nobs, nseries, lag):
+    x = np.random.default_rng(5).normal(size=(nobs, nseries)) + 3.0
+    np.testing.assert_allclose(autocovariance(x, lag, method="fft"),
+                               autocovariance(x, lag, method="direct"), rtol=1e-9, atol=1e-12)
+
+
+def _crossover(nobs, nseries):
+    # The smallest lag for which the FFT is estimated to be cheaper.
+    for lag in range(1, nobs):
+        direct, fft, _ = _fft_cost(nobs, nseries, lag)
+        if fft < direct:
+            return lag
+    raise AssertionError("no crossover")
+
+
+@pytest.mark.parametrize("nobs, nseries", [(2000, 1), (20000, 4)])
+def test_auto_picks_the_cheaper_method(monkeypatch, nobs, nseries):
+    calls = []
+    rfft = scipy.fft.rfft
+    monkeypatch.setattr(scipy.fft, "rfft", lambda *args, **kwargs: calls.append(1) or rfft(*args, **kwargs))
+    x = np.random.default_rng(6).normal(size=(nobs, nseries))
+    lag = _crossover(nobs, nseries)
+
+    below = autocovariance(x, lag - 1)
+    assert not calls
+    above = autocovariance(x, lag)
+    assert calls
+    np.testing.assert_allclose(above[:lag], below, rtol=1e-9, atol=1e-12)
+
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        autocovariance(np.ones((10, 1)), 2, method="slow")
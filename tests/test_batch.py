@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from actfts.batch import run_batch
+
+
+def test_failures_do_not_stop_the_batch(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = 150
+    frame = pd.DataFrame({
+        'clean': rng.normal(size=rows),
+        'edges': rng.normal(size=rows),
+        'gap': rng.normal(size=rows),
+        'text': rng.normal(size=rows).astype(object),
+    })
+    frame.loc[:4, 'edges'] = np.nan
+    frame.loc[140:, 'edges'] = np.nan
+    frame.loc[70, 'gap'] = np.nan
+    # Past the rows sampled to find the numeric columns.
+    frame.loc[120, 'text'] = "n/a"
+    frame.to_csv(tmp_path / "panel.csv", index=False)
+
+    summary = run_batch([str(tmp_path / "panel.csv")], tmp_path / "out", lag=6, n_jobs=1,
+                        progress=False)
+
+    failed = dict(summary['failures'])
+    assert sorted(failed) == ['gap', 'text']
+    assert "missing values" in failed['gap']
+    assert summary['done'] == 2
+
+    tables = pd.read_parquet(tmp_path / "out")
+    assert set(tables['Series']) == {'clean', 'edges'}
@@ -0,0 +1,91 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter
+from actfts.cache import ResultCache, cache_key
+
+
+@pytest.fixture(scope="module")
+def series():
+    return np.random.default_rng(11).normal(size=500)
+
+
+def test_key_is_stable_and_follows_the_parameters(series):
+    key = cache_key(series, lag=12, delta="levels")
+
+    assert key == cache_key(series.copy(), delta="levels", lag=12)
+    assert key == cache_key(pd.Series(series, index=pd.RangeIndex(100, 600)), lag=12, delta="levels")
+    assert key != cache_key(series, lag=13, delta="levels")
+    assert key != cache_key(series, lag=12, delta="diff1")
+    assert key != cache_key(series.astype(np.float32), lag=12, delta="levels")
+    assert key != cache_key(series[::-1], lag=12, delta="levels")
+    assert cache_key(np.array(["a", None], dtype=object), lag=12) is None
+
+
+def test_memory_tier(series):
+    store = ResultCache()
+    assert store.get("missing") is None
+
+    store.put("key", {"values": series})
+    first = store.get("key")
+    first["values"][0] = 99.0
+
+    np.testing.assert_array_equal(store.get("key")["values"], series)
+    stats = store.stats()
+    assert (stats['hits'], stats['disk_hits'], stats['misses']) == (2, 0, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+    assert stats['entries'] == 1 and stats['bytes'] > series.nbytes
+    assert 'disk_entries' not in stats
+
+
+def test_least_recently_used_entries_are_evicted():
+    payload = np.zeros(1000)
+    store = ResultCache(max_bytes=2.5 * payload.nbytes)
+    store.put("a", payload)
+    store.put("b", payload)
+    store.get("a")
+    store.put("c", payload)
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats()['evictions'] == 1
+
+    store.put("large", np.zeros(10000))
+    assert store.get("large") is None
+
+
+def test_disk_tier(series, tmp_path):
+    store = ResultCache(directory=tmp_path)
+    store.put("key", series)
+    assert store.stats()['disk_entries'] == 1
+
+    store.clear()
+    np.testing.assert_array_equal(store.get("key"), series)
+    np.testing.assert_array_equal(store.get("key"), series)
+    assert (store.hits, store.disk_hits) == (1, 1)
+
+    fresh = ResultCache(directory=tmp_path)
+    np.testing.assert_array_equal(fresh.get("key"), series)
+    assert fresh.stats()['disk_hits'] == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+    fresh.clear(disk=True)
+    assert fresh.get("key") is None
+    assert fresh.stats()['disk_entries'] == 0
+
+
+def test_acfinter_is_served_from_the_cache(series):
+    store = ResultCache()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        first = acfinter(series, lag=10, plot=False, cache=store)
+        second = acfinter(series, lag=10, plot=False, cache=store)
+        other = acfinter(series, lag=10, delta="diff1", plot=False, cache=store)
+
+    assert (store.hits, store.misses) == (1, 2)
+    assert second is not first
+    pd.testing.assert_frame_equal(second.results_df, first.results_df)
+    pd.testing.assert_frame_equal(second.stationarity_results, first.stationarity_results)
+    assert other.delta == "diff1"
@@ -0,0 +1,8 @@
+import numpy as np
+import pytest
+from actfts.confint import confidence_bands
+
+
+def test_invalid_method_names_the_parameter():
+    with pytest.raises(ValueError, match="ci_method"):
+        confidence_bands(np.zeros(3), 100, ci_method="bartlett")
@@ -0,0 +1,152 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts.Datasets import load_dataset, load_datasets, packaged_dataset
+
+
+class _Response:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    """Serves one CSV per URL, with the URL as its ETag."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers, timeout=None):
+        self.requests.append((url, headers))
+        if headers.get("If-None-Match") == url:
+            return _Response(304)
+        value = url.rsplit("=", 1)[1]
+        content = f"DATE,X\n2000-01-01,{value}\n2000-02-01,{value}\n".encode()
+        return _Response(200, content, {"ETag": url})
+
+
+def test_cache_is_keyed_by_url(tmp_path, monkeypatch):
+    monkeypatch.setenv("ACTFTS_CACHE_DIR", str(tmp_path))
+    session = _Session()
+
+    load_dataset("http://mirror/?v=1", "X", refresh=True, session=session)
+    data = load_dataset("http://mirror/?v=2", "X", refresh=True, session=session)
+    assert session.requests[-1][1] == {}
+    assert data["X"].iloc[0] == 2.0
+
+    data = load_dataset("http://mirror/?v=2", "X", refresh=True, session=session)
+    assert session.requests[-1][1] == {"If-None-Match": "http://mirror/?v=2"}
+    assert data["X"].iloc[0] == 2.0
+    assert load_dataset("http://mirror/?v=2", "X")["X"].iloc[0] == 2.0
+    assert sorted(path.name for path in (tmp_path / "v3").iterdir()) == ["X.json", "X.npy"]
+
+
+def test_metadata_of_other_data_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setenv("ACTFTS_CACHE_DIR", str(tmp_path))
+    session = _Session()
+
+    load_dataset("http://mirror/?v=1", "X", refresh=True, session=session)
+    data_path = tmp_path / "v3" / "X.npy"
+    records = np.load(data_path)
+    records["Value"] += 1.0
+    np.save(data_path, records)
+
+    # X.json now describes other data than X.npy: no validators are sent.
+    load_dataset("http://mirror/?v=1", "X", refresh=True, session=session)
+    assert session.requests[-1][1] == {}
+
+
+
+def test_broken_cache_falls_back_to_the_packaged_copy(tmp_path, monkeypatch):
+    monkeypatch.setenv("ACTFTS_CACHE_DIR", str(tmp_path))
+    session = _Session()
+    url = "http://mirror/?v=7"
+    assert load_dataset(url, "GDPEEUU", refresh=True, session=session)["GDPEEUU"].iloc[0] == 7.0
+
+    data_path = tmp_path / "v3" / "GDPEEUU.npy"
+    data_path.write_bytes(data_path.read_bytes()[:100])
+    packaged = packaged_dataset("GDPEEUU")
+    pd.testing.assert_frame_equal(load_dataset(url, "GDPEEUU"), packaged)
+
+class _FredHandler(BaseHTTPRequestHandler):
+    """A FRED stand-in: /<id>.csv serves one series with the id as its ETag.
+
+    Series listed in `flaky` answer 503 to their first request.
+    """
+
+    series = {
+        'A': "DATE,A\n2000-01-01,1\n2000-04-01,2\n2000-07-01,3\n",
+        'B': "DATE,B\n2000-04-01,20\n2000-07-01,30\n2000-10-01,40\n",
+    }
+    flaky = set()
+    log = []
+
+    def do_GET(self):
+        series_id = self.path.strip("/").removesuffix(".csv")
+        self.log.append((series_id, self.headers.get("If-None-Match")))
+        if series_id in self.flaky:
+            self.flaky.discard(series_id)
+            self._reply(503)
+        elif self.headers.get("If-None-Match") == f'"{series_id}"':
+            self._reply(304)
+        else:
+            self._reply(200, self.series[series_id].encode(), {"ETag": f'"{series_id}"'})
+
+    def _reply(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in dict(headers).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fred(tmp_path, monkeypatch):
+    monkeypatch.setenv("ACTFTS_CACHE_DIR", str(tmp_path))
+    _FredHandler.flaky = set()
+    _FredHandler.log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FredHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/{{series_id}}.csv"
+    server.shutdown()
+    server.server_close()
+
+
+def test_load_datasets_against_local_server(fred):
+    _FredHandler.flaky = {'A'}
+    data = load_datasets(["A", "B"], url_template=fred, backoff=0.01, timeout=10)
+
+    # The 503 of A was retried.
+    assert [entry for entry in _FredHandler.log if entry[0] == 'A'] == [('A', None), ('A', None)]
+    # Outer join on the observation dates.
+    assert list(data.columns) == ["A", "B"]
+    assert list(data.index.strftime("%Y-%m-%d")) == ["2000-01-01", "2000-04-01", "2000-07-01",
+                                                     "2000-10-01"]
+    np.testing.assert_array_equal(data["A"], [1, 2, 3, np.nan])
+    np.testing.assert_array_equal(data["B"], [np.nan, 20, 30, 40])
+
+    # The second call revalidates: the server answers 304 and the cached copies are used.
+    _FredHandler.log = []
+    again = load_datasets(["A", "B"], url_template=fred, backoff=0.01, timeout=10)
+    assert sorted(_FredHandler.log) == [('A', '"A"'), ('B', '"B"')]
+    pd.testing.assert_frame_equal(again, data)
+
+
+def test_retries_are_exhausted(fred):
+    import requests
+
+    _FredHandler.flaky = {'A'}
+    with pytest.raises(requests.exceptions.HTTPError):
+        load_datasets(["A"], url_template=fred, retries=0, timeout=10)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter_panel
+from actfts.explorer import PanelExplorer
+
+
+@pytest.fixture(scope="module")
+def panel_result():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(300, 2))
+    # Period 4: the lag-1 autocorrelation is almost zero.
+    data[:, 1] = np.sin(np.arange(300) * np.pi / 2) + 1e-3 * data[:, 1]
+    return acfinter_panel(pd.DataFrame(data, columns=["noise", "cycle"]), lag=10, boxcox=False)
+
+
+def test_panel_result_keeps_nobs(panel_result):
+    assert panel_result.nobs == 300
+    results_df, _, _ = panel_result
+    assert len(results_df) == 20
+
+
+def test_figure_with_zero_first_autocorrelation(panel_result):
+    explorer = PanelExplorer(panel_result)
+    assert explorer.figure("cycle")
+
+
+def test_plain_tuple_needs_nobs(panel_result):
+    with pytest.raises(ValueError, match="nobs"):
+        PanelExplorer(tuple(panel_result))
+    assert PanelExplorer(tuple(panel_result), nobs=300).figure("noise")
@@ -0,0 +1,90 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter
+from actfts.actfts_fun import acfinter_panel
+from actfts.export import available_path, export_figures, export_results, results_frame
+
+
+@pytest.fixture(scope="module")
+def results():
+    rng = np.random.default_rng(13)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return {name: acfinter(rng.normal(size=300) + 5.0, lag=6, plot=False)
+                for name in ["first", "second"]}
+
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+@pytest.mark.parametrize("background", [False, True])
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_long_table_round_trip(results, tmp_path, fmt, background):
+    written = export_results(results, tmp_path / "nested" / f"results.{fmt}", background=background)
+    path = written.result(timeout=60) if background else written
+
+    assert path == tmp_path / "nested" / f"results.{fmt}"
+    expected = results_frame(results)
+    frame = _read(path, fmt)
+    assert list(frame.columns) == list(expected.columns)
+    assert len(frame) == 2 * (6 + len(results["first"].stationarity_results)
+                              + len(results["first"].normality_results))
+    assert list(frame["Series"].unique()) == ["first", "second"]
+    for column in ["Lag", "ACF", "Ljung_Box", "Statistic", "P_Value"]:
+        np.testing.assert_allclose(frame[column].to_numpy(dtype=float),
+                                   expected[column].to_numpy(dtype=float, na_value=np.nan),
+                                   rtol=1e-12, equal_nan=True)
+
+
+def test_single_result_keeps_the_excel_layout(results, tmp_path):
+    result = results["first"]
+    path = export_results(result, tmp_path / "Results.xlsx")
+
+    sheets = pd.read_excel(path, sheet_name=None, index_col=None)
+    assert list(sheets) == ["ACF_PACF", "Stationarity", "Normality"]
+    np.testing.assert_allclose(sheets["ACF_PACF"]["ACF"], result.results_df["ACF"], rtol=1e-12)
+    stationarity = sheets["Stationarity"].set_index(sheets["Stationarity"].columns[0])
+    assert list(stationarity.index) == list(result.stationarity_results.index)
+    np.testing.assert_allclose(stationarity["Statistic"],
+                               result.stationarity_results["Statistic"], rtol=1e-12)
+
+
+def test_panel_excel_is_keyed_by_series(tmp_path):
+    panel = pd.DataFrame(np.random.default_rng(2).normal(size=(200, 2)), columns=["x", "y"])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = acfinter_panel(panel, lag=4)
+    future = export_results(result, tmp_path / "panel.xlsx", background=True)
+
+    sheets = pd.read_excel(future.result(timeout=60), sheet_name=None, index_col=[0, 1])
+    assert set(sheets["Stationarity"].index.get_level_values(0)) == {"x", "y"}
+    np.testing.assert_allclose(sheets["Stationarity"]["Statistic"],
+                               result.stationarity_results["Statistic"], rtol=1e-12)
+
+
+def test_unknown_format(results, tmp_path):
+    with pytest.raises(ValueError, match="format"):
+        export_results(results, tmp_path / "results.json")
+
+
+def test_available_path(tmp_path):
+    path = tmp_path / "Results.xlsx"
+    assert available_path(path) == path
+    path.touch()
+    (tmp_path / "Results (1).xlsx").touch()
+    assert available_path(path) == tmp_path / "Results (2).xlsx"
+
+
+def test_single_result_figure(results, tmp_path):
+    paths = export_figures(results["first"], tmp_path, fmt="pdf", dpi=30)
+
+    assert paths == [tmp_path / "series.pdf"]
+    assert paths[0].read_bytes().startswith(b"%PDF")
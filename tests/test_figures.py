@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter, acfinter_panel
+from actfts.export import export_figures
+
+
+@pytest.fixture(scope="module")
+def panel():
+    data = np.random.default_rng(0).normal(size=(200, 3))
+    return pd.DataFrame(data, columns=["a", "b", "c"])
+
+
+def test_panel_figures(panel, tmp_path):
+    paths = export_figures(acfinter_panel(panel, lag=8, boxcox=False), tmp_path, dpi=30)
+    assert [path.name for path in paths] == ["a.png", "b.png", "c.png"]
+    assert all(path.stat().st_size > 0 for path in paths)
+
+
+def test_mapping_figures(panel, tmp_path):
+    results = {name: acfinter(panel[name], lag=8, plot=False, boxcox=False) for name in panel}
+    paths = export_figures(results, tmp_path, dpi=30)
+    assert [path.name for path in paths] == ["a.png", "b.png", "c.png"]
+
+
+def test_invalid_inputs(panel, tmp_path):
+    result = acfinter_panel(panel, lag=8, boxcox=False)
+    with pytest.raises(ValueError, match="nobs"):
+        export_figures(tuple(result), tmp_path)
+    with pytest.raises(TypeError):
+        export_figures(result.results_df, tmp_path)
+    with pytest.raises(TypeError):
+        export_figures({"a": tuple(result)}, tmp_path)
+
+
+def test_unsafe_names(panel, tmp_path):
+    result = acfinter(panel["a"], lag=8, plot=False, boxcox=False)
+    paths = export_figures({"prices/close": result, 'a:b*c?': result, "..": result},
+                           tmp_path, dpi=30)
+    assert [path.name for path in paths] == ["prices_close.png", "a_b_c_.png", "_.png"]
+    assert all(path.parent == tmp_path and path.exists() for path in paths)
+
+    with pytest.raises(ValueError, match="same file name"):
+        export_figures({"a/b": result, "a_b": result}, tmp_path)
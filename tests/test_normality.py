@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+import scipy.stats as stats
+from actfts.normality import SHAPIRO_MAX_NOBS, normality_names, normality_values
+
+
+def _panel(nobs):
+    rng = np.random.default_rng(2)
+    return np.column_stack([rng.normal(size=nobs), rng.standard_t(3, size=nobs),
+                            rng.exponential(size=nobs) + 0.1, rng.uniform(-1, 1, size=nobs)])
+
+
+@pytest.mark.parametrize("nobs", [50, 1000, SHAPIRO_MAX_NOBS + 1000])
+def test_matches_scipy(nobs):
+    from statsmodels.stats.diagnostic import normal_ad
+
+    panel = _panel(nobs)
+    names = normality_names(nobs)
+    values = normality_values(panel)
+    assert values.shape == (panel.shape[1], len(names), 2)
+
+    for j in range(panel.shape[1]):
+        x = panel[:, j]
+        row = dict(zip(names, values[j]))
+        if nobs > SHAPIRO_MAX_NOBS:
+            sample = x[np.linspace(0, nobs - 1, SHAPIRO_MAX_NOBS).round().astype(int)]
+        else:
+            sample = x
+        np.testing.assert_allclose(row["Shapiro Wilks"], tuple(stats.shapiro(sample)), rtol=1e-12)
+
+        ks = stats.kstest(x, 'norm', args=(x.mean(), x.std()))
+        np.testing.assert_allclose(row["Kolmogorov Smirnov"], [ks.statistic, ks.pvalue],
+                                   rtol=1e-9, atol=1e-300)
+
+        if nobs > SHAPIRO_MAX_NOBS:
+            jb = stats.jarque_bera(x)
+            np.testing.assert_allclose(row["Jarque Bera"], [jb.statistic, jb.pvalue],
+                                       rtol=1e-9, atol=1e-300)
+            np.testing.assert_allclose(row["Anderson Darling"], normal_ad(x), rtol=1e-9,
+                                       atol=1e-300)
+
+        if x.min() > 0:
+            np.testing.assert_allclose(row["Box Cox"][0], stats.boxcox(x)[1], rtol=1e-9)
+        else:
+            assert np.isnan(row["Box Cox"][0])
+
+
+def test_deterministic():
+    panel = _panel(SHAPIRO_MAX_NOBS + 1000)
+    np.testing.assert_array_equal(normality_values(panel), normality_values(panel))
@@ -0,0 +1,60 @@
+import warnings
+
+import numpy as np
+import pytest
+from actfts import acfinter
+from actfts.outofcore import acfinter_chunked
+
+
+@pytest.fixture(scope="module")
+def noise():
+    return np.random.default_rng(0).normal(size=20000)
+
+
+@pytest.mark.parametrize("delta", ["levels", "diff1", "diff2", "diff3"])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_matches_acfinter(noise, delta, dtype):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = acfinter(noise, lag=40, delta=delta, plot=False, boxcox=False)
+        result = acfinter_chunked(noise, lag=40, delta=delta, chunk_size=3000, dtype=dtype)
+
+    assert result.delta == expected.delta == delta
+    rtol = 1e-9 if dtype == np.float64 else 1e-5
+    np.testing.assert_allclose(result.results_df['ACF'], expected.results_df['ACF'],
+                               rtol=rtol, atol=1e-6 if dtype == np.float32 else 0)
+    np.testing.assert_allclose(result.stationarity_results['Statistic'],
+                               expected.stationarity_results['Statistic'], rtol=1e-8)
+    np.testing.assert_allclose(result.stationarity_results['P_Value'],
+                               expected.stationarity_results['P_Value'], rtol=1e-6, atol=1e-12)
+
+
+def test_random_walk_matches_acfinter():
+    walk = np.cumsum(np.random.default_rng(1).normal(size=30000)) + 100.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = acfinter(walk, lag=24, plot=False, boxcox=False)
+        result = acfinter_chunked(walk, lag=24, chunk_size=4096)
+
+    np.testing.assert_allclose(result.results_df['ACF'], expected.results_df['ACF'], rtol=1e-9)
+    np.testing.assert_allclose(result.stationarity_results['Statistic'],
+                               expected.stationarity_results['Statistic'], rtol=1e-8)
+
+
+def test_one_shot_iterable(noise):
+    chunks = iter(np.array_split(noise, 7))
+    result = acfinter_chunked(chunks, lag=12)
+    expected = acfinter_chunked(noise, lag=12)
+    np.testing.assert_allclose(result.stationarity_results, expected.stationarity_results,
+                               rtol=1e-12)
+
+
+def test_normality_matches_scipy(noise):
+    import scipy.stats as stats
+
+    table = acfinter_chunked(noise, lag=12, chunk_size=3000, stationarity=False).normality_results
+    jb = stats.jarque_bera(noise)
+    np.testing.assert_allclose(table.loc["Jarque Bera"], [jb.statistic, jb.pvalue], rtol=1e-9)
+    sample = noise[::4]
+    np.testing.assert_allclose(table.loc["Shapiro Wilks"], tuple(stats.shapiro(sample)),
+                               rtol=1e-12)
@@ -0,0 +1,57 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter
+from actfts.actfts_fun import acfinter_panel
+
+
+@pytest.fixture(scope="module")
+def panel():
+    rng = np.random.default_rng(3)
+    noise = rng.normal(size=(400, 3))
+    return pd.DataFrame({
+        "noise": noise[:, 0],
+        "ar": np.convolve(noise[:, 1], 0.6 ** np.arange(30))[:400],
+        "walk": np.cumsum(noise[:, 2]) + 50.0,
+    })
+
+
+@pytest.mark.parametrize("delta", ["levels", "diff1"])
+def test_matches_acfinter_per_series(panel, delta):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = acfinter_panel(panel, lag=15, delta=delta)
+
+    assert result.nobs == len(panel) - (delta == "diff1")
+    for name in panel.columns:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = acfinter(panel[name].to_numpy(), lag=15, delta=delta, plot=False)
+
+        pd.testing.assert_frame_equal(result.results_df.loc[name].reset_index(drop=True),
+                                      expected.results_df.reset_index(drop=True),
+                                      rtol=1e-10)
+        pd.testing.assert_frame_equal(result.stationarity_results.loc[name].reset_index(drop=True),
+                                      expected.stationarity_results.reset_index(drop=True),
+                                      check_dtype=False, rtol=1e-8)
+        pd.testing.assert_frame_equal(result.normality_results.loc[name].reset_index(drop=True),
+                                      expected.normality_results.reset_index(drop=True),
+                                      check_dtype=False, rtol=1e-8)
+
+
+def test_unpacks_like_a_tuple(panel):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results_df, stationarity_results, normality_results = acfinter_panel(panel.to_numpy(), lag=5)
+
+    assert len(results_df) == 5 * panel.shape[1]
+    assert results_df.index.name == "Series"
+
+
+def test_missing_values_are_rejected(panel):
+    broken = panel.copy()
+    broken.iloc[3, 1] = np.nan
+    with pytest.raises(ValueError):
+        acfinter_panel(broken, lag=5)
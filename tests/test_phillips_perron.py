@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from actfts.stationarity import StationarityEngine, phillips_perron_test
+
+arch_unitroot = pytest.importorskip("arch.unitroot")
+
+
+def _panel():
+    rng = np.random.default_rng(1)
+    noise = rng.normal(size=(400, 4))
+    panel = np.column_stack([noise[:, 0], np.cumsum(noise[:, 1]) + 10.0,
+                             0.02 * np.arange(400) + noise[:, 2], noise[:, 3]])
+    for t in range(1, 400):
+        panel[t, 3] = 0.8 * panel[t - 1, 3] + noise[t, 3]
+    return panel
+
+
+@pytest.mark.parametrize("lags", [None, 4])
+def test_matches_arch(lags):
+    panel = _panel()
+    zt, zalpha, pvalue = phillips_perron_test(panel, lags=lags)
+    for j in range(panel.shape[1]):
+        kwargs = {} if lags is None else {'lags': lags}
+        tau = arch_unitroot.PhillipsPerron(panel[:, j], trend='c', test_type='tau', **kwargs)
+        rho = arch_unitroot.PhillipsPerron(panel[:, j], trend='c', test_type='rho', **kwargs)
+        np.testing.assert_allclose([zt[j], pvalue[j], zalpha[j]],
+                                   [tau.stat, tau.pvalue, rho.stat], rtol=1e-9)
+
+
+def test_single_series_and_engine_agree():
+    x = _panel()[:, 1]
+    zt, _, pvalue = phillips_perron_test(x)
+    np.testing.assert_allclose(StationarityEngine(x).pp(), (zt, pvalue), rtol=1e-12)
+
+
+def test_too_short_series():
+    with pytest.raises(ValueError):
+        phillips_perron_test(np.arange(5.0) ** 2, lags=10)
@@ -0,0 +1,64 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter
+from actfts.actfts_fun import gen
+from actfts.rolling import rolling_acfinter
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(9)
+    index = pd.date_range("2000-01-01", periods=260, freq="D", name="Date")
+    return pd.Series(np.cumsum(rng.normal(size=260)) + 20.0, index=index)
+
+
+def _reference(x, lag, delta="levels"):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return acfinter(np.asarray(x), lag=lag, delta=delta, plot=False)
+
+
+@pytest.mark.parametrize("expanding", [False, True])
+@pytest.mark.parametrize("delta", ["levels", "diff1"])
+def test_matches_acfinter_per_window(series, expanding, delta):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results_df, stationarity_results = rolling_acfinter(series, window=60, lag=8, step=50,
+                                                            expanding=expanding, delta=delta)
+
+    data = gen(series, delta)
+    ends = np.arange(60, len(data) + 1, 50)
+    labels = series.index[len(series) - len(data):][ends - 1]
+    assert list(results_df.index.get_level_values("Date").unique()) == list(labels)
+
+    for end, label in zip(ends, labels):
+        window = data[:end] if expanding else data[end - 60:end]
+        expected = _reference(window, 8)
+        np.testing.assert_allclose(results_df.loc[label].to_numpy(),
+                                   expected.results_df.drop(columns="Lag").to_numpy(),
+                                   rtol=1e-8, atol=1e-12)
+        np.testing.assert_allclose(stationarity_results.loc[label]['Statistic'],
+                                   expected.stationarity_results['Statistic'], rtol=1e-8)
+
+
+def test_positions_label_plain_arrays(series):
+    results_df, stationarity_results = rolling_acfinter(series.to_numpy(), window=100, lag=4,
+                                                        step=80, stationarity=False)
+
+    assert stationarity_results is None
+    assert results_df.index.names == ["Window_End", "Lag"]
+    assert list(results_df.index.get_level_values(0).unique()) == [99, 179, 259]
+
+
+def test_lag_is_capped_at_the_window(series):
+    results_df, _ = rolling_acfinter(series, window=5, lag=12, step=100, stationarity=False)
+    assert results_df.index.get_level_values("Lag").max() == 4
+
+
+@pytest.mark.parametrize("window", [1, 261])
+def test_invalid_window(series, window):
+    with pytest.raises(ValueError, match="window"):
+        rolling_acfinter(series, window=window)
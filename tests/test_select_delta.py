@@ -0,0 +1,62 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter
+from actfts.actfts_fun import select_delta, stationarity_tests
+
+rng = np.random.default_rng(23)
+NOISE = rng.normal(size=600)
+SERIES = {
+    "levels": NOISE + 10.0,
+    "diff1": np.cumsum(NOISE) + 10.0,
+    "diff2": np.cumsum(np.cumsum(NOISE)) + 10.0,
+}
+
+
+@pytest.mark.parametrize("expected", list(SERIES))
+def test_picks_the_integration_order(expected):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        delta, x, engine = select_delta(SERIES[expected])
+
+    assert delta == expected
+    order = ["levels", "diff1", "diff2"].index(expected)
+    np.testing.assert_allclose(x, np.diff(SERIES[expected], n=order))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pd.testing.assert_frame_equal(engine.table(), stationarity_tests(x), check_dtype=False,
+                                      rtol=1e-10)
+
+
+def test_max_order_caps_the_search():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        delta, x, _ = select_delta(SERIES["diff2"], max_order=1)
+    assert delta == "diff1" and len(x) == len(NOISE) - 1
+
+
+def test_pandas_input():
+    series = pd.Series(SERIES["diff1"], index=pd.date_range("2000", periods=600, freq="D"))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert select_delta(series)[0] == "diff1"
+
+
+def test_acfinter_auto_matches_the_chosen_order():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = acfinter(SERIES["diff1"], lag=10, delta="auto", plot=False)
+        expected = acfinter(SERIES["diff1"], lag=10, delta="diff1", plot=False)
+
+    assert result.delta == "diff1"
+    pd.testing.assert_frame_equal(result.results_df, expected.results_df)
+    pd.testing.assert_frame_equal(result.stationarity_results, expected.stationarity_results,
+                                  rtol=1e-10)
+    pd.testing.assert_frame_equal(result.normality_results, expected.normality_results)
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        select_delta([1.0, 2.0, 3.0])
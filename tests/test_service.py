@@ -0,0 +1,95 @@
+import http.client
+import json
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from actfts import acfinter
+from actfts.service import AnalysisService
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = AnalysisService(port=0, workers=1).start()
+    yield service
+    service.shutdown()
+
+
+def _post(service, body, headers=None):
+    host, port = service._server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    connection.request("POST", "/analyze", body=body, headers=headers or {})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+
+@pytest.fixture(scope="module")
+def series():
+    return np.random.default_rng(0).normal(size=100).tolist()
+
+
+def test_analysis(service, series):
+    status, payload = _post(service, json.dumps({'data': series, 'lag': 5, 'boxcox': False}))
+    assert status == 200
+    assert len(payload['results']['ACF']) == 5
+
+
+@pytest.mark.parametrize("options", [
+    '"lag": 1e400',
+    '"lag": 24.7',
+    '"lag": true',
+    '"lag": 0',
+    '"ci": 2.0',
+    '"ci": "0.9"',
+    '"boxcox": "false"',
+    '"delta": ["diff1"]',
+])
+def test_invalid_options(service, series, options):
+    body = '{"data": %s, %s}' % (json.dumps(series), options)
+    status, payload = _post(service, body)
+    assert status == 400
+    assert payload['error']
+
+
+@pytest.mark.parametrize("data", ['[1, 2, "3"]', '[1, 2, true]', '[1, 2, 1e400]',
+                                  '[1, 2, %d]' % 10 ** 400, '"123"'])
+def test_invalid_data(service, data):
+    status, _ = _post(service, '{"data": %s}' % data)
+    assert status == 400
+
+
+def test_negative_content_length(service):
+    host, port = service._server.server_address[:2]
+    with socket.create_connection((host, port), timeout=10) as sock:
+        sock.sendall(b"POST /analyze HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n")
+        # The server closes the connection after the answer: read up to EOF.
+        response = b""
+        while chunk := sock.recv(4096):
+            response += chunk
+    assert response.startswith(b"HTTP/1.1 400")
+    assert response.endswith(b"}")
+
+
+def test_timeout_answers_504(series):
+    with AnalysisService(port=0, workers=1, timeout=1e-6).start() as service:
+        status, payload = _post(service, json.dumps({'data': series * 20, 'lag': 5}))
+    assert status == 504
+    assert service.metrics()['timeouts_total'] == 1
+
+
+def test_batches_match_single_analyses(service):
+    rng = np.random.default_rng(3)
+    bodies = [json.dumps({'data': rng.normal(size=80).tolist(), 'lag': 4, 'boxcox': False,
+                          'ci_method': "ma"}) for _ in range(6)]
+    with ThreadPoolExecutor(6) as pool:
+        batched = list(pool.map(lambda body: _post(service, body), bodies))
+    for body, (status, payload) in zip(bodies, batched):
+        assert status == 200
+        result = acfinter(np.array(json.loads(body)['data']), lag=4, ci_method="ma", plot=False,
+                          boxcox=False)
+        np.testing.assert_allclose(payload['results']['ACF'], result.results_df['ACF'])
+        np.testing.assert_allclose(payload['acf_ci'], result.acf_ci)
+        np.testing.assert_allclose(payload['pacf_ci'], result.pacf_ci)
@@ -0,0 +1,54 @@
+import warnings
+
+import numpy as np
+import pytest
+from actfts.stationarity import StationarityEngine
+
+
+def _cases():
+    rng = np.random.default_rng(0)
+    for nobs in [40, 120, 500, 2000]:
+        noise = rng.normal(size=nobs)
+        yield f"noise-{nobs}", noise
+        yield f"walk-{nobs}", np.cumsum(noise) + 50.0
+        ar = np.zeros(nobs)
+        for t in range(1, nobs):
+            ar[t] = 0.7 * ar[t - 1] + noise[t]
+        yield f"ar1-{nobs}", ar
+        yield f"trend-{nobs}", 0.05 * np.arange(nobs) + noise
+        yield f"diff-{nobs}", np.diff(noise, n=2)
+
+
+CASES = dict(_cases())
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_adf_matches_statsmodels(name):
+    from statsmodels.tsa.stattools import adfuller
+
+    x = CASES[name]
+    stat, pvalue, usedlag = StationarityEngine(x).adf()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = adfuller(x, regression='c', autolag='AIC')
+    assert usedlag == expected[2]
+    np.testing.assert_allclose([stat, pvalue], expected[:2], rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("regression", ['c', 'ct'])
+@pytest.mark.parametrize("name", list(CASES))
+def test_kpss_matches_statsmodels(name, regression):
+    from statsmodels.tsa.stattools import kpss
+
+    x = CASES[name]
+    stat, pvalue, nlags = StationarityEngine(x).kpss(regression)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = kpss(x, regression=regression, nlags='auto')
+    assert nlags == expected[2]
+    np.testing.assert_allclose([stat, pvalue], expected[:2], rtol=1e-9)
+
+
+def test_constant_series_is_rejected():
+    with pytest.raises(ValueError):
+        StationarityEngine(np.ones(50))
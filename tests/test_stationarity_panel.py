@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from actfts.actfts_fun import stationarity_panel
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def map(self, fn, *iterables):
+        chunks = list(iterables[0])
+        self.tasks = len(chunks)
+        return super().map(fn, chunks)
+
+
+def test_chunks_follow_n_jobs():
+    data = np.cumsum(np.random.default_rng(0).normal(size=(120, 40)), axis=0)
+    expected = stationarity_panel(data)
+
+    with _CountingExecutor(max_workers=2) as executor:
+        result = stationarity_panel(data, executor=executor, n_jobs=2)
+    assert executor.tasks == 8
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+
+    with _CountingExecutor(max_workers=2) as executor:
+        stationarity_panel(data, executor=executor, n_jobs=3)
+    assert executor.tasks == 12
@@ -0,0 +1,65 @@
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from actfts import acfinter
+from actfts.streaming import StreamingACF
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(5)
+    return np.cumsum(rng.normal(size=3000)) * 0.1 + 1000.0
+
+
+def _reference(x, lag):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return acfinter(x, lag=lag, plot=False).results_df
+
+
+@pytest.mark.parametrize("chunks", [[3000], [1, 2, 997, 2000], [500] * 6, [7] * 428 + [4]])
+def test_chunked_updates_match_acfinter(series, chunks):
+    stream = StreamingACF(lag=20)
+    for part in np.split(series, np.cumsum(chunks)[:-1]):
+        stream.update(part)
+
+    assert stream.nobs == len(series)
+    assert stream.mean == pytest.approx(series.mean(), rel=1e-12)
+    pd.testing.assert_frame_equal(stream.results(), _reference(series, 20), rtol=1e-8)
+
+
+def test_float32_is_close(series):
+    stream = StreamingACF(lag=10, dtype=np.float32)
+    for part in np.array_split(series, 7):
+        stream.update(part)
+
+    expected = _reference(series, 10)
+    np.testing.assert_allclose(stream.acf()[1:], expected['ACF'], rtol=1e-4)
+
+
+def test_resumes_from_dict(series):
+    whole = StreamingACF(lag=12).update(series[:1700]).update(series[1700:])
+
+    first = StreamingACF(lag=12).update(series[:1700])
+    state = json.loads(json.dumps(first.to_dict()))
+    resumed = StreamingACF.from_dict(state).update(series[1700:])
+
+    assert resumed.nobs == whole.nobs
+    np.testing.assert_allclose(resumed.acovf(), whole.acovf(), rtol=1e-12)
+    pd.testing.assert_frame_equal(resumed.results(), whole.results())
+
+
+def test_short_history_caps_the_lag():
+    stream = StreamingACF(lag=10).update([1.0, 3.0, 2.0, 5.0])
+    assert len(stream.acf()) == 4
+    with pytest.raises(ValueError):
+        StreamingACF(lag=3).update(1.0).acovf()
+
+
+@pytest.mark.parametrize("points", [[1.0, np.nan], np.ones((2, 2))])
+def test_invalid_points_are_rejected(points):
+    with pytest.raises(ValueError):
+        StreamingACF(lag=3).update(points)
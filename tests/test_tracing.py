@@ -0,0 +1,104 @@
+import logging
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+from actfts import acfinter
+from actfts.cache import ResultCache
+from actfts.tracing import (NULL_TRACER, STAGES, CallbackTracer, LoggingTracer, OpenTelemetryTracer,
+                            StageTimer, as_tracer)
+
+ANALYSIS = ["gen", "acf", "pacf", "ljung_box", "stationarity", "normality", "confidence_bands"]
+
+
+@pytest.fixture(scope="module")
+def series():
+    return np.random.default_rng(17).normal(size=400) + 3.0
+
+
+def _run(series, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return acfinter(series, lag=8, plot=False, **kwargs)
+
+
+def test_profile_times_every_stage(series):
+    result = _run(series, profile=True)
+
+    assert list(result.timings) == ANALYSIS
+    assert set(result.timings) <= set(STAGES)
+    assert all(seconds >= 0 for seconds in result.timings.values())
+    assert result.allocations is None
+
+
+def test_without_profile_nothing_is_recorded(series):
+    result = _run(series)
+    assert result.timings is None and result.allocations is None
+
+
+def test_memory_profile_records_allocations(series):
+    result = _run(series, profile="memory")
+    assert list(result.allocations) == list(result.timings) == ANALYSIS
+    assert all(peak >= 0 for peak in result.allocations.values())
+    assert result.allocations["acf"] > 0
+
+
+def test_callable_tracer_receives_the_spans(series):
+    spans = []
+    result = _run(series, tracer=lambda name, seconds: spans.append(name), 
+                  cache=ResultCache(), delta="auto")
+
+    assert spans[0] == "cache"
+    assert "delta" in spans and set(spans) <= set(STAGES)
+    assert list(result.timings) == spans
+
+
+def test_callback_tracer_reports_failed_stages():
+    spans = []
+    tracer = CallbackTracer(lambda name, seconds: spans.append((name, seconds)))
+    with pytest.raises(RuntimeError):
+        with tracer.span("acf"):
+            raise RuntimeError
+    assert spans[0][0] == "acf" and spans[0][1] >= 0
+
+
+def test_stage_timer_forwards_to_its_parent():
+    spans = []
+    timer = StageTimer(memory=True, parent=CallbackTracer(lambda name, seconds: spans.append(name)))
+    with timer.span("acf"):
+        np.ones(10000)
+    with timer.span("acf"):
+        pass
+
+    assert spans == ["acf", "acf"]
+    assert list(timer.timings) == ["acf"]
+    assert timer.allocations["acf"] >= 80000
+
+
+def test_logging_tracer(series, caplog):
+    with caplog.at_level(logging.DEBUG, logger="actfts"):
+        _run(series, tracer=LoggingTracer())
+    assert [record.args[0] for record in caplog.records] == ANALYSIS
+
+
+def test_as_tracer():
+    class Otel:
+        def __init__(self):
+            self.names = []
+
+        @contextmanager
+        def start_as_current_span(self, name):
+            self.names.append(name)
+            yield
+
+    otel = Otel()
+    assert as_tracer(None) is NULL_TRACER
+    assert isinstance(as_tracer(print), CallbackTracer)
+    tracer = as_tracer(otel)
+    assert isinstance(tracer, OpenTelemetryTracer)
+    with tracer.span("acf"):
+        pass
+    assert otel.names == ["actfts.acf"]
+    with pytest.raises(TypeError):
+        as_tracer(42)